@@ -1,23 +1,67 @@
 # -*- coding: utf-8 -*-
 # ============================================================
-# Painel de Bônus (T1) | ANALISTAS
+# Painel de Bônus | ANALISTAS (meses, trimestres T1-T4 e acumulado do ano)
 # - Sidebar azul (NATIVA) FIXA (SEM recolher / sem setinha)
 # - Login via secrets
 # - Cada usuário vê SOMENTE o próprio registro (por coluna EMAIL na planilha)
 # - Admin (lista em secrets) vê todos
+# - Vigia de data/ (planilhas, pesos, snapshot): recalcula em segundo plano e
+#   troca a versão inteira de uma vez; requisição nunca espera o xlsx
+# - Snapshot offline (app/precalcular.py) dispensa o xlsx quando atualizado
+# - Carga a frio de planilhas grandes calcula os meses em processos paralelos
+#   (BONUS_TRABALHADORES fixa quantos; 1 = serial)
+# - Só interface: leitura, cálculo e caches ficam no pacote bonus (sem Streamlit)
+# - Admin: painel "Diagnóstico" com o tempo de cada etapa do rerun e da última
+#   carga, hits e memória dos caches; BONUS_MEDICAO_LOG=1 loga em JSON,
+#   BONUS_PERFIL_DIR grava cProfile
+# - Admin: "Simulador de pesos" recalcula RECEBIDO/PERDA do período para
+#   outros pesos (tabela de cenários ou faixa de um indicador), sem gravar nada
+# - Admin: "Perdas por indicador" recorta o cubo EMPRESA x MÊS x INDICADOR
+#   da versão em vigor pelo período e pela empresa da lateral
+# - Histórico (data/historico.sqlite): o analista vê os próprios meses já
+#   gravados; o admin grava os meses em vigor e consulta perdas por indicador
 # ============================================================
 
 import streamlit as st
 import pandas as pd
-import json
 from pathlib import Path
-import unicodedata
-import re
 import hmac
+import time
+
+from bonus import (
+    PlanilhaInvalida,
+    norm_email,
+    brl,
+    rotulo_periodo,
+    registros_do_usuario,
+    filtrar_admin,
+    cards_html,
+    criar_motor,
+    iniciar_motor,
+    versao_dados,
+    erro_recente,
+    cache_planilha_info,
+    caches_info,
+    memoria_periodos,
+    simular_periodo,
+    fatiar_cubo,
+    varrer_peso,
+    totais_por_cenario,
+    arquivar_versao,
+    TRIMESTRES_PADRAO,
+    meses_gravados,
+    historico_analista,
+    empresas_gravadas,
+    perdas_por_indicador,
+    medindo,
+    etapa,
+    FORMATOS,
+    exportacao_em_bytes,
+)
 
 # ===================== CONFIG =====================
 st.set_page_config(
-    page_title="Painel de Bônus (T1) | Analistas",
+    page_title="Painel de Bônus | Analistas",
     layout="wide",
     initial_sidebar_state="expanded",
 )
@@ -25,10 +69,12 @@ st.set_page_config(
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 
-PESOS_PATH = DATA_DIR / "pesos_analistas.json"
-PLANILHA_PATH = DATA_DIR / "RESUMO PARA PAINEL - ANALISTAS.xlsx"
-
-MESES = ["TRIMESTRE", "JANEIRO", "FEVEREIRO", "MARÇO"]
+# cards de analistas enviados por vez na visão admin ("Carregar mais")
+CARDS_POR_PAGINA = 20
+MIME_EXPORTACAO = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".zip": "application/zip",
+}
 
 # ===================== ESTILO (SIDEBAR AZUL + UI) =====================
 st.markdown(
@@ -167,58 +213,6 @@ section[data-testid="stSidebar"] label{
 )
 
 # ===================== HELPERS =====================
-def norm_txt(s: str) -> str:
-    if s is None or (isinstance(s, float) and pd.isna(s)):
-        return ""
-    s = str(s).strip().upper()
-    s = unicodedata.normalize("NFD", s)
-    s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
-    s = re.sub(r"\s+", " ", s)
-    return s
-
-def up(s):
-    return norm_txt(s)
-
-def norm_email(s: str) -> str:
-    return (str(s or "").strip().lower())
-
-def texto_obs(valor):
-    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
-        return ""
-    s = str(valor).strip()
-    return "" if s.lower() in ["none", "nan", ""] else s
-
-def bool_safe(v, default=True) -> bool:
-    if v is None or (isinstance(v, float) and pd.isna(v)):
-        return default
-    s = str(v).strip().lower()
-    if s in ["true", "t", "1", "sim", "s", "yes", "y", "ok"]:
-        return True
-    if s in ["false", "f", "0", "nao", "não", "n", "no"]:
-        return False
-    try:
-        return float(s) != 0
-    except Exception:
-        return default
-
-def elegivel(valor_meta, obs):
-    obs_u = up(obs)
-    if pd.isna(valor_meta) or float(valor_meta) == 0:
-        return False, "Sem elegibilidade no mês"
-    if "LICEN" in obs_u:
-        return False, "Licença no mês"
-    return True, ""
-
-def brl(x: float) -> str:
-    try:
-        return f"R$ {float(x):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-    except Exception:
-        return "R$ 0,00"
-
-def load_json(path: Path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
 def render_kpis(total_possivel, recebido, perda, qtd):
     st.markdown(
         f"""
@@ -263,6 +257,43 @@ def render_kpis(total_possivel, recebido, perda, qtd):
         unsafe_allow_html=True,
     )
 
+def tabela_etapas(registro: dict) -> pd.DataFrame:
+    # ordem de início, com recuo pelo nível de aninhamento
+    etapas = sorted(registro["etapas"], key=lambda e: e["inicio_ms"])
+    return pd.DataFrame({
+        "Etapa": ["\u2003" * e["nivel"] + e["etapa"] for e in etapas],
+        "ms": [e["ms"] for e in etapas],
+        "Linhas": [e["linhas"] for e in etapas],
+    })
+
+def tabela_cenarios(totais: pd.DataFrame) -> pd.DataFrame:
+    out = totais.rename(columns={"CENARIO": "Cenário"})
+    for col in ["META", "RECEBIDO", "PERDA", "Δ RECEBIDO"]:
+        out[col] = out[col].apply(brl)
+    out["%"] = out["%"].apply(lambda x: f"{float(x):.1f}%")
+    return out
+
+def tabela_historico(historico: pd.DataFrame) -> pd.DataFrame:
+    out = historico.copy()
+    for col in ["META", "RECEBIDO", "PERDA"]:
+        out[col] = out[col].apply(brl)
+    out["%"] = out["%"].apply(lambda x: f"{float(x):.1f}%")
+    out["EMPRESA"] = out["EMPRESA"].fillna("").astype(str).str.title()
+    out[["SITUAÇÃO", "INDICADORES_NAO_ENTREGUES"]] = out[["SITUAÇÃO", "INDICADORES_NAO_ENTREGUES"]].fillna("")
+    return out.rename(columns={"INDICADORES_NAO_ENTREGUES": "Indicadores não entregues"})
+
+def tabela_perdas(cubo: pd.DataFrame, linhas: str, nome_linhas: str) -> pd.DataFrame:
+    # linhas x indicadores (ordem dos pesos), só com o que teve perda
+    tabela = cubo.pivot_table(index=linhas, columns="INDICADOR", values="PERDA", aggfunc="sum",
+                              fill_value=0.0, observed=True)
+    tabela["Total"] = tabela.sum(axis=1)
+    if linhas == "EMPRESA":
+        tabela.index = tabela.index.astype(str).str.title()
+    return tabela.apply(lambda s: s.apply(brl)).rename_axis(index=nome_linhas, columns=None)
+
+def mais_cards():
+    st.session_state["cards_visiveis"] = st.session_state.get("cards_visiveis", CARDS_POR_PAGINA) + CARDS_POR_PAGINA
+
 # ===================== LOGIN =====================
 def _safe_eq(a: str, b: str) -> bool:
     return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
@@ -360,346 +391,361 @@ LOGIN_EMAIL = norm_email(st.session_state.get("login_email", ""))
 IS_ADMIN = bool(st.session_state.get("is_admin", False))
 
 # ===================== DADOS ======================
-try:
-    PESOS = load_json(PESOS_PATH)
-except Exception as e:
-    st.error(f"Erro ao carregar pesos: {e}\nArquivo esperado: {PESOS_PATH.name}")
-    st.stop()
-
-def ler_planilha(mes: str) -> pd.DataFrame:
-    if PLANILHA_PATH.exists():
-        return pd.read_excel(PLANILHA_PATH, sheet_name=mes)
-    candidatos = list(DATA_DIR.glob("RESUMO PARA PAINEL - ANALISTAS*.xls*"))
-    if not candidatos:
-        st.error("Planilha não encontrada em data/ (RESUMO PARA PAINEL - ANALISTAS.xlsx)")
-        st.stop()
-    return pd.read_excel(sorted(candidatos)[0], sheet_name=mes)
-
-COLS_OBRIG = [
-    "EMAIL",  # <- NOVO (obrigatório)
-    "NOME", "FUNÇÃO", "VALOR MENSAL META",
-    "BATEU_PRODUCAO", "BATEU_TMG_GERAL", "BATEU_TMA_ANALISTA", "BATEU_TEMPO_FILA", "BATEU_CONFORMIDADE"
-]
-
-def checar_colunas(df: pd.DataFrame, mes: str):
-    faltando = [c for c in COLS_OBRIG if c not in df.columns]
-    if faltando:
-        st.error(
-            f"Na aba {mes}, faltam colunas obrigatórias: {', '.join(faltando)}.\n"
-            f"Você precisa criar a coluna EMAIL e preencher com o e-mail de cada analista."
-        )
-        st.stop()
-
-def calcula_mes(df_mes: pd.DataFrame, nome_mes: str) -> pd.DataFrame:
-    df = df_mes.copy()
-    checar_colunas(df, nome_mes)
-
-    # normaliza email
-    df["EMAIL"] = df["EMAIL"].apply(norm_email)
-
-    # filtra função analista
-    df = df[df["FUNÇÃO"].astype(str).apply(up) == up("ANALISTA")].copy()
-
-    metainfo = PESOS.get(up("ANALISTA"), {})
-    itens = metainfo.get("metas", {})
-
-    def calcula_recebido(row):
-        obs = row.get("OBSERVAÇÃO", "")
-        valor_meta = row.get("VALOR MENSAL META", 0)
-
-        ok, motivo = elegivel(valor_meta, obs)
-        perdeu_itens = []
-
-        if not ok:
-            return pd.Series({
-                "MES": nome_mes, "META": 0.0, "RECEBIDO": 0.0, "PERDA": 0.0, "%": 0.0,
-                "_badge": motivo, "_obs": texto_obs(obs), "perdeu_itens": perdeu_itens
-            })
-
-        total_func = float(valor_meta if pd.notna(valor_meta) else 0.0)
-        recebido, perdas = 0.0, 0.0
-
-        for item, peso in itens.items():
-            parcela = total_func * float(peso)
-            item_norm = up(item)
-
-            if item_norm in [up("PRODUÇÃO"), up("PRODUCAO")]:
-                bateu = bool_safe(row.get("BATEU_PRODUCAO"), True)
-                if bateu:
-                    recebido += parcela
-                else:
-                    perdas += parcela
-                    perdeu_itens.append("Produção")
-                continue
-
-            if item_norm in [up("TEMPO MÉDIO GERAL DE ANÁLISE"), up("TEMPO MEDIO GERAL DE ANALISE")]:
-                bateu = bool_safe(row.get("BATEU_TMG_GERAL"), True)
-                if bateu:
-                    recebido += parcela
-                else:
-                    perdas += parcela
-                    perdeu_itens.append("Tempo Médio Geral de Análise")
-                continue
-
-            if item_norm in [up("TEMPO MÉDIO DE ANÁLISE DO ANALISTA"), up("TEMPO MEDIO DE ANALISE DO ANALISTA")]:
-                bateu = bool_safe(row.get("BATEU_TMA_ANALISTA"), True)
-                if bateu:
-                    recebido += parcela
-                else:
-                    perdas += parcela
-                    perdeu_itens.append("Tempo Médio do Analista")
-                continue
-
-            if item_norm in [up("TEMPO MÉDIO DA FILA"), up("TEMPO MEDIO DA FILA")]:
-                bateu = bool_safe(row.get("BATEU_TEMPO_FILA"), True)
-                if bateu:
-                    recebido += parcela
-                else:
-                    perdas += parcela
-                    perdeu_itens.append("Tempo Médio da Fila")
-                continue
-
-            if item_norm == up("CONFORMIDADE"):
-                bateu = bool_safe(row.get("BATEU_CONFORMIDADE"), True)
-                if bateu:
-                    recebido += parcela
-                else:
-                    perdas += parcela
-                    perdeu_itens.append("Conformidade")
-                continue
-
-            recebido += parcela
-
-        meta = total_func
-        perc = 0.0 if meta == 0 else (recebido / meta) * 100.0
-
-        return pd.Series({
-            "MES": nome_mes, "META": meta, "RECEBIDO": recebido, "PERDA": perdas, "%": perc,
-            "_badge": "", "_obs": texto_obs(obs), "perdeu_itens": perdeu_itens
-        })
-
-    calc = df.apply(calcula_recebido, axis=1)
-    out = pd.concat([df.reset_index(drop=True), calc], axis=1)
-    return out
-
-def montar_base(periodo: str) -> pd.DataFrame:
-    if periodo == "TRIMESTRE":
-        df_j, df_f, df_m = [ler_planilha(m) for m in ["JANEIRO", "FEVEREIRO", "MARÇO"]]
-        full = pd.concat(
-            [calcula_mes(df_j, "JANEIRO"), calcula_mes(df_f, "FEVEREIRO"), calcula_mes(df_m, "MARÇO")],
-            ignore_index=True
-        )
-
-        # EMAIL entra no agrupamento para garantir “um usuário = um registro”
-        group_cols = [c for c in ["EMAIL", "EMPRESA", "NOME", "FUNÇÃO", "DATA DE ADMISSÃO", "TEMPO DE CASA"] if c in full.columns]
-        if not group_cols:
-            group_cols = ["EMAIL", "NOME", "FUNÇÃO"]
-
-        agg = (full.groupby(group_cols, dropna=False)
-               .agg({
-                    "META": "sum",
-                    "RECEBIDO": "sum",
-                    "PERDA": "sum",
-                    "_obs": lambda x: ", ".join(sorted({s for s in x if s})),
-                    "_badge": lambda x: " / ".join(sorted({s for s in x if s}))
-               })
-               .reset_index())
-
-        agg["%"] = agg.apply(lambda r: 0.0 if r["META"] == 0 else (r["RECEBIDO"] / r["META"]) * 100.0, axis=1)
-
-        perdas_pessoa = (
-            full.assign(_lost=lambda d: d.apply(
-                lambda r: [f"{it} ({r['MES']})" for it in (r["perdeu_itens"] or [])],
-                axis=1))
-            .groupby(group_cols, dropna=False)["_lost"]
-            .sum()
-            .apply(lambda L: ", ".join(sorted(set(L))) if isinstance(L, list) else "")
-            .reset_index()
-            .rename(columns={"_lost": "INDICADORES_NAO_ENTREGUES"})
-        )
-
-        out = agg.merge(perdas_pessoa, on=group_cols, how="left")
-        out["INDICADORES_NAO_ENTREGUES"] = out["INDICADORES_NAO_ENTREGUES"].fillna("")
-        return out
-
-    df_mes = ler_planilha(periodo)
-    out = calcula_mes(df_mes, periodo)
-    out["INDICADORES_NAO_ENTREGUES"] = out["perdeu_itens"].apply(
-        lambda L: ", ".join(L) if isinstance(L, list) and L else ""
-    )
-    return out
-
-# ===================== SIDEBAR =====================
-with st.sidebar:
-    st.markdown(
-        """
+# leitura, cálculo, caches e vigia ficam no motor (bonus/painel.py); aqui só
+# o mesmo motor para todas as sessões do processo
+@st.cache_resource(show_spinner=False)
+def _motor() -> dict:
+    return iniciar_motor(criar_motor(DATA_DIR))
+
+MOTOR = _motor()
+
+# ===================== PÁGINA =====================
+# o corpo roda dentro de medindo("rerun"): st.stop(), st.rerun() (exceções
+# do Streamlit fora de Exception) e erros também fecham o registro e o perfil
+def painel() -> dict:
+    # ===================== SIDEBAR =====================
+    with st.sidebar:
+        st.markdown(
+            """
 <div class="sb-brand">
   <div class="sb-logo">📊</div>
   <div>
     <p class="sb-title">Painel Analistas</p>
-    <div class="sb-sub">Bônus • T1</div>
+    <div class="sb-sub">Bônus por período</div>
   </div>
 </div>
 <div class="sb-divider"></div>
 <div class="sb-section-title">FILTROS</div>
 """,
-        unsafe_allow_html=True,
-    )
-
-    filtro_mes = st.radio("Período", MESES, index=0, key="periodo")
-
-    dados_calc = montar_base(filtro_mes)
-    dados_calc = dados_calc[dados_calc["FUNÇÃO"].astype(str).apply(up) == up("ANALISTA")].copy()
-
-    # trava por usuário (EMAIL)
-    if not IS_ADMIN:
-        dados_calc = dados_calc[dados_calc["EMAIL"].astype(str).apply(norm_email) == LOGIN_EMAIL].copy()
-
-    # filtros extras só para admin (porque usuário comum só tem 1 registro)
-    filtro_nome = ""
-    filtro_empresa = "Todas"
-    if IS_ADMIN:
-        st.markdown('<div class="sb-divider"></div><div class="sb-section-title">ADMIN</div>', unsafe_allow_html=True)
-        filtro_nome = st.text_input("Buscar por nome", value="")
+            unsafe_allow_html=True,
+        )
 
-        if "EMPRESA" in dados_calc.columns:
-            empresas = ["Todas"] + sorted([str(x) for x in dados_calc["EMPRESA"].dropna().unique()])
-            filtro_empresa = st.selectbox("Empresa", empresas, index=0)
+        try:
+            with etapa("versao_dados"):
+                versao = versao_dados(MOTOR)
+        except PlanilhaInvalida as e:
+            st.error(str(e))
+            st.stop()
+
+        periodos = versao["periodos"]
+        if st.session_state.get("periodo") not in periodos:
+            # período sumiu na última atualização dos dados
+            st.session_state.pop("periodo", None)
+        filtro_mes = st.radio("Período", periodos, index=0, key="periodo", format_func=rotulo_periodo)
+        base = versao["bases"][filtro_mes]
+
+        # trava por usuário (EMAIL): busca direta no índice, sem varrer a base
+        if not IS_ADMIN:
+            with etapa("registros_do_usuario") as info:
+                dados_calc = registros_do_usuario(base, LOGIN_EMAIL)
+                info["linhas"] = len(dados_calc)
+        else:
+            dados_calc = base["dados"]
+
+        # filtros extras só para admin (porque usuário comum só tem 1 registro)
+        filtro_nome = ""
+        filtro_empresa = "Todas"
+        if IS_ADMIN:
+            st.markdown('<div class="sb-divider"></div><div class="sb-section-title">ADMIN</div>', unsafe_allow_html=True)
+            filtro_nome = st.text_input("Buscar por nome", value="")
+
+            if base["empresas"] is not None:
+                filtro_empresa = st.selectbox("Empresa", ["Todas"] + base["empresas"]["opcoes"], index=0)
+
+            info_cache = cache_planilha_info(MOTOR)
+            st.caption(f"Cache da planilha: {info_cache['hits']} hits • {info_cache['misses']} misses")
+            erro_vigia = erro_recente(MOTOR)
+            if erro_vigia is not None:
+                st.caption(f"⚠️ Última atualização dos dados falhou (mantida a versão anterior): {erro_vigia}")
+
+            # folha de todos os períodos da versão em vigor (não depende dos filtros)
+            with st.expander("Exportar folha"):
+                formato = st.selectbox("Formato", FORMATOS, key="exportar_formato", format_func=str.upper)
+                chave_exportacao = (versao["planilha"], versao["pesos"], formato)
+                if st.button("Gerar arquivo", use_container_width=True):
+                    with st.spinner("Gerando exportação..."):
+                        bases_versao = {p: b["dados"] for p, b in versao["bases"].items()}
+                        st.session_state["exportacao"] = (chave_exportacao, *exportacao_em_bytes(bases_versao, versao["config"], formato))
+                pronta = st.session_state.get("exportacao")
+                if pronta and pronta[0] == chave_exportacao:
+                    _, nome_arquivo, conteudo = pronta
+                    st.download_button(
+                        "Baixar " + nome_arquivo,
+                        data=conteudo,
+                        file_name=nome_arquivo,
+                        mime=MIME_EXPORTACAO[Path(nome_arquivo).suffix],
+                        use_container_width=True,
+                    )
 
-    st.markdown(
-        f"""
+        st.markdown(
+            f"""
 <div class="sb-divider"></div>
 <div style="opacity:.85;font-weight:900;font-size:.80rem;">Logado como</div>
 <div style="font-weight:950;margin-top:2px;">{LOGIN_EMAIL}</div>
 <div style="opacity:.75;font-weight:900;font-size:.78rem;margin-top:4px;">Perfil: {"ADMIN" if IS_ADMIN else "USUÁRIO"}</div>
 """,
-        unsafe_allow_html=True,
-    )
-
-    st.markdown('<div class="sb-divider"></div>', unsafe_allow_html=True)
-    if st.button("Sair", use_container_width=True):
-        st.session_state["autenticado"] = False
-        st.session_state.pop("login_email", None)
-        st.session_state.pop("is_admin", None)
-        st.rerun()
+            unsafe_allow_html=True,
+        )
 
-# ===================== CONTEÚDO =====================
-dados_view = dados_calc.copy()
+        st.markdown('<div class="sb-divider"></div>', unsafe_allow_html=True)
+        if st.button("Sair", use_container_width=True):
+            st.session_state["autenticado"] = False
+            st.session_state.pop("login_email", None)
+            st.session_state.pop("is_admin", None)
+            st.rerun()
 
-if IS_ADMIN:
-    if filtro_nome:
-        dados_view = dados_view[dados_view["NOME"].astype(str).str.contains(filtro_nome, case=False, na=False)]
-    if ("EMPRESA" in dados_view.columns) and (filtro_empresa != "Todas"):
-        dados_view = dados_view[dados_view["EMPRESA"].astype(str) == filtro_empresa]
+    # ===================== CONTEÚDO =====================
+    with etapa("filtro") as info:
+        dados_view = filtrar_admin(base, filtro_nome, filtro_empresa) if IS_ADMIN else dados_calc
+        info["linhas"] = len(dados_view)
 
-if dados_view.empty:
-    st.warning("Nenhum registro encontrado para este usuário/período. Verifique a coluna EMAIL na planilha.")
-    st.stop()
+    if dados_view.empty:
+        st.warning("Nenhum registro encontrado para este usuário/período. Verifique a coluna EMAIL na planilha.")
+        st.stop()
 
-dados_view = dados_view.sort_values(by="%", ascending=False)
+    with etapa("ordenar", len(dados_view)):
+        dados_view = dados_view.sort_values(by="%", ascending=False)
 
-periodo_label = "Trimestre" if filtro_mes == "TRIMESTRE" else filtro_mes
+    periodo_label = rotulo_periodo(filtro_mes)
 
-st.markdown(
-    f"""
+    st.markdown(
+        f"""
 <div>
   <div class="page-title">Relatório de Bônus</div>
   <div class="page-sub">Visão consolidada de <b>{periodo_label}</b></div>
 </div>
 """,
-    unsafe_allow_html=True,
-)
-
-total_possivel = float(dados_view["META"].sum()) if "META" in dados_view.columns else 0.0
-recebido = float(dados_view["RECEBIDO"].sum()) if "RECEBIDO" in dados_view.columns else 0.0
-perda = float(dados_view["PERDA"].sum()) if "PERDA" in dados_view.columns else 0.0
-qtd = len(dados_view)
+        unsafe_allow_html=True,
+    )
 
-render_kpis(total_possivel, recebido, perda, qtd)
+    total_possivel = float(dados_view["META"].sum()) if "META" in dados_view.columns else 0.0
+    recebido = float(dados_view["RECEBIDO"].sum()) if "RECEBIDO" in dados_view.columns else 0.0
+    perda = float(dados_view["PERDA"].sum()) if "PERDA" in dados_view.columns else 0.0
+    qtd = len(dados_view)
 
-left, right = st.columns([1.05, 1.25], gap="large")
+    render_kpis(total_possivel, recebido, perda, qtd)
 
-with left:
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title">📌 Resumo</div>', unsafe_allow_html=True)
+    left, right = st.columns([1.05, 1.25], gap="large")
 
-    cumprimento_medio = 0.0 if total_possivel == 0 else (recebido / total_possivel) * 100.0
-    resumo = pd.DataFrame(
-        {
-            "Item": ["Total possível", "Recebido", "Deixou de ganhar", "Cumprimento médio"],
-            "Valor": [brl(total_possivel), brl(recebido), brl(perda), f"{cumprimento_medio:.1f}%"],
-        }
-    )
-    st.dataframe(resumo, use_container_width=True, hide_index=True)
+    with left:
+        st.markdown('<div class="section">', unsafe_allow_html=True)
+        st.markdown('<div class="section-title">📌 Resumo</div>', unsafe_allow_html=True)
 
+        cumprimento_medio = 0.0 if total_possivel == 0 else (recebido / total_possivel) * 100.0
+        resumo = pd.DataFrame(
+            {
+                "Item": ["Total possível", "Recebido", "Deixou de ganhar", "Cumprimento médio"],
+                "Valor": [brl(total_possivel), brl(recebido), brl(perda), f"{cumprimento_medio:.1f}%"],
+            }
+        )
+        st.dataframe(resumo, use_container_width=True, hide_index=True)
+
+        if IS_ADMIN:
+            top = dados_view.head(5)
+            cols_top = [c for c in ["NOME", "EMPRESA", "%", "RECEBIDO", "PERDA"] if c in top.columns]
+            top = top[cols_top]
+            if "%" in top.columns:
+                top["%"] = top["%"].apply(lambda x: f"{float(x):.1f}%")
+            if "RECEBIDO" in top.columns:
+                top["RECEBIDO"] = top["RECEBIDO"].apply(brl)
+            if "PERDA" in top.columns:
+                top["PERDA"] = top["PERDA"].apply(brl)
+            if "EMPRESA" in top.columns:
+                top["EMPRESA"] = top["EMPRESA"].astype(str).str.title()
+
+            st.markdown('<div style="height:10px"></div>', unsafe_allow_html=True)
+            st.markdown('<div class="section-title">🏆 Top 5</div>', unsafe_allow_html=True)
+            st.dataframe(top, use_container_width=True, hide_index=True)
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with right:
+        st.markdown('<div class="section">', unsafe_allow_html=True)
+        st.markdown('<div class="section-title">👥 Analistas</div>', unsafe_allow_html=True)
+
+        # admin: só a página visível é formatada e enviada; KPIs e Top 5 acima
+        # continuam usando a base filtrada inteira
+        dados_cards = dados_view
+        if IS_ADMIN:
+            filtro_atual = (filtro_mes, filtro_nome, filtro_empresa)
+            if st.session_state.get("cards_filtro") != filtro_atual:
+                st.session_state["cards_filtro"] = filtro_atual
+                st.session_state["cards_visiveis"] = CARDS_POR_PAGINA
+            dados_cards = dados_view.head(st.session_state["cards_visiveis"])
+
+        cols_cards = st.columns(2, gap="medium")
+
+        # um bloco HTML por coluna (em vez de um st.markdown por analista)
+        with etapa("cards_html", len(dados_cards)):
+            cards = cards_html(dados_cards)
+        with etapa("render_cards", len(cards)):
+            for idx, col in enumerate(cols_cards):
+                with col:
+                    st.markdown("".join(cards[idx::2]), unsafe_allow_html=True)
+
+        if len(dados_cards) < len(dados_view):
+            st.caption(f"Mostrando {len(dados_cards)} de {len(dados_view)} analistas")
+            st.button("Carregar mais", key="cards_mais", on_click=mais_cards, use_container_width=True)
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # ===================== SIMULADOR DE PESOS (ADMIN) =====================
+    # todos os analistas do período (sem os filtros da lateral); nada é gravado
     if IS_ADMIN:
-        top = dados_view.head(5).copy()
-        cols_top = [c for c in ["NOME", "EMPRESA", "%", "RECEBIDO", "PERDA"] if c in top.columns]
-        top = top[cols_top]
-        if "%" in top.columns:
-            top["%"] = top["%"].apply(lambda x: f"{float(x):.1f}%")
-        if "RECEBIDO" in top.columns:
-            top["RECEBIDO"] = top["RECEBIDO"].apply(brl)
-        if "PERDA" in top.columns:
-            top["PERDA"] = top["PERDA"].apply(brl)
-        if "EMPRESA" in top.columns:
-            top["EMPRESA"] = top["EMPRESA"].astype(str).str.title()
-
-        st.markdown('<div style="height:10px"></div>', unsafe_allow_html=True)
-        st.markdown('<div class="section-title">🏆 Top 5</div>', unsafe_allow_html=True)
-        st.dataframe(top, use_container_width=True, hide_index=True)
-
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with right:
-    st.markdown('<div class="section">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title">👥 Analistas</div>', unsafe_allow_html=True)
-
-    cols_cards = st.columns(2, gap="medium")
-
-    for idx, (_, row) in enumerate(dados_view.iterrows()):
-        pct = float(row.get("%", 0) or 0)
-        meta = float(row.get("META", 0) or 0)
-        rec = float(row.get("RECEBIDO", 0) or 0)
-        per = float(row.get("PERDA", 0) or 0)
-
-        nome = str(row.get("NOME", "")).title()
-        empresa = str(row.get("EMPRESA", "")).title() if "EMPRESA" in dados_view.columns else ""
-        tempo = str(row.get("TEMPO DE CASA", "")).strip() if "TEMPO DE CASA" in dados_view.columns else ""
-
-        obs = texto_obs(row.get("_obs", row.get("OBSERVAÇÃO", "")))
-        perdidos_txt = texto_obs(row.get("INDICADORES_NAO_ENTREGUES", ""))
-
-        tag = "Excelente" if pct >= 95 else ("Atenção" if pct < 80 else "Ok")
-        meta_line = f"Analista — {empresa}" if empresa else "Analista"
-        if tempo:
-            meta_line = f"{meta_line} • {tempo}"
-
-        with cols_cards[idx % 2]:
-            st.markdown(
-                f"""
-<div class="person-card">
-  <p class="person-name">{nome}</p>
-  <div class="person-meta">{meta_line}</div>
-
-  <div class="person-grid">
-    <div class="pill"><div class="lbl">Meta</div><div class="val">{brl(meta)}</div></div>
-    <div class="pill"><div class="lbl">Recebido</div><div class="val">{brl(rec)}</div></div>
-    <div class="pill"><div class="lbl">Perda</div><div class="val">{brl(per)}</div></div>
-    <div class="pill"><div class="lbl">Cumprimento</div><div class="val">{pct:.1f}%</div></div>
-  </div>
-
-  <div style="height:10px"></div>
-  <div class="bar"><div style="width:{max(0,min(100,pct)):.1f}%"></div></div>
-
-  <div style="height:10px"></div>
-  <div class="muted"><b>Status:</b> {tag}</div>
-
-  {"<div style='height:8px'></div><div class='muted'><span class='warn'>Indicadores não entregues:</span> "+perdidos_txt+"</div>" if perdidos_txt else ""}
-  {"<div style='height:8px'></div><div class='muted'>Obs.: "+obs+"</div>" if obs else ""}
-</div>
-""",
-                unsafe_allow_html=True,
+        with st.expander("🧮 Simulador de pesos"):
+            indicadores = versao["config"]["indicadores"]
+            st.caption(
+                f"Quanto seria pago em {periodo_label} com outros pesos no pesos_analistas.json. "
+                "O cenário Atual usa os pesos do arquivo."
             )
-
-    st.markdown("</div>", unsafe_allow_html=True)
+            modo = st.radio("Cenários", ["Tabela de pesos", "Variar um indicador"], horizontal=True, key="simulador_modo")
+            if modo == "Tabela de pesos":
+                tabela = st.data_editor(
+                    pd.DataFrame([{"Cenário": "Cenário 1", **{ind["item"]: ind["peso"] for ind in indicadores}}]),
+                    num_rows="dynamic",
+                    hide_index=True,
+                    use_container_width=True,
+                    # pesos novos no arquivo: a tabela recomeça dos pesos atuais
+                    key=f"simulador_tabela_{versao['pesos']}",
+                )
+                cenarios = {}
+                for i, linha in enumerate(tabela.to_dict("records")):
+                    nome = str(linha.pop("Cenário") or "").strip() or f"Cenário {i + 1}"
+                    cenarios[nome] = {item: peso for item, peso in linha.items() if pd.notna(peso)}
+            else:
+                col_item, col_faixa = st.columns([1.2, 1])
+                item = col_item.selectbox("Indicador", [ind["item"] for ind in indicadores], key="simulador_item")
+                inicio, fim = col_faixa.slider("Faixa do peso", 0.0, 1.0, (0.0, 0.6), step=0.05, key="simulador_faixa")
+                manter = st.checkbox(
+                    "Manter a soma dos pesos (os outros indicadores se ajustam na mesma proporção)",
+                    value=True,
+                    key="simulador_manter",
+                )
+                valores = [inicio + 0.05 * i for i in range(round((fim - inicio) / 0.05) + 1)]
+                cenarios = varrer_peso(indicadores, item, valores, manter)
+
+            try:
+                resultado = simular_periodo(MOTOR, versao, filtro_mes, cenarios)
+            except ValueError as e:
+                st.warning(f"Cenário inválido: {e}")
+            else:
+                totais = totais_por_cenario(resultado)
+                st.dataframe(tabela_cenarios(totais), use_container_width=True, hide_index=True)
+                st.markdown("**Recebido por empresa**")
+                por_empresa = resultado.pivot(index="EMPRESA", columns="CENARIO", values="RECEBIDO")[list(totais["CENARIO"])]
+                por_empresa.index = por_empresa.index.astype(str).str.title()
+                st.dataframe(por_empresa.apply(lambda s: s.apply(brl)).rename_axis(index="Empresa", columns=None),
+                             use_container_width=True)
+
+    # ===================== PERDAS POR INDICADOR (ADMIN) =====================
+    # recorte do cubo montado com a versão; segue o período e a empresa da lateral
+    if IS_ADMIN:
+        with st.expander("💸 Perdas por indicador"):
+            with etapa("fatiar_cubo") as info:
+                cubo = fatiar_cubo(versao["cubo"], filtro_mes, None if filtro_empresa == "Todas" else filtro_empresa)
+                info["linhas"] = len(cubo)
+            if cubo.empty:
+                st.caption(f"Nenhuma perda em {periodo_label}.")
+            else:
+                st.caption(f"Quanto deixou de ser pago em {periodo_label}, por indicador não entregue.")
+                grafico = cubo.pivot_table(index="INDICADOR", columns="EMPRESA", values="PERDA", aggfunc="sum",
+                                           fill_value=0.0, observed=True)
+                grafico.columns = grafico.columns.astype(str).str.title()
+                st.bar_chart(grafico.rename_axis(index="Indicador", columns="Empresa"), horizontal=True)
+                st.dataframe(tabela_perdas(cubo, "EMPRESA", "Empresa"), use_container_width=True)
+                if cubo["MES"].nunique() > 1:
+                    st.markdown("**Por mês**")
+                    st.dataframe(tabela_perdas(cubo, "MES", "Mês"), use_container_width=True)
+
+    # ===================== HISTÓRICO =====================
+    # meses já gravados em data/historico.sqlite (planilhas de trimestres passados)
+    with etapa("historico"):
+        if not IS_ADMIN:
+            historico = historico_analista(MOTOR["historico_path"], LOGIN_EMAIL)
+            if not historico.empty:
+                with st.expander("📚 Meu histórico"):
+                    st.dataframe(tabela_historico(historico), use_container_width=True, hide_index=True)
+        else:
+            with st.expander("📚 Histórico"):
+                col_ano, col_gravar = st.columns([1, 1.4])
+                ano = col_ano.number_input("Ano dos meses em vigor", 2000, 2100, time.localtime().tm_year,
+                                           key="historico_ano")
+                if col_gravar.button("Gravar meses em vigor no histórico", key="historico_gravar",
+                                     use_container_width=True):
+                    try:
+                        gravados = arquivar_versao(MOTOR, versao, int(ano))
+                    except PlanilhaInvalida as e:
+                        st.error(str(e))
+                    else:
+                        st.success(f"Gravados em {int(ano)}: " + ", ".join(gravados))
+
+                gravados = meses_gravados(MOTOR["historico_path"])
+                if gravados.empty:
+                    st.caption("Nenhum mês gravado ainda.")
+                else:
+                    st.caption("Gravados: " + " • ".join(f"{m.title()}/{a}" for a, m in zip(gravados["ANO"], gravados["MES"])))
+
+                    email = st.text_input("Histórico do analista (e-mail)", key="historico_email")
+                    if email.strip():
+                        historico = historico_analista(MOTOR["historico_path"], email)
+                        if historico.empty:
+                            st.caption("Nenhum mês gravado para este e-mail.")
+                        else:
+                            st.dataframe(tabela_historico(historico), use_container_width=True, hide_index=True)
+
+                    st.markdown("**Perda por indicador**")
+                    col_tri, col_emp = st.columns([1, 1.4])
+                    trimestres = col_tri.number_input("Últimos trimestres", 1, 40, TRIMESTRES_PADRAO,
+                                                      key="historico_trimestres")
+                    empresa = col_emp.selectbox("Empresa", ["Todas"] + empresas_gravadas(MOTOR["historico_path"]),
+                                                key="historico_empresa")
+                    perdas = perdas_por_indicador(MOTOR["historico_path"], int(trimestres),
+                                                  None if empresa == "Todas" else empresa)
+                    if perdas.empty:
+                        st.caption("Nenhuma perda gravada nestes trimestres.")
+                    else:
+                        perdas["Trimestre"] = perdas["TRIMESTRE"] + "/" + perdas["ANO"].astype(str)
+                        tabela = perdas.pivot_table(index="INDICADOR", columns="Trimestre", values="PERDA",
+                                                    aggfunc="sum", fill_value=0.0, sort=False)
+                        ordem = sorted(tabela.columns, key=lambda t: (t[3:], t[:2]))
+                        st.dataframe(tabela[ordem].apply(lambda s: s.apply(brl)).rename_axis(index="Indicador", columns=None),
+                                     use_container_width=True)
+
+    return versao
+
+with medindo("rerun") as MEDICAO:
+    versao = painel()
+
+# ===================== DIAGNÓSTICO (ADMIN) =====================
+if IS_ADMIN:
+    with st.expander("⏱️ Diagnóstico"):
+        st.markdown(f"**Este rerun:** {MEDICAO['total_ms']:.1f} ms")
+        st.dataframe(tabela_etapas(MEDICAO), use_container_width=True, hide_index=True)
+        if MEDICAO["cache"]:
+            st.caption("Cache neste rerun: " + " • ".join(
+                f"{nome} {c['hits']} hits / {c['misses']} misses" for nome, c in MEDICAO["cache"].items()
+            ))
+
+        carga = versao.get("medicao")
+        if carga is not None:
+            st.markdown(f"**Última carga dos dados:** {carga['total_ms']:.1f} ms")
+            st.dataframe(tabela_etapas(carga), use_container_width=True, hide_index=True)
+
+        st.markdown("**Caches do processo**")
+        caches = pd.DataFrame.from_dict(caches_info(MOTOR), orient="index").rename_axis("Cache").reset_index()
+        caches["MB"] = pd.to_numeric(caches.pop("bytes"), errors="coerce") / 2**20
+        st.dataframe(caches.round({"MB": 3}), use_container_width=True, hide_index=True)
+
+        memoria = memoria_periodos(MOTOR, versao)
+        st.markdown("**Memória por período (versão em vigor)**")
+        st.dataframe(
+            pd.DataFrame({
+                "Período": [rotulo_periodo(p) for p in memoria],
+                "Linhas": [len(versao["bases"][p]["dados"]) for p in memoria],
+                "MB": [None if b is None else round(b / 2**20, 3) for b in memoria.values()],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+        if MEDICAO.get("perfil"):
+            st.caption(f"cProfile: {MEDICAO['perfil']}")
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Benchmark do painel (sem servidor Streamlit)
+# - Gera planilhas sintéticas no formato RESUMO PARA PAINEL - ANALISTAS.xlsx
+#   (100 a 100 mil analistas, vários meses e empresas, licenças/férias e
+#   BATEU_* com taxas de acerto realistas)
+# - Chama as funções do pacote bonus direto e mede cada etapa: leitura,
+#   calcula_mes, montagem de cada período, filtros e HTML dos cards, e a
+#   leitura + cálculo de todos os meses no pool de processos (--trabalhadores)
+# - Relatório JSON com tempo (s) e pico de memória (MB) por etapa, para
+#   comparar entre commits, e memória dos DataFrames que o painel guarda em cache
+#
+# Uso:  python app/benchmark.py [--analistas N ...] [--meses N] [--empresas N]
+#                               [--extras N] [--repeticoes N] [--trabalhadores N]
+#                               [--sem-memoria] [--saida ARQ]
+# ============================================================
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bonus import (
+    MESES_ANO,
+    FUNCAO_PAINEL,
+    carregar_config,
+    periodos_disponiveis,
+    meses_do_periodo,
+    eh_mes,
+    calcula_mes,
+    base_mensal,
+    combinar_parciais,
+    parcial_do_mes,
+    finalizar_parcial,
+    filtrar_analistas,
+    ler_abas,
+    indexar_base,
+    registros_do_usuario,
+    filtrar_admin,
+    cards_html,
+    memoria_df,
+    memoria_abas,
+    calcular_meses,
+    nucleos_disponiveis,
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PESOS_PATH = DATA_DIR / "pesos_analistas.json"
+EMPRESA_INDICADORES_PATH = DATA_DIR / "empresa_indicadores_analistas.json"
+PASTA_PLANILHAS = Path(tempfile.gettempdir()) / "painel-bonus-benchmark"
+
+TAMANHOS_PADRAO = [100, 1_000, 10_000]
+# mesmo tamanho de página da visão admin (CARDS_POR_PAGINA no app.py)
+CARDS_POR_PAGINA = 20
+
+# ===================== PLANILHA SINTÉTICA =====================
+EMPRESAS = ["LOG", "STARCHECK", "VELOX", "TOKYO", "VISTORIA SUL", "AUTOCHECK", "PRIME", "NORTE"]
+PRIMEIROS = ["ANA", "JOÃO", "MARIA", "JOSÉ", "PEDRO HENRIQUE", "FERNANDA", "LUCAS", "JULIANA",
+             "CARLOS", "PATRÍCIA", "RAFAEL", "BEATRIZ", "GERONALDO", "CAMILA", "THIAGO", "LETÍCIA"]
+SOBRENOMES = ["SILVA", "SANTOS", "OLIVEIRA", "SOUZA", "LIMA", "PEREIRA", "COSTA", "FERREIRA",
+              "ALMEIDA", "RODRIGUES", "GOMES", "MARTINS", "ARAÚJO", "PIRES", "DE MATOS", "E SILVA"]
+OUTRAS_FUNCOES = ["SUPERVISOR", "COORDENADOR", "ASSISTENTE"]
+# taxa de "SIM" por indicador
+TAXAS_BATEU = {
+    "BATEU_PRODUCAO": 0.82,
+    "BATEU_TMG_GERAL": 0.90,
+    "BATEU_TMA_ANALISTA": 0.78,
+    "BATEU_TEMPO_FILA": 0.70,
+    "BATEU_CONFORMIDADE": 0.88,
+}
+# OBSERVAÇÃO: a maioria vazia; "LICEN" tira a elegibilidade do mês
+OBSERVACOES = [None, "Licença médica", "Licença maternidade", "Férias", "Afastamento parcial", "Treinamento"]
+PROB_OBSERVACOES = [0.90, 0.02, 0.01, 0.04, 0.02, 0.01]
+
+def _escolher(rng, opcoes, n, p=None):
+    return np.asarray(opcoes, dtype=object)[rng.choice(len(opcoes), size=n, p=p)]
+
+def gerar_planilha(caminho: Path, analistas: int, meses: int = 3, empresas: int = 4, seed: int = 42,
+                   extras: int = 0) -> Path:
+    # mesmo (analistas, meses, empresas, seed, extras) = mesma planilha;
+    # extras = colunas que o painel não usa (como na planilha consolidada)
+    rng = np.random.default_rng(seed)
+    outros = max(1, analistas // 12)   # linhas de outras funções (filtradas pelo painel)
+    n = analistas + outros
+
+    primeiro = _escolher(rng, PRIMEIROS, n)
+    sobrenome = _escolher(rng, SOBRENOMES, n)
+    nome = pd.Series(primeiro) + " " + pd.Series(_escolher(rng, SOBRENOMES, n)) + " " + pd.Series(sobrenome)
+    email = [f"{p.split(' ')[0].lower()}.{i}@vistorias.com" for i, p in enumerate(primeiro)]
+    # empresas com tamanhos diferentes (a primeira é a maior)
+    pesos_emp = 1.0 / np.arange(1, empresas + 1)
+    empresa = _escolher(rng, EMPRESAS[:empresas], n, pesos_emp / pesos_emp.sum())
+    funcao = np.array(["ANALISTA"] * analistas + list(_escolher(rng, OUTRAS_FUNCOES, outros)), dtype=object)
+    dias = rng.integers(30, 6 * 365, size=n)
+    admissao = pd.Timestamp("2025-01-01") - pd.to_timedelta(dias, unit="D")
+    anos = dias // 365
+    tempo = np.where(anos == 0, (dias // 30).astype(str) + " meses",
+                     np.where(anos == 1, "1 ano", anos.astype(str) + " anos"))
+
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    tmp = caminho.with_name(caminho.stem + ".tmp" + caminho.suffix)
+    with pd.ExcelWriter(tmp, engine="openpyxl") as xls:
+        for mes in MESES_ANO[:meses]:
+            meta = _escolher(rng, [300, 400, 500, 600, 0], n, [0.25, 0.40, 0.20, 0.11, 0.04]).astype(float)
+            meta[rng.random(n) < 0.01] = np.nan
+            df = pd.DataFrame({
+                "EMPRESA": empresa,
+                "NOME": nome,
+                "FUNÇÃO": funcao,
+                "DATA DE ADMISSÃO": admissao,
+                "TEMPO DE CASA": tempo,
+                "EMAIL": email,
+                "VALOR MENSAL META": meta,
+            })
+            for coluna, taxa in TAXAS_BATEU.items():
+                valores = np.where(rng.random(n) < taxa, "SIM", "NÃO").astype(object)
+                valores[rng.random(n) < 0.01] = None   # vazio conta como batido
+                df[coluna] = valores
+            df["OBSERVAÇÃO"] = _escolher(rng, OBSERVACOES, n, PROB_OBSERVACOES)
+            for i in range(extras):
+                df[f"EXTRA_{i + 1:02d}"] = rng.integers(0, 1000, size=n) if i % 2 else _escolher(rng, SOBRENOMES, n)
+            df.to_excel(xls, sheet_name=mes, index=False)
+    tmp.replace(caminho)
+    return caminho
+
+def planilha_sintetica(pasta: Path, analistas: int, meses: int, empresas: int, seed: int, extras: int = 0) -> Path:
+    # gera só na primeira vez; as próximas rodadas medem a mesma planilha
+    sufixo = f"-x{extras}" if extras else ""
+    caminho = Path(pasta) / f"RESUMO PARA PAINEL - ANALISTAS - {analistas}x{meses}x{empresas}-s{seed}{sufixo}.xlsx"
+    if not caminho.exists():
+        gerar_planilha(caminho, analistas, meses, empresas, seed, extras)
+    return caminho
+
+# ===================== MEDIÇÃO =====================
+def medir(etapas: list, nome: str, func, repeticoes: int = 1, memoria: bool = True):
+    # melhor tempo em `repeticoes` execuções sem tracemalloc (que deixa o
+    # Python mais lento) e, se pedido, mais uma execução só para o pico
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func()
+        tempos.append(time.perf_counter() - inicio)
+    etapa = {"etapa": nome, "segundos": round(min(tempos), 6)}
+    if memoria:
+        tracemalloc.start()
+        try:
+            func()
+            etapa["pico_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+        finally:
+            tracemalloc.stop()
+    etapas.append(etapa)
+    return resultado
+
+def montar_periodo(calculados: dict, periodo: str) -> pd.DataFrame:
+    # mesmo caminho do painel, sem os caches: mês direto, agregado pelas parciais
+    if eh_mes(periodo):
+        return base_mensal(calculados[periodo])
+    meses = meses_do_periodo(periodo, list(calculados))
+    return finalizar_parcial(combinar_parciais([parcial_do_mes(calculados[m]) for m in meses]))
+
+def rodar(caminho: Path, config: dict, repeticoes: int, memoria: bool, trabalhadores: int) -> dict:
+    etapas = []
+    def m(nome, func):
+        return medir(etapas, nome, func, repeticoes, memoria)
+
+    abas = m("ler_planilha", lambda: ler_abas(caminho, config["colunas"], FUNCAO_PAINEL))
+    calculados = {}
+    for mes in [mm for mm in MESES_ANO if mm in abas]:
+        calculados[mes] = m(f"calcula_mes:{mes}", lambda mes=mes: calcula_mes(
+            abas[mes], mes, config["indicadores"], config["mascaras"]))
+
+    # leitura + calcula_mes de todos os meses de uma vez, um processo por mês
+    # (o tracemalloc não enxerga os processos filhos: sem pico de memória)
+    origens = {mes: caminho for mes in calculados}
+    medir(etapas, f"calcular_meses:{trabalhadores}_processos",
+          lambda: calcular_meses(origens, config, trabalhadores), repeticoes, memoria=False)
+
+    bases = {}
+    for periodo in periodos_disponiveis(list(calculados)):
+        bases[periodo] = m(f"montar_base:{periodo}", lambda p=periodo: filtrar_analistas(montar_periodo(calculados, p)))
+
+    # filtros e cards sobre o período mais amplo (acumulado, ou o último trimestre)
+    periodo = [p for p in bases if not eh_mes(p)][-1]
+    base = m("indexar_base", lambda: indexar_base(bases[periodo]))
+    dados = base["dados"]
+    email = dados["EMAIL"].iloc[len(dados) // 2]
+    empresa = base["empresas"]["opcoes"][0] if base["empresas"] else "Todas"
+    m("filtro_usuario", lambda: registros_do_usuario(base, email))
+    # consultas diferentes a cada execução: o cache de consultas não interfere
+    consultas = iter(["sil", "silva", "ana", "jo", "mat", "lim", "per", "cos"] * (repeticoes + 2))
+    m("filtro_admin_nome", lambda: filtrar_admin(base, next(consultas), "Todas"))
+    m("filtro_admin_empresa", lambda: filtrar_admin(base, "", empresa))
+    ordenados = dados.sort_values(by="%", ascending=False)
+    m("cards_html:pagina", lambda: cards_html(ordenados.iloc[:CARDS_POR_PAGINA]))
+    m("cards_html:todos", lambda: cards_html(ordenados))
+
+    return {
+        "planilha": caminho.name,
+        "linhas_por_aba": int(len(next(iter(abas.values())))) if abas else 0,
+        "periodo_filtros": periodo,
+        "etapas": etapas,
+        # o que fica em cache no painel: abas lidas e dados de cada período
+        "memoria_mb": {
+            "abas": round(memoria_abas(abas) / 2**20, 2),
+            "periodos": {p: round(memoria_df(d) / 2**20, 2) for p, d in bases.items()},
+        },
+        "total_segundos": round(sum(e["segundos"] for e in etapas), 6),
+    }
+
+def _commit_atual():
+    try:
+        saida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                               capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return saida.stdout.strip() or None
+
+def _pico_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss: KB no Linux, bytes no macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(pico / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mede as etapas do painel de bônus em planilhas sintéticas.")
+    parser.add_argument("--analistas", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="quantidades de analistas (padrão: 100 1000 10000; até 100000)")
+    parser.add_argument("--meses", type=int, default=3, help="abas de mês a partir de JANEIRO (1-12, padrão 3)")
+    parser.add_argument("--empresas", type=int, default=4, help=f"empresas distintas (1-{len(EMPRESAS)}, padrão 4)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--extras", type=int, default=0, help="colunas extras que o painel não lê (padrão 0)")
+    parser.add_argument("--repeticoes", type=int, default=3, help="execuções por etapa; vale o melhor tempo")
+    parser.add_argument("--trabalhadores", type=int, default=nucleos_disponiveis(),
+                        help="processos da etapa calcular_meses (padrão: um por núcleo)")
+    parser.add_argument("--sem-memoria", action="store_true", help="não mede o pico de memória (mais rápido)")
+    parser.add_argument("--pasta", type=Path, default=PASTA_PLANILHAS, help="onde guardar as planilhas geradas")
+    parser.add_argument("--pesos", type=Path, default=PESOS_PATH, help="pesos_analistas.json")
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo JSON do relatório (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.meses <= 12 or not 1 <= args.empresas <= len(EMPRESAS) or args.repeticoes < 1 or args.extras < 0 \
+            or args.trabalhadores < 1:
+        parser.error("--meses, --empresas, --repeticoes, --extras ou --trabalhadores fora do intervalo")
+
+    config = carregar_config(args.pesos, EMPRESA_INDICADORES_PATH)
+
+    execucoes = []
+    for analistas in args.analistas:
+        inicio = time.perf_counter()
+        caminho = planilha_sintetica(args.pasta, analistas, args.meses, args.empresas, args.seed, args.extras)
+        print(f"{analistas:>7} analistas: planilha pronta ({time.perf_counter() - inicio:.1f}s)", file=sys.stderr)
+        resultado = rodar(caminho, config, args.repeticoes, not args.sem_memoria, args.trabalhadores)
+        execucoes.append({"analistas": analistas, **resultado})
+        print(f"{analistas:>7} analistas: {resultado['total_segundos']:.3f}s no total", file=sys.stderr)
+
+    relatorio = {
+        "gerado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit_atual(),
+        "ambiente": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "nucleos": nucleos_disponiveis(),
+        },
+        "parametros": {
+            "meses": args.meses,
+            "empresas": args.empresas,
+            "seed": args.seed,
+            "extras": args.extras,
+            "repeticoes": args.repeticoes,
+            "trabalhadores": args.trabalhadores,
+            "memoria": not args.sem_memoria,
+        },
+        "execucoes": execucoes,
+        "pico_rss_mb": _pico_rss_mb(),
+    }
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.saida:
+        args.saida.write_text(texto + "\n", encoding="utf-8")
+        print(f"relatório gravado em {args.saida}", file=sys.stderr)
+    else:
+        print(texto)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
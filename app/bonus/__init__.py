@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# Núcleo do painel de bônus: leitura da planilha e cálculo, sem Streamlit.
+# Os submódulos são importados só no primeiro uso de um nome (import bonus
+# não carrega pandas/numpy/pyarrow; regras.py e vigia.py não dependem deles).
+
+import importlib
+
+_ORIGEM = {
+    # regras.py
+    "MESES_ANO": "regras",
+    "TRIMESTRES": "regras",
+    "ACUMULADO": "regras",
+    "PlanilhaInvalida": "regras",
+    "norm_txt": "regras",
+    "up": "regras",
+    "norm_email": "regras",
+    "texto_obs": "regras",
+    "bool_safe": "regras",
+    "elegivel": "regras",
+    "brl": "regras",
+    "load_json": "regras",
+    "INDICADORES_PADRAO": "regras",
+    "compilar_indicadores": "regras",
+    "versao_pesos": "regras",
+    "POLITICAS_DESLIGADO": "regras",
+    "politica_desligado": "regras",
+    "mes_da_aba": "regras",
+    "periodos_disponiveis": "regras",
+    "meses_do_periodo": "regras",
+    "eh_mes": "regras",
+    "rotulo_periodo": "regras",
+    # calculo.py
+    "map_unicos": "calculo",
+    "brl_serie": "calculo",
+    "compilar_mascaras": "calculo",
+    "COLS_BASE": "calculo",
+    "COLS_OPCIONAIS": "calculo",
+    "FUNCAO_PAINEL": "calculo",
+    "colunas_obrigatorias": "calculo",
+    "colunas_lidas": "calculo",
+    "checar_colunas": "calculo",
+    "filtrar_analistas": "calculo",
+    "calcula_mes": "calculo",
+    "base_mensal": "calculo",
+    "combinar_parciais": "calculo",
+    "parcial_do_mes": "calculo",
+    "finalizar_parcial": "calculo",
+    "indexar_emails": "calculo",
+    "pegar_aba": "calculo",
+    "montar_periodos": "calculo",
+    "pesos_com_mascara": "calculo",
+    "meta_elegivel": "calculo",
+    "periodos_calculados": "calculo",
+    "perda_por_item": "calculo",
+    "CUBO_COLS": "calculo",
+    "cubo_do_mes": "calculo",
+    "juntar_cubos": "calculo",
+    "fatiar_cubo": "calculo",
+    # planilha.py
+    "COLUNAS_CATEGORIA": "planilha",
+    "compactar_aba": "planilha",
+    "PLANILHA_NOME": "planilha",
+    "PLANILHA_GLOB": "planilha",
+    "localizar_planilhas": "planilha",
+    "exigir_planilhas": "planilha",
+    "assinatura_arquivo": "planilha",
+    "hash_arquivo": "planilha",
+    "hash_conjunto": "planilha",
+    "ler_abas": "planilha",
+    "meses_da_planilha": "planilha",
+    "meses_das_planilhas": "planilha",
+    "impressoes_abas": "planilha",
+    "juntar_abas": "planilha",
+    "ler_planilhas": "planilha",
+    # busca.py
+    "indexar_nomes": "busca",
+    "buscar_nomes": "busca",
+    "indexar_empresas": "busca",
+    "mascara_empresa": "busca",
+    "indexar_base": "busca",
+    "registros_do_usuario": "busca",
+    "filtrar_admin": "busca",
+    # vigia.py
+    "assinaturas": "vigia",
+    "criar_vigia": "vigia",
+    "verificar_vigia": "vigia",
+    "iniciar_vigia": "vigia",
+    "versao_vigia": "vigia",
+    # cards.py
+    "cards_html": "cards",
+    # exportar.py
+    "FORMATOS": "exportar",
+    "TAMANHO_BLOCO": "exportar",
+    "blocos_folha": "exportar",
+    "blocos_indicadores": "exportar",
+    "gravar_exportacao": "exportar",
+    "exportacao_em_bytes": "exportar",
+    # snapshot.py
+    "gravar_snapshot": "snapshot",
+    "ler_manifesto": "snapshot",
+    "snapshot_vale": "snapshot",
+    "ler_periodo": "snapshot",
+    # simulador.py
+    "CENARIO_ATUAL": "simulador",
+    "matriz_do_mes": "simulador",
+    "pesos_cenarios": "simulador",
+    "varrer_peso": "simulador",
+    "simular": "simulador",
+    "totais_por_cenario": "simulador",
+    # historico.py
+    "TRIMESTRES_PADRAO": "historico",
+    "gravar_meses": "historico",
+    "meses_gravados": "historico",
+    "historico_analista": "historico",
+    "empresas_gravadas": "historico",
+    "perdas_por_indicador": "historico",
+    # medicao.py
+    "iniciar_medicao": "medicao",
+    "encerrar_medicao": "medicao",
+    "medindo": "medicao",
+    "etapa": "medicao",
+    "marcar_cache": "medicao",
+    "memoria_df": "medicao",
+    "memoria_abas": "medicao",
+    # cache.py
+    "criar_cache": "cache",
+    "no_cache": "cache",
+    "info_cache": "cache",
+    "bytes_da_chave": "cache",
+    "guardar": "cache",
+    "tem_chave": "cache",
+    # paralelo.py
+    "TRABALHADORES_ENV": "paralelo",
+    "nucleos_disponiveis": "paralelo",
+    "trabalhadores_padrao": "paralelo",
+    "trabalhadores_para": "paralelo",
+    "calcular_meses": "paralelo",
+    # painel.py
+    "HISTORICO_ARQUIVO": "painel",
+    "carregar_config": "painel",
+    "criar_motor": "painel",
+    "iniciar_motor": "painel",
+    "versao_dados": "painel",
+    "erro_recente": "painel",
+    "cache_planilha_info": "painel",
+    "caches_info": "painel",
+    "memoria_periodos": "painel",
+    "meses_disponiveis": "painel",
+    "base_indexada": "painel",
+    "montar_base": "painel",
+    "ler_workbook": "painel",
+    "aba_do_mes": "painel",
+    "simular_periodo": "painel",
+    "cubo_de_perdas": "painel",
+    "arquivar_versao": "painel",
+}
+
+__all__ = list(_ORIGEM)
+
+def __getattr__(nome):
+    modulo = _ORIGEM.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(_ORIGEM))
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Índices de filtro da visão admin (nome e empresa)
+# - Nomes sem acento/caixa (norm_txt): "joao" encontra "JOÃO"
+# - Consultas com 3+ letras: trecho em qualquer parte do nome (trigramas)
+# - Consultas de 1-2 letras: trecho em qualquer parte, varrendo os nomes
+#   distintos ("ra" encontra "MARA", como o filtro original)
+# - Base indexada de um período e filtros (usuário pelo e-mail, admin)
+# ============================================================
+
+import pandas as pd
+import numpy as np
+import threading
+
+from .regras import norm_txt, norm_email
+from .calculo import map_unicos, indexar_emails
+
+CACHE_CONSULTAS_MAX = 256
+
+def _trigramas(txt: str) -> set:
+    return {txt[i:i + 3] for i in range(len(txt) - 2)}
+
+def indexar_nomes(nomes: pd.Series) -> dict:
+    # cada nome distinto (já normalizado) vira um id; as buscas trabalham
+    # sobre os ids e só no fim viram posições de linha
+    normalizados = map_unicos(nomes, norm_txt)
+    codigos, unicos = pd.factorize(normalizados)
+    unicos = list(unicos)
+
+    linhas = pd.Series(np.arange(len(codigos))).groupby(codigos).indices
+    trigramas = {}
+    for i, nome in enumerate(unicos):
+        for tri in _trigramas(nome):
+            trigramas.setdefault(tri, set()).add(i)
+
+    return {
+        "nomes": unicos,
+        "linhas": linhas,
+        "trigramas": trigramas,
+        "cache": {},
+        "lock": threading.Lock(),
+    }
+
+def _ids_por_trecho(indice: dict, consulta: str) -> set:
+    grupos = [indice["trigramas"].get(tri, set()) for tri in _trigramas(consulta)]
+    candidatos = set.intersection(*sorted(grupos, key=len)) if grupos else set()
+    # trigramas em comum não garantem o trecho contíguo: confere no nome
+    return {i for i in candidatos if consulta in indice["nomes"][i]}
+
+def _ids_por_varredura(indice: dict, consulta: str) -> set:
+    # sem trigrama para consultar: uma passada pelos nomes distintos (e o
+    # resultado fica no cache de consultas)
+    return {i for i, nome in enumerate(indice["nomes"]) if consulta in nome}
+
+def buscar_nomes(indice: dict, consulta: str) -> np.ndarray:
+    # posições (ordenadas) das linhas cujo nome casa com a consulta
+    consulta = norm_txt(consulta)
+    with indice["lock"]:
+        if consulta in indice["cache"]:
+            return indice["cache"][consulta]
+
+    if not consulta:
+        ids = range(len(indice["nomes"]))
+    elif len(consulta) >= 3:
+        ids = _ids_por_trecho(indice, consulta)
+    else:
+        ids = _ids_por_varredura(indice, consulta)
+
+    partes = [indice["linhas"][i] for i in ids]
+    posicoes = np.sort(np.concatenate(partes)) if partes else np.array([], dtype=np.int64)
+
+    with indice["lock"]:
+        if len(indice["cache"]) >= CACHE_CONSULTAS_MAX:
+            # descarta a consulta mais antiga
+            indice["cache"].pop(next(iter(indice["cache"])))
+        indice["cache"][consulta] = posicoes
+    return posicoes
+
+def indexar_empresas(empresas: pd.Series) -> dict:
+    # opções do selectbox e código de cada linha (-1 = sem empresa)
+    validas = empresas.notna()
+    txt = empresas.astype(str).where(validas)
+    opcoes = sorted(set(txt[validas]))
+    codigos = pd.Categorical(txt, categories=opcoes).codes
+    return {"opcoes": opcoes, "codigos": np.asarray(codigos)}
+
+def mascara_empresa(indice: dict, empresa: str) -> np.ndarray:
+    if empresa not in indice["opcoes"]:
+        return np.zeros(len(indice["codigos"]), dtype=bool)
+    return indice["codigos"] == indice["opcoes"].index(empresa)
+
+# ===================== BASE INDEXADA =====================
+def indexar_base(dados: pd.DataFrame) -> dict:
+    # resultado de um período com os índices de e-mail, nome e empresa
+    base = {
+        "dados": dados,
+        "emails": indexar_emails(dados),
+        "nomes": indexar_nomes(dados["NOME"]),
+        "empresas": None,
+    }
+    if "EMPRESA" in dados.columns:
+        base["empresas"] = indexar_empresas(dados["EMPRESA"])
+    return base
+
+def registros_do_usuario(base: dict, email: str) -> pd.DataFrame:
+    return base["dados"].iloc[base["emails"].get(norm_email(email), [])]
+
+def filtrar_admin(base: dict, nome: str, empresa: str) -> pd.DataFrame:
+    # filtros por índice: busca por nome (cache por consulta) e código da empresa
+    dados = base["dados"]
+    if not nome and empresa == "Todas":
+        return dados
+    mascara = np.ones(len(dados), dtype=bool)
+    if nome:
+        mascara[:] = False
+        mascara[buscar_nomes(base["nomes"], nome)] = True
+    if base["empresas"] is not None and empresa != "Todas":
+        mascara &= mascara_empresa(base["empresas"], empresa)
+    return dados[mascara]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Cache LRU por processo (sem Streamlit), seguro entre threads
+# - Cada chave é calculada uma vez mesmo com várias threads pedindo juntas
+# - Contadores de hits/misses para o painel admin (e por execução, via medicao)
+# - Opcional: bytes de cada entrada (tamanho(valor)), medidos uma vez ao guardar
+# ============================================================
+
+import threading
+from collections import OrderedDict
+
+from .medicao import marcar_cache
+
+def criar_cache(max_entradas: int, nome: str = "cache", tamanho=None) -> dict:
+    return {
+        "nome": nome,
+        "max": max_entradas,
+        "tamanho": tamanho,
+        "itens": OrderedDict(),
+        "bytes": {},        # chave -> bytes (só com tamanho)
+        "calculando": {},   # chave -> trava de quem está calculando
+        "lock": threading.Lock(),
+        "hits": 0,
+        "misses": 0,
+    }
+
+def _pegar(cache: dict, chave):
+    # chamar com cache["lock"]; devolve (achou, valor)
+    if chave in cache["itens"]:
+        cache["itens"].move_to_end(chave)
+        cache["hits"] += 1
+        return True, cache["itens"][chave]
+    return False, None
+
+def no_cache(cache: dict, chave, calcular):
+    # valor da chave; calcular() roda fora do lock geral, então chaves
+    # diferentes são calculadas em paralelo
+    with cache["lock"]:
+        achou, valor = _pegar(cache, chave)
+        if achou:
+            marcar_cache(cache["nome"], True)
+            return valor
+        trava = cache["calculando"].setdefault(chave, threading.Lock())
+
+    with trava:
+        with cache["lock"]:
+            # outra thread pode ter calculado enquanto esta esperava
+            achou, valor = _pegar(cache, chave)
+        if achou:
+            marcar_cache(cache["nome"], True)
+            return valor
+        marcar_cache(cache["nome"], False)
+        try:
+            valor = calcular()
+        finally:
+            with cache["lock"]:
+                cache["calculando"].pop(chave, None)
+        guardar(cache, chave, valor)
+    return valor
+
+def guardar(cache: dict, chave, valor):
+    # valor calculado fora de no_cache (ex.: em outro processo); conta como miss
+    tamanho = cache["tamanho"](valor) if cache["tamanho"] else None
+    with cache["lock"]:
+        cache["misses"] += 1
+        cache["itens"][chave] = valor
+        cache["itens"].move_to_end(chave)
+        if tamanho is not None:
+            cache["bytes"][chave] = tamanho
+        while len(cache["itens"]) > cache["max"]:
+            antiga, _ = cache["itens"].popitem(last=False)
+            cache["bytes"].pop(antiga, None)
+
+def tem_chave(cache: dict, chave) -> bool:
+    # sem mexer na ordem LRU nem nos contadores
+    with cache["lock"]:
+        return chave in cache["itens"]
+
+def bytes_da_chave(cache: dict, chave):
+    # None se a chave não está no cache ou o cache não mede tamanho
+    with cache["lock"]:
+        return cache["bytes"].get(chave)
+
+def info_cache(cache: dict) -> dict:
+    with cache["lock"]:
+        return {
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "entradas": len(cache["itens"]),
+            "max_entries": cache["max"],
+            "bytes": sum(cache["bytes"].values()) if cache["tamanho"] else None,
+        }
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Cálculo do bônus (sem Streamlit), vetorizado com pandas/numpy
+# - Regras escalares, pesos e períodos ficam em regras.py
+# - Máscara por mês (empresa_indicadores_analistas.json): indicadores desligados
+# - calcula_mes (um mês) e agregação de períodos (parciais por mês)
+# ============================================================
+
+import pandas as pd
+import numpy as np
+
+from .regras import (
+    MESES_ANO,
+    PlanilhaInvalida,
+    up,
+    norm_email,
+    texto_obs,
+    bool_safe,
+    mes_da_aba,
+    periodos_disponiveis,
+    meses_do_periodo,
+    eh_mes,
+)
+
+# ===================== HELPERS (COLUNAS) =====================
+def map_unicos(s: pd.Series, func, dtype=object) -> pd.Series:
+    # aplica func só uma vez por valor distinto da coluna (as planilhas repetem
+    # muito os mesmos textos: "SIM", "ANALISTA", ...); vazios viram func(NaN)
+    codigos, unicos = pd.factorize(s, use_na_sentinel=True)
+    valores = np.array([func(u) for u in unicos] + [func(float("nan"))], dtype=dtype)
+    return pd.Series(valores[codigos], index=s.index)
+
+def brl_serie(valores: pd.Series) -> pd.Series:
+    # brl() para a coluna inteira: vazio/não numérico vira R$ 0,00
+    v = pd.to_numeric(valores, errors="coerce").fillna(0.0).astype(float)
+    return "R$ " + v.map("{:,.2f}".format).str.translate(str.maketrans(",.", ".,"))
+
+# ===================== MÁSCARA POR MÊS =====================
+# política (renormalizar/zerar) e chaves dos indicadores: ver regras.py
+def compilar_mascaras(mascara: dict, indicadores: list, politica: str) -> dict:
+    # mês -> vetor de pesos pronto (na ordem de indicadores), calculado uma vez
+    # por versão da configuração; mês fora do arquivo usa os pesos de "metas"
+    base = np.array([ind["peso"] for ind in indicadores], dtype=float)
+    mascaras = {}
+    for aba, flags in (mascara or {}).items():
+        mes = mes_da_aba(aba)
+        if mes is None:
+            raise ValueError(f"mês inválido na máscara de indicadores: {aba!r}")
+        flags = {up(k): v for k, v in (flags or {}).items()}
+        ativos = np.array(
+            [not ind["chave"] or bool_safe(flags.get(up(ind["chave"])), True) for ind in indicadores],
+            dtype=bool,
+        )
+        pesos_mes, fator = pesos_com_mascara(base, ativos, politica)
+        mascaras[mes] = {"ativos": ativos, "pesos": pesos_mes, "fator": float(fator)}
+    return mascaras
+
+def pesos_com_mascara(pesos, ativos, politica: str):
+    # pesos na ordem dos indicadores, (k,) ou (k, cenários) -> (pesos do mês,
+    # fator da meta), um fator por cenário; 1 = a meta inteira vale
+    pesos = np.asarray(pesos, dtype=float)
+    if ativos.all():
+        return pesos, np.ones(pesos.shape[1:])
+    pesos_mes = np.where(ativos.reshape((-1,) + (1,) * (pesos.ndim - 1)), pesos, 0.0)
+    soma, soma_base = pesos_mes.sum(axis=0), pesos.sum(axis=0)
+    if politica == "renormalizar":
+        # todos desligados: não há entre quem redistribuir, o mês fica zerado
+        escala = np.where(soma > 0, soma_base / np.where(soma > 0, soma, 1.0), 1.0)
+        return pesos_mes * escala, np.where(soma > 0, 1.0, 0.0)
+    return pesos_mes, np.where(soma_base > 0, soma / np.where(soma_base > 0, soma_base, 1.0), 0.0)
+
+# ===================== CÁLCULO =====================
+COLS_BASE = [
+    "EMAIL",  # <- NOVO (obrigatório)
+    "NOME", "FUNÇÃO", "VALOR MENSAL META",
+]
+# usadas quando existem (cards, agrupamento, licença); o resto da aba não é lido
+COLS_OPCIONAIS = ["EMPRESA", "OBSERVAÇÃO", "DATA DE ADMISSÃO", "TEMPO DE CASA"]
+# única FUNÇÃO que entra no painel
+FUNCAO_PAINEL = "ANALISTA"
+
+def colunas_obrigatorias(indicadores: list) -> list:
+    return COLS_BASE + [ind["coluna"] for ind in indicadores if ind["coluna"]]
+
+def colunas_lidas(indicadores: list) -> tuple:
+    # projeção da leitura da planilha (ler_abas)
+    return tuple(dict.fromkeys(colunas_obrigatorias(indicadores) + COLS_OPCIONAIS))
+
+def checar_colunas(df: pd.DataFrame, mes: str, indicadores: list):
+    faltando = [c for c in colunas_obrigatorias(indicadores) if c not in df.columns]
+    if faltando:
+        raise PlanilhaInvalida(
+            f"Na aba {mes}, faltam colunas obrigatórias: {', '.join(faltando)}.\n"
+            f"Você precisa criar a coluna EMAIL e preencher com o e-mail de cada analista."
+        )
+
+def filtrar_analistas(df: pd.DataFrame) -> pd.DataFrame:
+    return df[map_unicos(df["FUNÇÃO"], up) == up(FUNCAO_PAINEL)].reset_index(drop=True)
+
+def _observacao(df: pd.DataFrame) -> pd.Series:
+    return df["OBSERVAÇÃO"] if "OBSERVAÇÃO" in df.columns else pd.Series("", index=df.index)
+
+def meta_elegivel(df: pd.DataFrame) -> tuple:
+    # (meta de cada linha, sem meta, licença): mesma regra de elegivel(), em
+    # coluna; quem não é elegível fica com meta 0
+    valor_meta = pd.to_numeric(df["VALOR MENSAL META"], errors="coerce").to_numpy(dtype=float)
+    sem_meta = np.isnan(valor_meta) | (valor_meta == 0)
+    licenca = map_unicos(_observacao(df), lambda o: "LICEN" in up(o), dtype=bool).to_numpy() & ~sem_meta
+    return np.where(~(sem_meta | licenca), valor_meta, 0.0), sem_meta, licenca
+
+def calcula_mes(df_mes: pd.DataFrame, nome_mes: str, indicadores: list, mascaras: dict = None) -> pd.DataFrame:
+    checar_colunas(df_mes, nome_mes, indicadores)
+
+    # filtra função analista (sem copiar a aba inteira antes)
+    df = filtrar_analistas(df_mes)
+
+    # normaliza email
+    df["EMAIL"] = pd.Categorical(map_unicos(df["EMAIL"], norm_email))
+
+    n = len(df)
+    obs = _observacao(df)
+    meta, sem_meta, licenca = meta_elegivel(df)
+    ok = ~(sem_meta | licenca)
+
+    # matriz analistas x itens: parcela de cada item e se a meta foi batida
+    k = len(indicadores)
+    mascara = (mascaras or {}).get(nome_mes)
+    if mascara is None:
+        pesos = np.array([ind["peso"] for ind in indicadores], dtype=float)
+        ativos = np.ones(k, dtype=bool)
+    else:
+        # vetor do mês já pronto: só muda o peso das colunas, nada por linha
+        pesos, ativos = mascara["pesos"], mascara["ativos"]
+    rotulos = [ind["rotulo"] for ind in indicadores]
+    bateu = np.ones((n, k), dtype=bool)
+    for j, ind in enumerate(indicadores):
+        if ind["coluna"] and ativos[j]:
+            bateu[:, j] = map_unicos(df[ind["coluna"]], lambda v: bool_safe(v, True), dtype=bool).to_numpy()
+    bateu[~ok] = True
+
+    parcelas = meta[:, None] * pesos[None, :]
+    if mascara is not None and mascara["fator"] != 1.0:
+        # "zerar": o peso desligado sai também do total possível
+        meta = meta * mascara["fator"]
+    recebido = np.where(bateu, parcelas, 0.0).sum(axis=1)
+    perdas = np.where(bateu, 0.0, parcelas).sum(axis=1)
+    perc = np.where(meta != 0, (recebido / np.where(meta != 0, meta, 1.0)) * 100.0, 0.0)
+
+    # itens perdidos: cada combinação de falhas vira um código de bits, e a
+    # lista de rótulos é montada uma vez por combinação (não por linha)
+    bits = (1 << np.arange(k, dtype=np.int64))
+    codigos = (~bateu).astype(np.int64) @ bits
+    listas = {c: [rotulos[j] for j in range(k) if c & (1 << j)] for c in np.unique(codigos)}
+
+    badge = np.where(sem_meta, "Sem elegibilidade no mês", np.where(licenca, "Licença no mês", ""))
+
+    # textos repetidos (mês, situação, observação) saem como categoria
+    out = df.assign(**{
+        "MES": pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), [nome_mes]),
+        "META": meta,
+        "RECEBIDO": recebido,
+        "PERDA": perdas,
+        "%": perc,
+        "_badge": pd.Categorical(badge.astype(object)),
+        "_obs": pd.Categorical(map_unicos(obs, texto_obs).to_numpy()),
+        "perdeu_itens": [listas[c] for c in codigos],
+    })
+    return out
+
+def perda_por_item(calc_mes: pd.DataFrame, nome_mes: str, indicadores: list, mascaras: dict = None) -> pd.DataFrame:
+    # formato longo: uma linha por analista e indicador perdido no mês, com o
+    # valor que deixou de ganhar nele (somado por analista dá a PERDA)
+    mascara = (mascaras or {}).get(nome_mes)
+    pesos = [ind["peso"] for ind in indicadores] if mascara is None else mascara["pesos"]
+    peso_do_rotulo = {ind["rotulo"]: float(p) for ind, p in zip(indicadores, pesos)}
+    empresa = calc_mes["EMPRESA"] if "EMPRESA" in calc_mes.columns else pd.Series(None, index=calc_mes.index)
+    longo = pd.DataFrame({
+        "EMAIL": calc_mes["EMAIL"].astype(object).to_numpy(),
+        "EMPRESA": empresa.astype(object).to_numpy(),
+        "META": meta_elegivel(calc_mes)[0],
+        "INDICADOR": calc_mes["perdeu_itens"].to_numpy(),
+    }).explode("INDICADOR")
+    longo = longo[longo["INDICADOR"].notna()]
+    longo["PERDA"] = longo["META"] * longo["INDICADOR"].map(peso_do_rotulo).astype(float)
+    return longo[["EMAIL", "EMPRESA", "INDICADOR", "PERDA"]].reset_index(drop=True)
+
+# ===================== CUBO DE PERDAS =====================
+# PERDA somada por EMPRESA x MES x INDICADOR (uma linha por combinação com
+# perda), montado uma vez por mês e versão; os recortes do admin (período,
+# empresa) só filtram e somam o cubo, sem voltar às linhas dos analistas.
+# Analista sem EMPRESA entra como SEM_EMPRESA (o pivot descartaria o NaN).
+CUBO_COLS = ["EMPRESA", "MES", "INDICADOR", "PERDA", "ANALISTAS"]
+SEM_EMPRESA = "(sem empresa)"
+
+def cubo_do_mes(calc_mes: pd.DataFrame, nome_mes: str, indicadores: list, mascaras: dict = None) -> pd.DataFrame:
+    # ANALISTAS = quantos deixaram de ganhar naquele indicador
+    if "perdeu_itens" not in calc_mes.columns:
+        return pd.DataFrame(columns=CUBO_COLS)
+    longo = perda_por_item(calc_mes, nome_mes, indicadores, mascaras)
+    cubo = (
+        longo.groupby(["EMPRESA", "INDICADOR"], dropna=False, sort=False, observed=True)["PERDA"]
+        .agg(PERDA="sum", ANALISTAS="size")
+        .reset_index()
+    )
+    cubo.insert(1, "MES", nome_mes)
+    return cubo[CUBO_COLS]
+
+def juntar_cubos(cubos: list, indicadores: list) -> pd.DataFrame:
+    # meses em ordem do ano e indicadores na ordem dos pesos (categorias)
+    cubo = pd.concat([pd.DataFrame(columns=CUBO_COLS)] + [c for c in cubos if len(c)], ignore_index=True)
+    cubo["EMPRESA"] = cubo["EMPRESA"].astype(object).fillna(SEM_EMPRESA).astype("category")
+    cubo["MES"] = pd.Categorical(cubo["MES"], categories=MESES_ANO, ordered=True)
+    rotulos = list(dict.fromkeys(ind["rotulo"] for ind in indicadores))
+    cubo["INDICADOR"] = pd.Categorical(cubo["INDICADOR"], categories=rotulos, ordered=True)
+    cubo["PERDA"] = cubo["PERDA"].astype(float)
+    cubo["ANALISTAS"] = cubo["ANALISTAS"].astype("int32")
+    return cubo
+
+def fatiar_cubo(cubo: pd.DataFrame, periodo: str, empresa: str = None) -> pd.DataFrame:
+    # linhas do cubo nos meses do período (e de uma empresa, se dada)
+    meses = meses_do_periodo(periodo, list(cubo["MES"].unique().dropna()))
+    linhas = cubo["MES"].isin(meses)
+    if empresa is not None:
+        linhas &= cubo["EMPRESA"].astype(object) == empresa
+    return cubo[linhas]
+
+def base_mensal(calc_mes: pd.DataFrame) -> pd.DataFrame:
+    # assign devolve um frame novo: o resultado de calcula_mes não é alterado
+    return calc_mes.assign(INDICADORES_NAO_ENTREGUES=pd.Categorical(calc_mes["perdeu_itens"].apply(
+        lambda L: ", ".join(L) if isinstance(L, list) and L else ""
+    )))
+
+# ===================== AGREGAÇÃO DE PERÍODOS =====================
+# Parcial = uma linha por analista com as somas (META/RECEBIDO/PERDA) e os
+# conjuntos de textos (_obs, _badge, indicadores perdidos com o mês).
+# Trimestre/acumulado = combinação de parciais; somar mais um mês custa só
+# combinar o agregado anterior com a parcial desse mês.
+GRUPO_COLS = ["EMAIL", "EMPRESA", "NOME", "FUNÇÃO", "DATA DE ADMISSÃO", "TEMPO DE CASA"]
+SOMAS = ["META", "RECEBIDO", "PERDA"]
+CONJUNTOS = ["_obs", "_badge", "_perdidos"]
+_VAZIO = frozenset()
+
+def _colunas_grupo(df: pd.DataFrame) -> list:
+    # EMAIL entra no agrupamento para garantir “um usuário = um registro”
+    return [c for c in GRUPO_COLS if c in df.columns] or ["EMAIL", "NOME", "FUNÇÃO"]
+
+def _unir_por_grupo(codigos, conjuntos, n_grupos: int) -> list:
+    acumulado = [set() for _ in range(n_grupos)]
+    for c, conjunto in zip(codigos, conjuntos):
+        if conjunto:
+            acumulado[c] |= conjunto
+    return [frozenset(a) if a else _VAZIO for a in acumulado]
+
+def combinar_parciais(parciais: list) -> pd.DataFrame:
+    full = pd.concat(parciais, ignore_index=True)
+    group_cols = _colunas_grupo(full)
+
+    # um único groupby: as somas saem dele e os códigos de grupo (ngroup)
+    # alimentam a união dos conjuntos, sem segundo agrupamento nem merge.
+    # observed=True: com colunas categoria, só as combinações que existem (o
+    # padrão do pandas 2 é o produto das categorias, e o ngroup desalinha)
+    g = full.groupby(group_cols, dropna=False, sort=True, observed=True)
+    codigos = g.ngroup().to_numpy()
+    out = g[SOMAS].sum().reset_index()
+    for campo in CONJUNTOS:
+        out[campo] = _unir_por_grupo(codigos, full[campo], len(out))
+    return out
+
+def parcial_do_mes(calc_mes: pd.DataFrame) -> pd.DataFrame:
+    linhas = calc_mes[_colunas_grupo(calc_mes) + SOMAS]
+    linhas["_obs"] = [frozenset((t,)) if t else _VAZIO for t in calc_mes["_obs"]]
+    linhas["_badge"] = [frozenset((t,)) if t else _VAZIO for t in calc_mes["_badge"]]
+
+    # "item (MÊS)" por indicador perdido; as mesmas combinações se repetem muito
+    perdidos = {}
+    def _perdidos(itens, mes):
+        chave = (tuple(itens), mes)
+        if chave not in perdidos:
+            perdidos[chave] = frozenset(f"{it} ({mes})" for it in itens)
+        return perdidos[chave]
+    linhas["_perdidos"] = [_perdidos(L, m) for L, m in zip(calc_mes["perdeu_itens"], calc_mes["MES"])]
+    return combinar_parciais([linhas])
+
+def finalizar_parcial(parcial: pd.DataFrame) -> pd.DataFrame:
+    out = parcial.drop(columns=CONJUNTOS)
+    meta = out["META"].to_numpy(dtype=float)
+    rec = out["RECEBIDO"].to_numpy(dtype=float)
+    out["%"] = np.where(meta == 0, 0.0, (rec / np.where(meta == 0, 1.0, meta)) * 100.0)
+    out["_obs"] = pd.Categorical([", ".join(sorted(c)) for c in parcial["_obs"]])
+    out["_badge"] = pd.Categorical([" / ".join(sorted(c)) for c in parcial["_badge"]])
+    out["INDICADORES_NAO_ENTREGUES"] = pd.Categorical([", ".join(sorted(c)) for c in parcial["_perdidos"]])
+    return out
+
+def indexar_emails(dados: pd.DataFrame) -> dict:
+    # EMAIL já sai normalizado de calcula_mes: email -> posições em `dados`
+    return dados.groupby("EMAIL", sort=False, observed=True).indices
+
+def pegar_aba(abas: dict, mes: str) -> pd.DataFrame:
+    if mes not in abas:
+        raise PlanilhaInvalida(f"Aba {mes} não encontrada na planilha.")
+    return abas[mes]
+
+def montar_periodos(abas: dict, indicadores: list, mascaras: dict = None) -> dict:
+    # todos os períodos de uma vez: cada mês é calculado e reduzido a parcial
+    # uma única vez; trimestres e acumulado combinam as parciais
+    calculados = {mes: calcula_mes(abas[mes], mes, indicadores, mascaras) for mes in MESES_ANO if mes in abas}
+    return periodos_calculados(calculados)
+
+def periodos_calculados(calculados: dict) -> dict:
+    # mês -> calcula_mes (calculados aqui ou em outros processos) -> todos os períodos
+    meses = [m for m in MESES_ANO if m in calculados]
+    if not meses:
+        raise PlanilhaInvalida("Nenhuma aba de mês (JANEIRO, FEVEREIRO, ...) encontrada na planilha.")
+    parciais = {mes: parcial_do_mes(calculados[mes]) for mes in meses}
+
+    # prefixos já combinados: (JAN), (JAN, FEV), ... reaproveitados entre períodos
+    agregados = {}
+    def agregado(meses_periodo: tuple):
+        if meses_periodo not in agregados:
+            if len(meses_periodo) == 1:
+                agregados[meses_periodo] = parciais[meses_periodo[0]]
+            else:
+                anterior = agregado(meses_periodo[:-1])
+                agregados[meses_periodo] = combinar_parciais([anterior, parciais[meses_periodo[-1]]])
+        return agregados[meses_periodo]
+
+    bases = {}
+    for periodo in periodos_disponiveis(meses):
+        if eh_mes(periodo):
+            bases[periodo] = base_mensal(calculados[periodo])
+        else:
+            bases[periodo] = finalizar_parcial(agregado(tuple(meses_do_periodo(periodo, meses))))
+    return {periodo: filtrar_analistas(dados) for periodo, dados in bases.items()}
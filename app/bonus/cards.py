@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# HTML dos cards de analistas (sem Streamlit)
+# - Uma string por analista, formatada por coluna (não linha a linha)
+# - As classes CSS (person-card, pill, bar, ...) vêm do estilo do app.py
+# ============================================================
+
+import pandas as pd
+import numpy as np
+
+from .regras import texto_obs
+from .calculo import map_unicos, brl_serie
+
+def _linha_perdidos(txt: str) -> str:
+    if not txt:
+        return ""
+    return f"<div style='height:8px'></div><div class='muted'><span class='warn'>Indicadores não entregues:</span> {txt}</div>"
+
+def _linha_obs(txt: str) -> str:
+    return f"<div style='height:8px'></div><div class='muted'>Obs.: {txt}</div>" if txt else ""
+
+def cards_html(df: pd.DataFrame) -> list:
+    # formata as colunas de uma vez e monta o card de cada analista como texto
+    def coluna(nome):
+        if nome not in df.columns:
+            return pd.Series("", index=df.index)
+        # categoria não aceita fillna("") fora das categorias; é só a página
+        return df[nome].astype(object) if isinstance(df[nome].dtype, pd.CategoricalDtype) else df[nome]
+
+    pct = pd.to_numeric(coluna("%"), errors="coerce").fillna(0.0).astype(float)
+    nome = coluna("NOME").fillna("").astype(str).str.title()
+    empresa = coluna("EMPRESA").fillna("").astype(str).str.title()
+    tempo = coluna("TEMPO DE CASA").fillna("").astype(str).str.strip()
+    meta_line = ("Analista — " + empresa).where(empresa != "", "Analista")
+    meta_line = (meta_line + " • " + tempo).where(tempo != "", meta_line)
+
+    tag = np.select([pct >= 95, pct < 80], ["Excelente", "Atenção"], "Ok")
+    perdidos = map_unicos(coluna("INDICADORES_NAO_ENTREGUES"), texto_obs)
+    obs = map_unicos(coluna("_obs") if "_obs" in df.columns else coluna("OBSERVAÇÃO"), texto_obs)
+
+    return [
+        f"""<div class="person-card">
+  <p class="person-name">{n}</p>
+  <div class="person-meta">{ml}</div>
+  <div class="person-grid">
+    <div class="pill"><div class="lbl">Meta</div><div class="val">{m}</div></div>
+    <div class="pill"><div class="lbl">Recebido</div><div class="val">{r}</div></div>
+    <div class="pill"><div class="lbl">Perda</div><div class="val">{pe}</div></div>
+    <div class="pill"><div class="lbl">Cumprimento</div><div class="val">{p:.1f}%</div></div>
+  </div>
+  <div style="height:10px"></div>
+  <div class="bar"><div style="width:{max(0, min(100, p)):.1f}%"></div></div>
+  <div style="height:10px"></div>
+  <div class="muted"><b>Status:</b> {t}</div>{_linha_perdidos(ind)}{_linha_obs(o)}
+</div>
+"""
+        for n, ml, m, r, pe, p, t, ind, o in zip(
+            nome, meta_line,
+            brl_serie(coluna("META")), brl_serie(coluna("RECEBIDO")), brl_serie(coluna("PERDA")),
+            pct, tag, perdidos, obs,
+        )
+    ]
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Exportação da folha (sem Streamlit)
+# - Resultados: uma linha por analista e período (meses, trimestres, acumulado)
+# - Indicadores não entregues em formato longo: uma linha por analista, mês
+#   e indicador, com a PERDA daquele indicador (perda_por_item, a mesma do
+#   cubo de perdas). Só há linhas de mês: a coluna TRIMESTRE diz a qual
+#   trimestre cada uma pertence (o trimestre é a soma das linhas dele)
+# - Gravação em blocos de linhas: memória constante por bloco em CSV, XLSX
+#   (openpyxl write-only) e Parquet (um row group por bloco)
+# ============================================================
+
+import io
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .regras import TRIMESTRES, eh_mes
+from .calculo import perda_por_item
+
+FORMATOS = ("csv", "xlsx", "parquet")
+TAMANHO_BLOCO = 5_000
+
+# coluna do painel -> coluna exportada (só as que existirem no período)
+COLUNAS_FOLHA = {
+    "EMAIL": "EMAIL",
+    "NOME": "NOME",
+    "EMPRESA": "EMPRESA",
+    "FUNÇÃO": "FUNÇÃO",
+    "META": "META",
+    "RECEBIDO": "RECEBIDO",
+    "PERDA": "PERDA",
+    "%": "PERCENTUAL",
+    "_badge": "SITUAÇÃO",
+    "_obs": "OBSERVAÇÃO",
+    "INDICADORES_NAO_ENTREGUES": "INDICADORES_NAO_ENTREGUES",
+}
+NUMERICAS = ["META", "RECEBIDO", "PERDA", "PERCENTUAL"]
+COLUNAS_INDICADORES = ["TRIMESTRE", "MES", "EMAIL", "NOME", "EMPRESA", "INDICADOR", "PERDA"]
+
+ARQUIVO_FOLHA = "folha_bonus"
+ARQUIVO_INDICADORES = "indicadores_nao_entregues"
+ABA_FOLHA = "Resultados"
+ABA_INDICADORES = "Indicadores não entregues"
+
+_TRIMESTRE_DO_MES = {mes: tri for tri, meses in TRIMESTRES.items() for mes in meses}
+
+def _padronizar(bloco: pd.DataFrame) -> pd.DataFrame:
+    # tipos fixos em todos os blocos (o Parquet exige o mesmo schema): números
+    # em float, o resto em texto sem nulos
+    for col in bloco.columns:
+        if col in NUMERICAS:
+            bloco[col] = pd.to_numeric(bloco[col], errors="coerce").fillna(0.0).astype(float)
+        else:
+            # categorias viram texto antes do fillna (só o bloco é convertido)
+            bloco[col] = bloco[col].astype(object).fillna("").astype(str)
+    return bloco
+
+def blocos_folha(bases: dict, tamanho: int = TAMANHO_BLOCO):
+    # bases: {período: dados} na ordem do painel
+    for periodo, dados in bases.items():
+        origem = [c for c in COLUNAS_FOLHA if c in dados.columns]
+        for inicio in range(0, len(dados), tamanho):
+            bloco = dados.iloc[inicio:inicio + tamanho][origem].rename(columns=COLUNAS_FOLHA)
+            bloco.insert(0, "PERIODO", periodo)
+            yield _padronizar(bloco.reindex(columns=["PERIODO"] + list(COLUNAS_FOLHA.values()), fill_value=""))
+
+def blocos_indicadores(bases: dict, config: dict, tamanho: int = TAMANHO_BLOCO):
+    # só os meses têm a lista por analista (perdeu_itens); explode bloco a
+    # bloco. config (carregar_config): pesos e máscara do mês para a PERDA
+    for periodo, dados in bases.items():
+        if not eh_mes(periodo) or "perdeu_itens" not in dados.columns:
+            continue
+        for inicio in range(0, len(dados), tamanho):
+            parte = dados.iloc[inicio:inicio + tamanho]
+            longo = perda_por_item(parte, periodo, config["indicadores"], config["mascaras"])
+            if longo.empty:
+                continue
+            # uma linha por item perdido, na ordem das linhas do bloco
+            perdidos = [len(L) if isinstance(L, list) else 0 for L in parte["perdeu_itens"]]
+            longo.insert(1, "NOME", np.repeat(parte["NOME"].astype(object).to_numpy(), perdidos))
+            longo.insert(0, "MES", periodo)
+            longo.insert(0, "TRIMESTRE", _TRIMESTRE_DO_MES.get(periodo, ""))
+            yield _padronizar(longo[COLUNAS_INDICADORES].reset_index(drop=True))
+
+# ===================== GRAVAÇÃO =====================
+def _gravar_csv(caminho: Path, blocos, colunas: list):
+    # utf-8 com BOM: o Excel abre os acentos certos
+    with open(caminho, "w", encoding="utf-8-sig", newline="") as f:
+        pd.DataFrame(columns=colunas).to_csv(f, index=False)
+        for bloco in blocos:
+            bloco.to_csv(f, index=False, header=False)
+
+def _gravar_parquet(caminho: Path, blocos, colunas: list):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(c, pa.float64() if c in NUMERICAS else pa.string()) for c in colunas])
+    with pq.ParquetWriter(caminho, schema) as escritor:
+        for bloco in blocos:
+            escritor.write_table(pa.Table.from_pandas(bloco, schema=schema, preserve_index=False))
+
+def _gravar_xlsx(caminho: Path, abas: list):
+    # abas: [(nome, blocos, colunas)]; write-only não guarda as linhas em memória
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for nome, blocos, colunas in abas:
+        ws = wb.create_sheet(nome)
+        ws.append(colunas)
+        for bloco in blocos:
+            for linha in bloco.itertuples(index=False, name=None):
+                ws.append(linha)
+    wb.save(caminho)
+
+def gravar_exportacao(pasta: Path, bases: dict, config: dict, formato: str, tamanho: int = TAMANHO_BLOCO) -> list:
+    # arquivos gravados: um .xlsx com duas abas, ou dois .csv/.parquet
+    if formato not in FORMATOS:
+        raise ValueError(f"formato inválido: {formato!r} (use {', '.join(FORMATOS)})")
+    pasta = Path(pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+    colunas_folha = ["PERIODO"] + list(COLUNAS_FOLHA.values())
+
+    if formato == "xlsx":
+        caminho = pasta / f"{ARQUIVO_FOLHA}.xlsx"
+        _gravar_xlsx(caminho, [
+            (ABA_FOLHA, blocos_folha(bases, tamanho), colunas_folha),
+            (ABA_INDICADORES, blocos_indicadores(bases, config, tamanho), COLUNAS_INDICADORES),
+        ])
+        return [caminho]
+
+    gravar = _gravar_csv if formato == "csv" else _gravar_parquet
+    folha = pasta / f"{ARQUIVO_FOLHA}.{formato}"
+    indicadores = pasta / f"{ARQUIVO_INDICADORES}.{formato}"
+    gravar(folha, blocos_folha(bases, tamanho), colunas_folha)
+    gravar(indicadores, blocos_indicadores(bases, config, tamanho), COLUNAS_INDICADORES)
+    return [folha, indicadores]
+
+def exportacao_em_bytes(bases: dict, config: dict, formato: str, tamanho: int = TAMANHO_BLOCO) -> tuple:
+    # (nome do arquivo, conteúdo) para download: o .xlsx direto, ou um .zip
+    # com os dois arquivos
+    with tempfile.TemporaryDirectory() as tmp:
+        arquivos = gravar_exportacao(tmp, bases, config, formato, tamanho)
+        if len(arquivos) == 1:
+            return arquivos[0].name, arquivos[0].read_bytes()
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for arquivo in arquivos:
+                zf.write(arquivo, arquivo.name)
+        return f"{ARQUIVO_FOLHA}_{formato}.zip", buffer.getvalue()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Histórico de resultados (SQLite, sem Streamlit)
+# - Cada planilha trimestral substitui a anterior: os meses calculados
+#   (calcula_mes) ficam gravados por ano/mês em data/historico.sqlite
+# - Regravar um mês substitui o que havia; uma transação por gravação
+# - Índices por EMAIL, EMPRESA e mês: histórico de um analista e perda por
+#   indicador e empresa nos últimos trimestres sem reabrir planilhas antigas
+# - Só a biblioteca padrão (sqlite3); o painel não vigia este arquivo
+# ============================================================
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from .regras import MESES_ANO, PlanilhaInvalida, norm_email
+from .calculo import perda_por_item
+
+VERSAO_ESQUEMA = 1
+TRIMESTRES_PADRAO = 8
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meses (
+    ano INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    arquivo TEXT,
+    pesos TEXT,
+    analistas INTEGER NOT NULL,
+    gravado_em TEXT NOT NULL,
+    PRIMARY KEY (ano, mes)
+);
+CREATE TABLE IF NOT EXISTS resultados (
+    ano INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    email TEXT NOT NULL,
+    nome TEXT,
+    empresa TEXT,
+    meta REAL NOT NULL,
+    recebido REAL NOT NULL,
+    perda REAL NOT NULL,
+    situacao TEXT,
+    observacao TEXT,
+    indicadores TEXT
+);
+CREATE INDEX IF NOT EXISTS resultados_mes ON resultados (ano, mes);
+CREATE INDEX IF NOT EXISTS resultados_email ON resultados (email, ano, mes);
+CREATE INDEX IF NOT EXISTS resultados_empresa ON resultados (empresa, ano, mes);
+CREATE TABLE IF NOT EXISTS perdas (
+    ano INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    email TEXT NOT NULL,
+    empresa TEXT,
+    indicador TEXT NOT NULL,
+    perda REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS perdas_mes ON perdas (ano, mes);
+CREATE INDEX IF NOT EXISTS perdas_email ON perdas (email, ano, mes);
+CREATE INDEX IF NOT EXISTS perdas_empresa ON perdas (empresa, ano, mes, indicador);
+"""
+
+def _conectar(caminho: Path, criar: bool = False) -> sqlite3.Connection:
+    con = sqlite3.connect(str(caminho), timeout=30)
+    if criar:
+        # WAL: o painel lê enquanto a CLI grava
+        con.execute("PRAGMA journal_mode=WAL")
+        con.executescript(_ESQUEMA)
+        con.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+    return con
+
+def _consultar(caminho: Path, sql: str, parametros=(), colunas=None) -> pd.DataFrame:
+    # sem arquivo ainda: resultado vazio (consultar não cria o histórico)
+    if not Path(caminho).exists():
+        return pd.DataFrame(columns=colunas)
+    with closing(_conectar(caminho)) as con:
+        cursor = con.execute(sql, parametros)
+        return pd.DataFrame(cursor.fetchall(), columns=colunas or [d[0] for d in cursor.description])
+
+def _texto(s: pd.Series) -> list:
+    # categorias/NaN -> str ou None (o que o sqlite3 aceita)
+    return [None if pd.isna(v) or v == "" else str(v) for v in s.astype(object)]
+
+def _coluna(dados: pd.DataFrame, nome: str) -> list:
+    return _texto(dados[nome]) if nome in dados.columns else [None] * len(dados)
+
+# ===================== GRAVAÇÃO =====================
+def gravar_meses(caminho: Path, ano: int, calculados: dict, config: dict, arquivo: str = None) -> dict:
+    # calculados: {mês: calcula_mes} (ou a base do mês no painel). Mês -> linhas
+    # gravadas; os meses já gravados naquele ano são substituídos
+    ano = int(ano)
+    if not 2000 <= ano <= 2100:
+        raise PlanilhaInvalida(f"Ano inválido para o histórico: {ano}")
+    meses = [m for m in MESES_ANO if m in calculados]
+    if not meses:
+        raise PlanilhaInvalida("Nenhum mês calculado para gravar no histórico.")
+    agora = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    gravados = {}
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+    with closing(_conectar(caminho, criar=True)) as con, con:
+        for mes in meses:
+            dados, numero = calculados[mes], MESES_ANO.index(mes) + 1
+            for tabela in ("resultados", "perdas", "meses"):
+                con.execute(f"DELETE FROM {tabela} WHERE ano = ? AND mes = ?", (ano, numero))
+
+            indicadores = [", ".join(L) if isinstance(L, list) else "" for L in dados["perdeu_itens"]]
+            con.executemany(
+                "INSERT INTO resultados VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                zip(
+                    [ano] * len(dados), [numero] * len(dados),
+                    _texto(dados["EMAIL"]), _coluna(dados, "NOME"), _coluna(dados, "EMPRESA"),
+                    dados["META"].astype(float).tolist(),
+                    dados["RECEBIDO"].astype(float).tolist(),
+                    dados["PERDA"].astype(float).tolist(),
+                    _coluna(dados, "_badge"), _coluna(dados, "_obs"),
+                    [t or None for t in indicadores],
+                ),
+            )
+            perdas = perda_por_item(dados, mes, config["indicadores"], config["mascaras"])
+            con.executemany(
+                "INSERT INTO perdas VALUES (?, ?, ?, ?, ?, ?)",
+                zip(
+                    [ano] * len(perdas), [numero] * len(perdas),
+                    _texto(perdas["EMAIL"]), _texto(perdas["EMPRESA"]),
+                    _texto(perdas["INDICADOR"]), perdas["PERDA"].tolist(),
+                ),
+            )
+            con.execute(
+                "INSERT INTO meses VALUES (?, ?, ?, ?, ?, ?)",
+                (ano, numero, arquivo, config["versao"], len(dados), agora),
+            )
+            gravados[mes] = len(dados)
+    return gravados
+
+# ===================== CONSULTAS =====================
+def meses_gravados(caminho: Path) -> pd.DataFrame:
+    out = _consultar(
+        caminho,
+        "SELECT ano, mes, arquivo, analistas, gravado_em FROM meses ORDER BY ano, mes",
+        colunas=["ANO", "MES", "ARQUIVO", "ANALISTAS", "GRAVADO_EM"],
+    )
+    out["MES"] = [MESES_ANO[m - 1] for m in out["MES"]]
+    return out
+
+def historico_analista(caminho: Path, email: str) -> pd.DataFrame:
+    # todos os meses gravados de um analista (índice por e-mail), do mais recente
+    out = _consultar(
+        caminho,
+        "SELECT ano, mes, nome, empresa, meta, recebido, perda, situacao, indicadores "
+        "FROM resultados WHERE email = ? ORDER BY ano DESC, mes DESC",
+        (norm_email(email),),
+        colunas=["ANO", "MES", "NOME", "EMPRESA", "META", "RECEBIDO", "PERDA", "SITUAÇÃO",
+                 "INDICADORES_NAO_ENTREGUES"],
+    )
+    out["MES"] = [MESES_ANO[m - 1] for m in out["MES"]]
+    meta = out["META"].astype(float)
+    out.insert(7, "%", (out["RECEBIDO"].astype(float) / meta.where(meta != 0) * 100.0).fillna(0.0))
+    return out
+
+def empresas_gravadas(caminho: Path) -> list:
+    out = _consultar(caminho, "SELECT DISTINCT empresa FROM resultados WHERE empresa IS NOT NULL ORDER BY empresa",
+                     colunas=["EMPRESA"])
+    return out["EMPRESA"].tolist()
+
+def perdas_por_indicador(caminho: Path, trimestres: int = TRIMESTRES_PADRAO, empresa: str = None) -> pd.DataFrame:
+    # perda por empresa, trimestre e indicador nos últimos `trimestres`
+    # trimestres gravados (contados a partir do mais recente no histórico)
+    colunas = ["EMPRESA", "ANO", "TRIMESTRE", "INDICADOR", "PERDA", "ANALISTAS_COM_PERDA"]
+    ultimo = _consultar(caminho, "SELECT MAX(ano * 4 + (mes - 1) / 3) FROM meses", colunas=["T"])
+    if ultimo.empty or pd.isna(ultimo["T"].iloc[0]):
+        return pd.DataFrame(columns=colunas)
+    primeiro = int(ultimo["T"].iloc[0]) - max(1, int(trimestres)) + 1
+    # (ano, mes) >= início do primeiro trimestre: usa os índices por mês/empresa
+    inicio = (primeiro // 4, (primeiro % 4) * 3 + 1)
+    sql = (
+        "SELECT empresa, ano, (mes - 1) / 3 + 1 AS tri, indicador, SUM(perda), COUNT(DISTINCT email) "
+        "FROM perdas WHERE (ano, mes) >= (?, ?)"
+    )
+    parametros = list(inicio)
+    if empresa:
+        sql += " AND empresa = ?"
+        parametros.append(empresa)
+    sql += " GROUP BY empresa, ano, tri, indicador ORDER BY empresa, ano, tri, indicador"
+    out = _consultar(caminho, sql, parametros, colunas=colunas)
+    out["TRIMESTRE"] = [f"T{t}" for t in out["TRIMESTRE"]]
+    return out
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Medição das etapas do pipeline (sem Streamlit)
+# - Um registro por execução (rerun do painel, carga do vigia, CLI) com as
+#   etapas (ms, linhas, nível de aninhamento) e os hits/misses de cache
+# - Memória (bytes) de cada DataFrame/conjunto de abas guardado em cache
+# - etapa(): não faz nada se não houver registro ativo
+# - Ao encerrar: uma linha JSON no logger "bonus.medicao" e, se
+#   BONUS_PERFIL_DIR estiver definido, um dump do cProfile (.prof)
+# - Um cProfile ativo por processo (no Python 3.12+ dois ao mesmo tempo dão
+#   ValueError): registro que começa com outro perfil ligado (rerun durante a
+#   carga do vigia) fica sem perfil
+# - BONUS_MEDICAO_LOG=1 manda o logger para o stderr
+# ============================================================
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger("bonus.medicao")
+
+_ATUAL = contextvars.ContextVar("bonus_medicao", default=None)
+# dono do único cProfile do processo (liberado em encerrar_medicao)
+_PERFIL_LOCK = threading.Lock()
+
+def _configurar_log():
+    if os.environ.get("BONUS_MEDICAO_LOG") and not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+def iniciar_medicao(nome: str) -> dict:
+    # registro ativo no contexto atual (thread do rerun ou do vigia)
+    registro = {
+        "nome": nome,
+        "inicio": time.time(),
+        "etapas": [],
+        "cache": {},
+        "total_ms": None,
+        "_nivel": 0,
+        "_t0": time.perf_counter(),
+        "_perfil": None,
+    }
+    if os.environ.get("BONUS_PERFIL_DIR") and _PERFIL_LOCK.acquire(blocking=False):
+        import cProfile
+
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            # outra ferramenta de profiling ativa (depurador, coverage...)
+            _PERFIL_LOCK.release()
+        else:
+            registro["_perfil"] = perfil
+    registro["_token"] = _ATUAL.set(registro)
+    return registro
+
+def encerrar_medicao(registro: dict) -> dict:
+    registro["total_ms"] = round((time.perf_counter() - registro["_t0"]) * 1000, 3)
+    perfil = registro.pop("_perfil", None)
+    if perfil is not None:
+        perfil.disable()
+        _PERFIL_LOCK.release()
+        pasta = Path(os.environ["BONUS_PERFIL_DIR"])
+        pasta.mkdir(parents=True, exist_ok=True)
+        carimbo = time.strftime("%Y%m%d-%H%M%S", time.localtime(registro["inicio"]))
+        registro["perfil"] = str(pasta / f"{registro['nome']}-{carimbo}-{os.getpid()}.prof")
+        perfil.dump_stats(registro["perfil"])
+    token = registro.pop("_token", None)
+    if token is not None:
+        try:
+            _ATUAL.reset(token)
+        except ValueError:
+            # encerrado em outro contexto: só desliga o registro
+            _ATUAL.set(None)
+
+    _configurar_log()
+    logger.info(json.dumps({
+        "medicao": registro["nome"],
+        "total_ms": registro["total_ms"],
+        "etapas": registro["etapas"],
+        "cache": registro["cache"],
+    }, ensure_ascii=False))
+    return registro
+
+@contextmanager
+def medindo(nome: str):
+    registro = iniciar_medicao(nome)
+    try:
+        yield registro
+    finally:
+        encerrar_medicao(registro)
+
+@contextmanager
+def etapa(nome: str, linhas: int = None):
+    # info["linhas"] pode ser preenchido dentro do bloco
+    registro = _ATUAL.get()
+    info = {"etapa": nome, "linhas": linhas}
+    if registro is None:
+        yield info
+        return
+    info["nivel"] = registro["_nivel"]
+    registro["_nivel"] += 1
+    t0 = time.perf_counter()
+    info["inicio_ms"] = round((t0 - registro["_t0"]) * 1000, 3)
+    try:
+        yield info
+    finally:
+        registro["_nivel"] -= 1
+        info["ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        registro["etapas"].append(info)
+
+def marcar_cache(nome: str, hit: bool):
+    registro = _ATUAL.get()
+    if registro is None:
+        return
+    contagem = registro["cache"].setdefault(nome, {"hits": 0, "misses": 0})
+    contagem["hits" if hit else "misses"] += 1
+
+def linhas_abas(abas: dict) -> int:
+    return sum(len(df) for df in abas.values())
+
+def memoria_df(df) -> int:
+    # bytes do DataFrame, contando o texto (deep); listas compartilhadas entre
+    # linhas contam uma vez por linha, então é um teto
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+def memoria_abas(abas: dict) -> int:
+    return sum(memoria_df(df) for df in abas.values())
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Motor do painel (sem Streamlit)
+# - Dono dos arquivos de data/: planilhas, pesos, máscara por mês e snapshot
+# - Caches LRU do processo: aba lida, mês calculado, prefixos de meses e
+#   período indexado, todos pela impressão digital das abas envolvidas: editar
+#   um mês relê e recalcula só esse mês (e os períodos que o contêm)
+# - Carga a frio de planilhas grandes: os meses são lidos e calculados em
+#   paralelo (paralelo.py) e entram prontos no cache de meses
+# - Cubo de perdas EMPRESA x MES x INDICADOR montado com a versão (um pedaço
+#   por mês, em cache pela impressão da aba): recortes do admin sem varrer analistas
+# - Simulador de pesos (admin) sobre os meses da versão em vigor
+# - Arquivo dos meses da versão em vigor no histórico (historico.py)
+# - Vigia monta a versão completa (todos os períodos) e troca de uma vez
+# - pandas/pyarrow só entram quando a primeira versão é carregada
+# ============================================================
+
+import time
+from pathlib import Path
+
+from .regras import (
+    MESES_ANO,
+    PlanilhaInvalida,
+    load_json,
+    compilar_indicadores,
+    versao_pesos,
+    politica_desligado,
+    periodos_disponiveis,
+    meses_do_periodo,
+    eh_mes,
+    rotulo_periodo,
+)
+from .planilha import (
+    PLANILHA_NOME,
+    localizar_planilhas,
+    assinatura_arquivo,
+    hash_arquivo,
+    hash_conjunto,
+)
+from .cache import criar_cache, no_cache, guardar, tem_chave, info_cache, bytes_da_chave
+from .medicao import etapa, medindo, linhas_abas, memoria_df
+from .vigia import assinaturas, criar_vigia, iniciar_vigia, versao_vigia
+
+PESOS_ARQUIVO = "pesos_analistas.json"
+MASCARA_ARQUIVO = "empresa_indicadores_analistas.json"
+SNAPSHOT_PASTA = "snapshot"
+HISTORICO_ARQUIVO = "historico.sqlite"
+
+# quantas versões (arquivo, mtime, tamanho) da planilha têm hash/impressões em memória
+CACHE_PLANILHA_MAX = 4
+# quantas abas lidas (impressão da aba x colunas)
+CACHE_ABAS_MAX = 24
+# quantos resultados (período/mês x impressões das abas x versão dos pesos)
+CACHE_RESULTADOS_MAX = 32
+# de quantos em quantos segundos o vigia confere os arquivos de data/
+VIGIA_INTERVALO_S = 5
+
+# ===================== CONFIGURAÇÃO =====================
+def carregar_config(pesos_path: Path, mascara_path: Path = None) -> dict:
+    # pesos + máscara por mês já compilados; "versao" identifica os dois
+    from .calculo import compilar_mascaras, colunas_lidas
+
+    try:
+        pesos = load_json(pesos_path)
+        indicadores = compilar_indicadores(pesos)
+        politica = politica_desligado(pesos)
+    except Exception as e:
+        raise PlanilhaInvalida(f"Erro ao carregar pesos: {e}\nArquivo esperado: {Path(pesos_path).name}") from e
+    try:
+        # opcional: sem o arquivo, todos os indicadores valem em todos os meses
+        existe = mascara_path is not None and Path(mascara_path).exists()
+        mascara = load_json(mascara_path) if existe else None
+        mascaras = compilar_mascaras(mascara, indicadores, politica)
+    except Exception as e:
+        raise PlanilhaInvalida(
+            f"Erro ao carregar indicadores por mês: {e}\nArquivo esperado: {Path(mascara_path).name}"
+        ) from e
+    return {
+        "versao": versao_pesos(pesos, mascara),
+        "indicadores": indicadores,
+        "mascaras": mascaras,
+        # colunas lidas da planilha (as dos indicadores mudam com os pesos)
+        "colunas": colunas_lidas(indicadores),
+        # renormalizar/zerar indicadores desligados (o simulador reaplica)
+        "politica": politica,
+    }
+
+# ===================== MOTOR =====================
+def criar_motor(data_dir: Path, intervalo: float = VIGIA_INTERVALO_S) -> dict:
+    data_dir = Path(data_dir)
+    return {
+        "data_dir": data_dir,
+        "pesos_path": data_dir / PESOS_ARQUIVO,
+        "mascara_path": data_dir / MASCARA_ARQUIVO,
+        "snapshot_dir": data_dir / SNAPSHOT_PASTA,
+        "historico_path": data_dir / HISTORICO_ARQUIVO,
+        "intervalo": intervalo,
+        "abas": criar_cache(CACHE_ABAS_MAX, "planilha", memoria_df),
+        "shas": criar_cache(CACHE_PLANILHA_MAX, "sha_planilha"),
+        "impressoes": criar_cache(CACHE_PLANILHA_MAX, "impressao_aba"),
+        "meses": criar_cache(CACHE_RESULTADOS_MAX, "mes", memoria_df),
+        "agregados": criar_cache(CACHE_RESULTADOS_MAX, "agregado", memoria_df),
+        # só os dados; os índices de busca não entram na conta
+        "bases": criar_cache(CACHE_RESULTADOS_MAX, "periodo", lambda base: memoria_df(base["dados"])),
+        # cubo de perdas de cada mês (empresa x indicador)
+        "cubos": criar_cache(CACHE_RESULTADOS_MAX, "cubo_perdas", memoria_df),
+        # matrizes empresas x indicadores do simulador, por mês
+        "matrizes": criar_cache(CACHE_RESULTADOS_MAX, "matriz_simulador"),
+        "vigia": None,
+    }
+
+def versao_planilha(motor: dict) -> tuple:
+    # assinaturas das planilhas em data/ (da mais antiga para a mais nova);
+    # vazio se só houver snapshot
+    return tuple(assinatura_arquivo(c) for c in localizar_planilhas(motor["data_dir"]))
+
+def meses_disponiveis(motor: dict, planilha: tuple) -> dict:
+    # mês -> (arquivo, impressão da aba); a última planilha vence. Só hasheia
+    # os bytes das abas, sem ler as células
+    from .planilha import impressoes_abas
+
+    if not planilha:
+        raise PlanilhaInvalida(f"Planilha não encontrada em data/ ({PLANILHA_NOME})")
+    origens = {}
+    for a in planilha:
+        impressoes = no_cache(motor["impressoes"], a, lambda a=a: impressoes_abas(a[0]))
+        origens.update({mes: (a[0], impressao) for mes, impressao in impressoes.items()})
+    return origens
+
+def impressoes_de(origens: dict, meses) -> tuple:
+    return tuple(origens[m][1] for m in meses if m in origens)
+
+def chave_mes(origens: dict, mes: str, versao_config: str) -> tuple:
+    return (mes, origens.get(mes, (None, None))[1], versao_config)
+
+def aba_do_mes(motor: dict, mes: str, planilha: tuple, config: dict):
+    # aba do mês só com as colunas e os analistas que o painel usa. Numa falta,
+    # as outras abas do mesmo arquivo ainda sem aba nem resultado em cache são
+    # lidas junto (uma abertura do arquivo). O DataFrame é compartilhado: quem
+    # usar precisa copiar antes de alterar
+    from .planilha import ler_abas
+    from .calculo import FUNCAO_PAINEL
+
+    origens = meses_disponiveis(motor, planilha)
+    if mes not in origens:
+        raise PlanilhaInvalida(f"Aba {mes} não encontrada na planilha.")
+    arquivo, impressao = origens[mes]
+    colunas = config["colunas"]
+
+    def ler():
+        meses = [mes] + [
+            m for m, (arq, imp) in origens.items()
+            if m != mes and arq == arquivo
+            and not tem_chave(motor["abas"], (imp, colunas))
+            and not tem_chave(motor["meses"], chave_mes(origens, m, config["versao"]))
+        ]
+        with etapa(f"ler_planilha:{Path(arquivo).name}") as info:
+            abas = ler_abas(arquivo, colunas, FUNCAO_PAINEL, meses)
+            info["linhas"] = linhas_abas(abas)
+        for m, df in abas.items():
+            if m != mes:
+                guardar(motor["abas"], (origens[m][1], colunas), df)
+        return abas[mes]
+    return no_cache(motor["abas"], (impressao, colunas), ler)
+
+def ler_workbook(motor: dict, planilha: tuple, config: dict) -> dict:
+    # todas as abas de mês (como juntar_abas), pelo cache de abas
+    return {mes: aba_do_mes(motor, mes, planilha, config) for mes in meses_disponiveis(motor, planilha)}
+
+def cache_planilha_info(motor: dict) -> dict:
+    return info_cache(motor["abas"])
+
+def caches_info(motor: dict) -> dict:
+    # todos os caches do motor, para o diagnóstico do admin
+    return {c["nome"]: info_cache(c) for c in
+            (motor["abas"], motor["shas"], motor["impressoes"], motor["meses"], motor["agregados"], motor["bases"],
+             motor["cubos"], motor["matrizes"])}
+
+def chave_periodo(motor: dict, periodo: str, planilha: tuple, versao_config: str) -> tuple:
+    # o período só muda quando muda a aba de um dos seus meses (ou os pesos);
+    # sem planilha (só snapshot) vale a versão dos pesos
+    if not planilha:
+        return (periodo, (), versao_config)
+    origens = meses_disponiveis(motor, planilha)
+    meses = [periodo] if eh_mes(periodo) else meses_do_periodo(periodo, [m for m in MESES_ANO if m in origens])
+    return (periodo, impressoes_de(origens, meses), versao_config)
+
+def memoria_periodos(motor: dict, versao: dict) -> dict:
+    # período -> bytes dos dados da versão em vigor (None se já saiu do cache)
+    return {
+        p: bytes_da_chave(motor["bases"], chave_periodo(motor, p, versao["planilha"], versao["pesos"]))
+        for p in versao["periodos"]
+    }
+
+def mes_calculado(motor: dict, mes: str, planilha: tuple, config: dict):
+    # calcula_mes de uma aba, reaproveitado pela visão mensal e pelos agregados
+    from .calculo import calcula_mes
+
+    def calcular():
+        aba = aba_do_mes(motor, mes, planilha, config)
+        with etapa(f"calcula_mes:{mes}", len(aba)):
+            return calcula_mes(aba, mes, config["indicadores"], config["mascaras"])
+    return no_cache(motor["meses"], chave_mes(meses_disponiveis(motor, planilha), mes, config["versao"]), calcular)
+
+def agregado(motor: dict, meses: tuple, planilha: tuple, config: dict):
+    # parcial combinada dos meses; (JAN, FEV, MAR) = (JAN, FEV) + MAR, então
+    # o acumulado e o trimestre reaproveitam os prefixos já em cache
+    from .calculo import combinar_parciais, parcial_do_mes
+
+    def calcular():
+        if len(meses) == 1:
+            calc = mes_calculado(motor, meses[0], planilha, config)
+            with etapa(f"parcial:{meses[0]}", len(calc)):
+                return parcial_do_mes(calc)
+        anterior = agregado(motor, meses[:-1], planilha, config)
+        ultimo = agregado(motor, meses[-1:], planilha, config)
+        with etapa(f"agregado:{'+'.join(meses)}", len(anterior) + len(ultimo)):
+            return combinar_parciais([anterior, ultimo])
+    chave = (meses, impressoes_de(meses_disponiveis(motor, planilha), meses), config["versao"])
+    return no_cache(motor["agregados"], chave, calcular)
+
+def montar_base(motor: dict, periodo: str, planilha: tuple, config: dict):
+    from .calculo import base_mensal, finalizar_parcial
+
+    if eh_mes(periodo):
+        return base_mensal(mes_calculado(motor, periodo, planilha, config))
+    meses = meses_do_periodo(periodo, [m for m in MESES_ANO if m in meses_disponiveis(motor, planilha)])
+    if not meses:
+        raise PlanilhaInvalida(f"Nenhuma aba de mês encontrada para {rotulo_periodo(periodo)}.")
+    return finalizar_parcial(agregado(motor, tuple(meses), planilha, config))
+
+def calcular_meses_a_frio(motor: dict, planilha: tuple, config: dict):
+    # meses sem resultado nem aba em cache (planilha nova, ou abas editadas) e
+    # planilhas grandes o bastante: lidos e calculados em paralelo, um processo
+    # por mês. Com poucos meses a refazer, o caminho normal lê só esses
+    from .paralelo import calcular_meses, trabalhadores_para
+
+    origens = meses_disponiveis(motor, planilha)
+    faltando = {
+        mes: arquivo for mes, (arquivo, impressao) in origens.items()
+        if not tem_chave(motor["meses"], chave_mes(origens, mes, config["versao"]))
+        and not tem_chave(motor["abas"], (impressao, config["colunas"]))
+    }
+    n = trabalhadores_para(faltando) if faltando else 1
+    if n < 2:
+        return
+    with etapa(f"meses_em_paralelo:{len(faltando)}x{n}") as info:
+        calculados = calcular_meses(faltando, config, n)
+        info["linhas"] = sum(len(df) for df in calculados.values())
+    for mes, calc in calculados.items():
+        guardar(motor["meses"], chave_mes(origens, mes, config["versao"]), calc)
+
+# ===================== SNAPSHOT =====================
+def snapshot_atual(motor: dict, planilha: tuple, versao_config: str):
+    # manifesto do snapshot, só se foi gerado a partir destas planilhas e destes pesos
+    from . import snapshot
+
+    manifesto = snapshot.ler_manifesto(motor["snapshot_dir"])
+    if manifesto is None:
+        return None
+    sha = None
+    if planilha:
+        sha = hash_conjunto([no_cache(motor["shas"], a, lambda a=a: hash_arquivo(a[0])) for a in planilha])
+    return manifesto if snapshot.snapshot_vale(manifesto, sha, versao_config) else None
+
+def base_do_snapshot(motor: dict, periodo: str, planilha: tuple, versao_config: str):
+    from . import snapshot
+
+    manifesto = snapshot_atual(motor, planilha, versao_config)
+    return None if manifesto is None else snapshot.ler_periodo(motor["snapshot_dir"], manifesto, periodo)
+
+# ===================== VERSÕES =====================
+def base_indexada(motor: dict, periodo: str, planilha: tuple, config: dict) -> dict:
+    # período pronto para o painel: dados + índices de e-mail, nome e empresa
+    from .calculo import filtrar_analistas
+    from .busca import indexar_base
+
+    def calcular():
+        with etapa(f"periodo:{periodo}") as info:
+            with etapa("snapshot"):
+                dados = base_do_snapshot(motor, periodo, planilha, config["versao"])
+            if dados is None:
+                dados = montar_base(motor, periodo, planilha, config)
+                with etapa("filtrar_analistas", len(dados)):
+                    dados = filtrar_analistas(dados)
+            with etapa("indexar", len(dados)):
+                base = indexar_base(dados)
+            info["linhas"] = len(dados)
+            return base
+    return no_cache(motor["bases"], chave_periodo(motor, periodo, planilha, config["versao"]), calcular)
+
+def cubo_de_perdas(motor: dict, bases: dict, planilha: tuple, config: dict):
+    # um pedaço por mês (mesma base que o painel mostra); editar uma aba
+    # refaz só o pedaço dela
+    from .calculo import cubo_do_mes, juntar_cubos
+
+    def pedaco(mes):
+        def calcular():
+            with etapa(f"cubo:{mes}") as info:
+                cubo = cubo_do_mes(bases[mes]["dados"], mes, config["indicadores"], config["mascaras"])
+                info["linhas"] = len(cubo)
+                return cubo
+        return no_cache(motor["cubos"], chave_periodo(motor, mes, planilha, config["versao"]), calcular)
+
+    with etapa("cubo_perdas") as info:
+        cubo = juntar_cubos([pedaco(m) for m in MESES_ANO if m in bases], config["indicadores"])
+        info["linhas"] = len(cubo)
+    return cubo
+
+def arquivos_vigiados(motor: dict) -> tuple:
+    # tudo que muda o resultado: planilhas, configs e o manifesto do snapshot
+    from .snapshot import MANIFESTO
+
+    configs = [motor["pesos_path"], motor["mascara_path"], motor["snapshot_dir"] / MANIFESTO]
+    return (versao_planilha(motor), assinaturas(configs))
+
+def carregar_versao(motor: dict, vigiados: tuple) -> dict:
+    # roda na thread do vigia: lê, calcula e indexa todos os períodos antes de
+    # a versão entrar no ar
+    planilha = vigiados[0]
+    with medindo("carga") as registro:
+        with etapa("config"):
+            config = carregar_config(motor["pesos_path"], motor["mascara_path"])
+
+        with etapa("snapshot"):
+            manifesto = snapshot_atual(motor, planilha, config["versao"])
+        if manifesto is not None:
+            periodos = list(manifesto["periodos"])
+        else:
+            periodos = periodos_disponiveis(list(meses_disponiveis(motor, planilha)))
+            calcular_meses_a_frio(motor, planilha, config)
+        bases = {p: base_indexada(motor, p, planilha, config) for p in periodos}
+        cubo = cubo_de_perdas(motor, bases, planilha, config)
+    return {
+        "planilha": planilha,
+        "pesos": config["versao"],
+        "periodos": periodos,
+        "bases": bases,
+        "carregada_em": time.time(),
+        # pesos, máscaras e política desta versão (simulador)
+        "config": config,
+        # PERDA por empresa, mês e indicador (CUBO_COLS)
+        "cubo": cubo,
+        # etapas desta carga (para o diagnóstico do admin)
+        "medicao": registro,
+    }
+
+def simular_periodo(motor: dict, versao: dict, periodo: str, cenarios: dict):
+    # RECEBIDO/PERDA do período por cenário e empresa, sobre os meses da versão
+    # em vigor; o primeiro cenário é sempre o atual (pesos do arquivo)
+    from .simulador import CENARIO_ATUAL, matriz_do_mes, pesos_cenarios, simular
+
+    config = versao["config"]
+    meses = [periodo] if eh_mes(periodo) else meses_do_periodo(periodo, [m for m in MESES_ANO if m in versao["bases"]])
+    def matriz(mes):
+        mascara = config["mascaras"].get(mes)
+        ativos = None if mascara is None else mascara["ativos"]
+        chave = chave_periodo(motor, mes, versao["planilha"], versao["pesos"])
+        return no_cache(motor["matrizes"], chave,
+                        lambda: matriz_do_mes(versao["bases"][mes]["dados"], config["indicadores"], ativos))
+
+    cenarios = {CENARIO_ATUAL: {}, **{n: c for n, c in cenarios.items() if n != CENARIO_ATUAL}}
+    with etapa(f"simular:{periodo}x{len(cenarios)}") as info:
+        matrizes = [matriz(m) for m in meses]
+        pesos = pesos_cenarios(config["indicadores"], cenarios)
+        resultado = simular(matrizes, pesos, list(cenarios), config["politica"])
+        info["linhas"] = len(resultado)
+    return resultado
+
+def arquivar_versao(motor: dict, versao: dict, ano: int) -> dict:
+    # grava no histórico os meses da versão em vigor como meses de `ano`
+    # (as abas só têm o nome do mês); mês -> linhas gravadas
+    from .historico import gravar_meses
+
+    meses = {p: versao["bases"][p]["dados"] for p in versao["periodos"] if eh_mes(p)}
+    arquivo = ", ".join(Path(a[0]).name for a in versao["planilha"]) or "snapshot"
+    with etapa(f"historico:{ano}") as info:
+        gravados = gravar_meses(motor["historico_path"], ano, meses, versao["config"], arquivo)
+        info["linhas"] = sum(gravados.values())
+    return gravados
+
+def iniciar_motor(motor: dict) -> dict:
+    # uma thread de vigia por motor
+    vigia = criar_vigia(
+        lambda: arquivos_vigiados(motor),
+        lambda vigiados: carregar_versao(motor, vigiados),
+        motor["intervalo"],
+    )
+    motor["vigia"] = iniciar_vigia(vigia)
+    return motor
+
+def versao_dados(motor: dict) -> dict:
+    # versão completa em vigor; quem pede usa a mesma do início ao fim
+    versao, erro = versao_vigia(motor["vigia"])
+    if versao is None:
+        raise erro
+    return versao
+
+def erro_recente(motor: dict):
+    # erro da última recarga (a versão anterior continua valendo), ou None
+    return versao_vigia(motor["vigia"])[1]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Cálculo dos meses em paralelo (sem Streamlit)
+# - Os meses são independentes até a agregação: cada processo lê só a aba do
+#   seu mês (ler_abas com meses=) e devolve o calcula_mes pronto, já com os
+#   tipos compactos (pouco para serializar de volta)
+# - BONUS_TRABALHADORES fixa quantos processos; sem ele, um por núcleo, e só
+#   para planilhas a partir de PARALELO_MIN_BYTES (abaixo disso subir os
+#   processos custa mais que ler tudo aqui)
+# - 1 trabalhador, um mês só ou pool quebrado: serial, cada arquivo lido uma vez
+# - Processos via "spawn": seguro com a thread do vigia e o Streamlit rodando
+# ============================================================
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from .regras import PlanilhaInvalida
+
+logger = logging.getLogger("bonus.paralelo")
+
+TRABALHADORES_ENV = "BONUS_TRABALHADORES"
+# tamanho somado das planilhas a partir do qual o modo automático usa processos
+PARALELO_MIN_BYTES = 2 * 2**20
+
+def nucleos_disponiveis() -> int:
+    # respeita o affinity do processo (containers limitados a alguns núcleos)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+def trabalhadores_padrao():
+    # BONUS_TRABALHADORES (inteiro >= 1) ou None = automático
+    valor = os.environ.get(TRABALHADORES_ENV, "").strip()
+    if not valor:
+        return None
+    try:
+        return max(1, int(valor))
+    except ValueError:
+        raise PlanilhaInvalida(f"{TRABALHADORES_ENV} inválido: {valor!r} (use um inteiro >= 1)") from None
+
+def trabalhadores_para(origens: dict, trabalhadores: int = None) -> int:
+    # quantos processos usar para {mês: arquivo}; 1 = serial
+    if trabalhadores is None:
+        trabalhadores = trabalhadores_padrao()
+    if trabalhadores is None:
+        tamanho = sum(Path(c).stat().st_size for c in set(origens.values()))
+        trabalhadores = nucleos_disponiveis() if tamanho >= PARALELO_MIN_BYTES else 1
+    return max(1, min(trabalhadores, len(origens)))
+
+def _calcular_mes(caminho, mes: str, config: dict):
+    # roda no processo filho: só a aba do mês, só as colunas e os analistas do painel
+    from .planilha import ler_abas
+    from .calculo import FUNCAO_PAINEL, calcula_mes, pegar_aba
+
+    abas = ler_abas(caminho, config["colunas"], FUNCAO_PAINEL, [mes])
+    return calcula_mes(pegar_aba(abas, mes), mes, config["indicadores"], config["mascaras"])
+
+def _calcular_serial(origens: dict, config: dict) -> dict:
+    from .planilha import ler_abas
+    from .calculo import FUNCAO_PAINEL, calcula_mes, pegar_aba
+
+    por_arquivo = {}
+    for mes, caminho in origens.items():
+        por_arquivo.setdefault(caminho, []).append(mes)
+    calculados = {}
+    for caminho, meses in por_arquivo.items():
+        abas = ler_abas(caminho, config["colunas"], FUNCAO_PAINEL, meses)
+        for mes in meses:
+            calculados[mes] = calcula_mes(pegar_aba(abas, mes), mes, config["indicadores"], config["mascaras"])
+    return calculados
+
+def calcular_meses(origens: dict, config: dict, trabalhadores: int = None) -> dict:
+    # {mês: arquivo} -> {mês: calcula_mes}; config de carregar_config.
+    # Erros da planilha (PlanilhaInvalida) sobem como no serial
+    n = trabalhadores_para(origens, trabalhadores) if origens else 1
+    if n > 1:
+        contexto = multiprocessing.get_context("spawn")
+        try:
+            with ProcessPoolExecutor(max_workers=n, mp_context=contexto) as pool:
+                futuros = {mes: pool.submit(_calcular_mes, caminho, mes, config) for mes, caminho in origens.items()}
+                return {mes: futuro.result() for mes, futuro in futuros.items()}
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning("pool de processos indisponível (%s); calculando os meses em série", e)
+    return _calcular_serial(origens, config)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Regras do bônus sem pandas/numpy (import rápido)
+# - Textos, booleanos da planilha, moeda, elegibilidade
+# - Pesos/indicadores (pesos_analistas.json) e política da máscara por mês
+# - Meses, trimestres e acumulado
+# ============================================================
+
+import json
+import math
+from pathlib import Path
+import unicodedata
+import re
+import hashlib
+
+MESES_ANO = [
+    "JANEIRO", "FEVEREIRO", "MARÇO", "ABRIL", "MAIO", "JUNHO",
+    "JULHO", "AGOSTO", "SETEMBRO", "OUTUBRO", "NOVEMBRO", "DEZEMBRO",
+]
+TRIMESTRES = {f"T{i + 1}": MESES_ANO[3 * i:3 * i + 3] for i in range(4)}
+ACUMULADO = "ACUMULADO"
+
+class PlanilhaInvalida(Exception):
+    # erro de dado/planilha com mensagem pronta para mostrar ao usuário
+    pass
+
+# ===================== HELPERS =====================
+def _ausente(v) -> bool:
+    # None, NaN e os nulos do pandas (NA, NaT) sem importar o pandas
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return True
+    return type(v).__name__ in ("NAType", "NaTType")
+
+def norm_txt(s: str) -> str:
+    if s is None or (isinstance(s, float) and math.isnan(s)):
+        return ""
+    s = str(s).strip().upper()
+    s = unicodedata.normalize("NFD", s)
+    s = "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+def up(s):
+    return norm_txt(s)
+
+def norm_email(s: str) -> str:
+    return (str(s or "").strip().lower())
+
+def texto_obs(valor):
+    if valor is None or (isinstance(valor, float) and math.isnan(valor)):
+        return ""
+    s = str(valor).strip()
+    return "" if s.lower() in ["none", "nan", ""] else s
+
+def bool_safe(v, default=True) -> bool:
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return default
+    s = str(v).strip().lower()
+    if s in ["true", "t", "1", "sim", "s", "yes", "y", "ok"]:
+        return True
+    if s in ["false", "f", "0", "nao", "não", "n", "no"]:
+        return False
+    try:
+        return float(s) != 0
+    except Exception:
+        return default
+
+def elegivel(valor_meta, obs):
+    obs_u = up(obs)
+    if _ausente(valor_meta) or float(valor_meta) == 0:
+        return False, "Sem elegibilidade no mês"
+    if "LICEN" in obs_u:
+        return False, "Licença no mês"
+    return True, ""
+
+def brl(x: float) -> str:
+    try:
+        return f"R$ {float(x):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    except Exception:
+        return "R$ 0,00"
+
+def load_json(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# ===================== PESOS / INDICADORES =====================
+# indicador (chave em "metas") -> coluna BATEU_*, rótulo exibido e chave no
+# empresa_indicadores_analistas.json. Vale quando o pesos_analistas.json não
+# traz a seção "indicadores".
+INDICADORES_PADRAO = {
+    "Produção": {"coluna": "BATEU_PRODUCAO", "rotulo": "Produção", "chave": "producao"},
+    "Tempo Médio Geral de Análise": {"coluna": "BATEU_TMG_GERAL", "rotulo": "Tempo Médio Geral de Análise", "chave": "tempo_medio_geral"},
+    "Tempo Médio de Análise do Analista": {"coluna": "BATEU_TMA_ANALISTA", "rotulo": "Tempo Médio do Analista", "chave": "tempo_medio_analista"},
+    "Tempo Médio da Fila": {"coluna": "BATEU_TEMPO_FILA", "rotulo": "Tempo Médio da Fila", "chave": "tempo_medio_fila"},
+    "Conformidade": {"coluna": "BATEU_CONFORMIDADE", "rotulo": "Conformidade", "chave": "conformidade"},
+}
+
+def compilar_indicadores(pesos: dict) -> list:
+    # resolve cada item de "metas" no registro uma única vez (nomes comparados
+    # via up(), então "Produção" e "PRODUCAO" são o mesmo indicador)
+    metainfo = pesos.get(up("ANALISTA"), {})
+    registro = {up(k): v for k, v in INDICADORES_PADRAO.items()}
+    registro.update({up(k): v for k, v in metainfo.get("indicadores", {}).items()})
+
+    indicadores = []
+    for item, peso in metainfo.get("metas", {}).items():
+        info = registro.get(up(item), {})
+        try:
+            peso = float(peso)
+        except (TypeError, ValueError):
+            raise ValueError(f"peso inválido para '{item}': {peso!r}")
+        indicadores.append({
+            "item": item,
+            "peso": peso,
+            # sem coluna BATEU_* o item é sempre pago
+            "coluna": info.get("coluna"),
+            "rotulo": info.get("rotulo", item),
+            # sem chave o item não é afetado pela máscara do mês
+            "chave": info.get("chave"),
+        })
+    return indicadores
+
+def versao_pesos(pesos: dict, mascara: dict = None) -> str:
+    # muda sempre que o conteúdo de pesos_analistas.json (ou da máscara) muda
+    conteudo = pesos if mascara is None else {"pesos": pesos, "mascara": mascara}
+    bruto = json.dumps(conteudo, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(bruto.encode("utf-8")).hexdigest()
+
+# ===================== PERÍODOS =====================
+_MES_POR_NOME = {norm_txt(m): m for m in MESES_ANO}
+
+def mes_da_aba(nome_aba: str):
+    # "MARCO", "Março " e "MARÇO" são a mesma aba; None se não for um mês
+    return _MES_POR_NOME.get(norm_txt(nome_aba))
+
+def periodos_disponiveis(meses: list) -> list:
+    # cada trimestre com dados seguido dos seus meses; acumulado do ano no
+    # fim quando há mais de um trimestre
+    presentes = set(meses)
+    periodos = []
+    for trimestre, meses_tri in TRIMESTRES.items():
+        meses_tri = [m for m in meses_tri if m in presentes]
+        if meses_tri:
+            periodos += [trimestre] + meses_tri
+    if sum(p in TRIMESTRES for p in periodos) > 1:
+        periodos.append(ACUMULADO)
+    return periodos
+
+def meses_do_periodo(periodo: str, meses: list) -> list:
+    # meses (em ordem do ano) que compõem o período
+    presentes = set(meses)
+    if periodo in TRIMESTRES:
+        return [m for m in TRIMESTRES[periodo] if m in presentes]
+    if periodo == ACUMULADO:
+        return [m for m in MESES_ANO if m in presentes]
+    return [periodo] if periodo in presentes else []
+
+def eh_mes(periodo: str) -> bool:
+    return periodo in MESES_ANO
+
+def rotulo_periodo(periodo: str) -> str:
+    if periodo in TRIMESTRES:
+        return f"{periodo[1]}º Trimestre"
+    if periodo == ACUMULADO:
+        return "Acumulado do ano"
+    return periodo
+
+# ===================== MÁSCARA POR MÊS =====================
+# empresa_indicadores_analistas.json: {"MÊS": {"producao": true, ...}}.
+# Indicador desligado no mês não conta como perdido; o peso dele vai para os
+# ligados ("renormalizar") ou sai do total possível ("zerar"). A política vem
+# de "indicador_desligado" no pesos_analistas.json.
+POLITICAS_DESLIGADO = ("renormalizar", "zerar")
+
+def politica_desligado(pesos: dict) -> str:
+    metainfo = pesos.get(up("ANALISTA"), {})
+    politica = str(metainfo.get("indicador_desligado", POLITICAS_DESLIGADO[0])).strip().lower()
+    if politica not in POLITICAS_DESLIGADO:
+        raise ValueError(f"indicador_desligado inválido: {politica!r} (use {' ou '.join(POLITICAS_DESLIGADO)})")
+    return politica
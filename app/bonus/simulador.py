@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Simulador de pesos (sem Streamlit): e se os pesos de pesos_analistas.json
+# fossem outros?
+# - Por mês: matriz analistas x indicadores das metas batidas (BATEU_*, mesma
+#   regra do calcula_mes) ponderada pela META, reduzida a empresas x indicadores
+# - Cenários = colunas de uma matriz indicadores x cenários: um produto de
+#   matrizes por mês dá RECEBIDO/PERDA de todos os cenários, sem calcula_mes
+# - Indicadores desligados no mês e a política renormalizar/zerar valem para
+#   os pesos de cada cenário, como em compilar_mascaras
+# ============================================================
+
+import numpy as np
+import pandas as pd
+
+from .regras import up, bool_safe
+from .calculo import SEM_EMPRESA, map_unicos, meta_elegivel, pesos_com_mascara
+
+CENARIO_ATUAL = "Atual"
+
+def matriz_do_mes(dados: pd.DataFrame, indicadores: list, ativos=None) -> dict:
+    # dados: base de um mês (calcula_mes / base_mensal, só analistas). A META
+    # da base já vem com o fator da máscara; aqui vale a meta cheia
+    n, k = len(dados), len(indicadores)
+    meta = meta_elegivel(dados)[0]
+    bateu = np.ones((n, k), dtype=bool)
+    for j, ind in enumerate(indicadores):
+        if ind["coluna"] and ind["coluna"] in dados.columns and (ativos is None or ativos[j]):
+            bateu[:, j] = map_unicos(dados[ind["coluna"]], lambda v: bool_safe(v, True), dtype=bool).to_numpy()
+
+    empresa = dados["EMPRESA"].astype(object) if "EMPRESA" in dados.columns else pd.Series(None, index=dados.index)
+    codigos, empresas = pd.factorize(empresa.fillna(SEM_EMPRESA), sort=True)
+    # uma linha por empresa: soma das linhas dos seus analistas, via bincount
+    # (a célula (empresa, indicador) vira a posição empresa * k + indicador)
+    celulas = (codigos[:, None] * k + np.arange(k)).ravel()
+
+    def por_empresa(valores):
+        return np.bincount(celulas, weights=valores.ravel(), minlength=len(empresas) * k).reshape(len(empresas), k)
+
+    em_jogo = meta[:, None]
+    return {
+        "empresas": list(empresas),
+        "meta": np.bincount(codigos, weights=meta, minlength=len(empresas)),
+        "batido": por_empresa(np.where(bateu, em_jogo, 0.0)),
+        "perdido": por_empresa(np.where(bateu, 0.0, em_jogo)),
+        "ativos": ativos,
+    }
+
+def pesos_cenarios(indicadores: list, cenarios: dict) -> np.ndarray:
+    # {nome: {item: peso}} -> matriz indicadores x cenários; item fora do
+    # cenário fica com o peso atual (nomes comparados via up())
+    posicao = {up(ind["item"]): j for j, ind in enumerate(indicadores)}
+    atuais = np.array([ind["peso"] for ind in indicadores], dtype=float)
+    pesos = np.repeat(atuais[:, None], len(cenarios), axis=1)
+    for c, (nome, itens) in enumerate(cenarios.items()):
+        for item, peso in (itens or {}).items():
+            j = posicao.get(up(item))
+            if j is None:
+                raise ValueError(f"indicador desconhecido no cenário {nome!r}: {item!r}")
+            try:
+                peso = float(peso)
+            except (TypeError, ValueError):
+                raise ValueError(f"peso inválido para '{item}' no cenário {nome!r}: {peso!r}") from None
+            if not np.isfinite(peso) or peso < 0:
+                raise ValueError(f"peso inválido para '{item}' no cenário {nome!r}: {peso!r}")
+            pesos[j, c] = peso
+    return pesos
+
+def varrer_peso(indicadores: list, item: str, valores, manter_soma: bool = True) -> dict:
+    # um cenário por valor do peso de `item`; com manter_soma, os outros itens
+    # são reescalados na mesma proporção para o total dos pesos não mudar
+    atuais = {ind["item"]: ind["peso"] for ind in indicadores}
+    alvo = next((i for i in atuais if up(i) == up(item)), None)
+    if alvo is None:
+        raise ValueError(f"indicador desconhecido: {item!r}")
+    total, resto = sum(atuais.values()), sum(p for i, p in atuais.items() if i != alvo)
+    cenarios = {}
+    for valor in valores:
+        valor = float(valor)
+        escala = (total - valor) / resto if manter_soma and resto > 0 else 1.0
+        if escala < 0:
+            continue
+        cenarios[f"{alvo} = {valor:.2f}"] = {i: (valor if i == alvo else p * escala) for i, p in atuais.items()}
+    return cenarios
+
+def simular(matrizes: list, pesos: np.ndarray, nomes: list, politica: str) -> pd.DataFrame:
+    # matrizes: uma por mês do período (matriz_do_mes); pesos: indicadores x
+    # cenários. Uma linha por cenário e empresa
+    empresas = sorted({e for m in matrizes for e in m["empresas"]})
+    linha = {e: i for i, e in enumerate(empresas)}
+    s = pesos.shape[1]
+    meta, recebido, perda = (np.zeros((len(empresas), s)) for _ in range(3))
+    for m in matrizes:
+        if m["ativos"] is None:
+            pesos_mes, fator = pesos, np.ones(s)
+        else:
+            pesos_mes, fator = pesos_com_mascara(pesos, m["ativos"], politica)
+        idx = [linha[e] for e in m["empresas"]]
+        # empresas x indicadores . indicadores x cenários
+        recebido[idx] += m["batido"] @ pesos_mes
+        perda[idx] += m["perdido"] @ pesos_mes
+        meta[idx] += m["meta"][:, None] * fator[None, :]
+
+    out = pd.DataFrame({
+        "CENARIO": np.repeat(np.asarray(nomes, dtype=object), len(empresas)),
+        "EMPRESA": np.tile(np.asarray(empresas, dtype=object), s),
+        "META": meta.T.ravel(),
+        "RECEBIDO": recebido.T.ravel(),
+        "PERDA": perda.T.ravel(),
+    })
+    out["%"] = np.where(out["META"] != 0, out["RECEBIDO"] / out["META"].where(out["META"] != 0, 1.0) * 100.0, 0.0)
+    return out
+
+def totais_por_cenario(resultado: pd.DataFrame) -> pd.DataFrame:
+    # soma das empresas, na ordem dos cenários; Δ em relação ao primeiro (Atual)
+    out = resultado.groupby("CENARIO", sort=False)[["META", "RECEBIDO", "PERDA"]].sum().reset_index()
+    meta = out["META"].to_numpy()
+    out["%"] = np.where(meta != 0, out["RECEBIDO"].to_numpy() / np.where(meta != 0, meta, 1.0) * 100.0, 0.0)
+    out["Δ RECEBIDO"] = out["RECEBIDO"] - out["RECEBIDO"].iloc[0]
+    return out
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Snapshot pré-calculado (Feather/Arrow, um arquivo por período)
+# - gerado offline por app/precalcular.py
+# - lido pelo painel direto em DataFrame, sem abrir o xlsx
+# ============================================================
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+MANIFESTO = "manifesto.json"
+VERSAO_FORMATO = 1
+
+def _arquivo_periodo(periodo: str) -> str:
+    return f"{periodo}.feather"
+
+def _para_arrow(df: pd.DataFrame) -> pa.Table:
+    # colunas texto da planilha às vezes misturam número e texto; nesses casos
+    # grava como texto (vazios continuam nulos)
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].map(lambda v: v if v is None or (isinstance(v, float) and pd.isna(v)) else str(v))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def gravar_snapshot(pasta: Path, bases: dict, planilha: dict, pesos: str) -> dict:
+    # planilha: {"arquivos", "sha256"} da origem; pesos: versao_pesos()
+    pasta = Path(pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+
+    periodos = {}
+    for periodo, dados in bases.items():
+        nome = _arquivo_periodo(periodo)
+        tmp = pasta / (nome + ".tmp")
+        # sem compressão: a leitura não precisa descomprimir
+        feather.write_feather(_para_arrow(dados), tmp, compression="uncompressed")
+        tmp.replace(pasta / nome)
+        periodos[periodo] = {"arquivo": nome, "linhas": int(len(dados))}
+
+    manifesto = {
+        "formato": VERSAO_FORMATO,
+        "gerado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "planilha": planilha,
+        "pesos": pesos,
+        "periodos": periodos,
+    }
+    # manifesto por último: quem lê só enxerga o snapshot quando ele está completo
+    tmp = pasta / (MANIFESTO + ".tmp")
+    tmp.write_text(json.dumps(manifesto, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(pasta / MANIFESTO)
+
+    # períodos que não existem mais (ex.: aba removida) saem da pasta
+    atuais = {info["arquivo"] for info in periodos.values()}
+    for antigo in pasta.glob("*.feather"):
+        if antigo.name not in atuais:
+            antigo.unlink()
+    return manifesto
+
+def ler_manifesto(pasta: Path):
+    caminho = Path(pasta) / MANIFESTO
+    if not caminho.exists():
+        return None
+    try:
+        manifesto = json.loads(caminho.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return manifesto if manifesto.get("formato") == VERSAO_FORMATO else None
+
+def snapshot_vale(manifesto: dict, sha_planilha, pesos: str) -> bool:
+    # pesos sempre precisam bater; a planilha só é conferida se existir em data/
+    if not manifesto or manifesto.get("pesos") != pesos:
+        return False
+    return sha_planilha is None or manifesto.get("planilha", {}).get("sha256") == sha_planilha
+
+def ler_periodo(pasta: Path, manifesto: dict, periodo: str):
+    info = manifesto.get("periodos", {}).get(periodo)
+    if not info:
+        return None
+    # to_pandas copia as colunas de qualquer forma (o painel trabalha com
+    # dtypes numpy/categoria), então não há ganho em memory-map
+    dados = feather.read_feather(Path(pasta) / info["arquivo"])
+    if "perdeu_itens" in dados.columns:
+        # Arrow devolve arrays; o resto do painel trabalha com listas
+        dados["perdeu_itens"] = dados["perdeu_itens"].map(lambda L: [] if L is None else list(L))
+    return dados
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Vigia de data/ (sem Streamlit)
+# - Uma thread compara as assinaturas (mtime/tamanho) dos arquivos a cada intervalo
+# - Mudou: espera os arquivos pararem de mudar, recarrega fora da requisição
+#   e troca a versão inteira de uma vez (quem leu a anterior continua com ela)
+# - Falha ao recarregar: mantém a versão anterior e guarda o erro
+# ============================================================
+
+import threading
+import time
+from pathlib import Path
+
+def assinaturas(caminhos: list) -> tuple:
+    # (caminho, mtime, tamanho) de cada arquivo; None se ele não existe
+    resultado = []
+    for caminho in caminhos:
+        try:
+            info = Path(caminho).stat()
+        except FileNotFoundError:
+            resultado.append((str(caminho), None, None))
+        else:
+            resultado.append((str(caminho), info.st_mtime_ns, info.st_size))
+    return tuple(resultado)
+
+def criar_vigia(listar, carregar, intervalo: float) -> dict:
+    # listar() -> assinaturas atuais; carregar(assinaturas) -> versão pronta
+    return {
+        "listar": listar,
+        "carregar": carregar,
+        "intervalo": intervalo,
+        "lock": threading.Lock(),
+        "pronta": threading.Event(),
+        "versao": None,
+        "erro": None,
+        "carregada": None,   # assinaturas da última tentativa de carga
+        "vista": None,       # assinaturas da última verificação
+        "recargas": 0,
+    }
+
+def verificar_vigia(vigia: dict, esperar_estabilizar: bool = True) -> bool:
+    # True se uma versão nova entrou no ar
+    atuais = vigia["listar"]()
+    anterior, vigia["vista"] = vigia["vista"], atuais
+    if atuais == vigia["carregada"]:
+        return False
+    # arquivo sendo copiado muda entre duas verificações: só carrega quando
+    # ficar igual por um intervalo (na primeira carga não há o que esperar)
+    if esperar_estabilizar and vigia["versao"] is not None and atuais != anterior:
+        return False
+
+    try:
+        nova = vigia["carregar"](atuais)
+    except Exception as e:
+        with vigia["lock"]:
+            vigia["erro"] = e
+            vigia["carregada"] = atuais
+        vigia["pronta"].set()
+        return False
+
+    with vigia["lock"]:
+        vigia["versao"] = nova
+        vigia["erro"] = None
+        vigia["carregada"] = atuais
+        vigia["recargas"] += 1
+    vigia["pronta"].set()
+    return True
+
+def _rodar(vigia: dict):
+    while True:
+        try:
+            verificar_vigia(vigia)
+        except Exception as e:
+            # erro no listar(): tenta de novo no próximo intervalo
+            with vigia["lock"]:
+                vigia["erro"] = e
+            vigia["pronta"].set()
+        time.sleep(vigia["intervalo"])
+
+def iniciar_vigia(vigia: dict, nome: str = "vigia-dados") -> dict:
+    threading.Thread(target=_rodar, args=(vigia,), name=nome, daemon=True).start()
+    return vigia
+
+def versao_vigia(vigia: dict, timeout: float = None) -> tuple:
+    # (versão, erro); bloqueia só até a primeira carga terminar
+    vigia["pronta"].wait(timeout)
+    with vigia["lock"]:
+        return vigia["versao"], vigia["erro"]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Exportação da folha de bônus (sem Streamlit)
+# - Uma passada pelas planilhas: cada mês é calculado uma vez e os trimestres
+#   / acumulado reaproveitam as parciais dos meses; em planilhas grandes os
+#   meses são calculados em processos paralelos (--trabalhadores)
+# - Resultados (RECEBIDO/PERDA por analista e período) + indicadores não
+#   entregues em formato longo, gravados em blocos (CSV, XLSX ou Parquet)
+#
+# Uso:  python app/exportar_folha.py [--formato csv|xlsx|parquet] [--saida PASTA]
+#                                    [--planilha ARQ ...] [--pesos ARQ] [--mascara ARQ]
+#                                    [--trabalhadores N]
+# ============================================================
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bonus import (
+    PlanilhaInvalida,
+    carregar_config,
+    exigir_planilhas,
+    calcular_meses,
+    meses_das_planilhas,
+    periodos_calculados,
+    FORMATOS,
+    TAMANHO_BLOCO,
+    gravar_exportacao,
+)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PESOS_PATH = DATA_DIR / "pesos_analistas.json"
+EMPRESA_INDICADORES_PATH = DATA_DIR / "empresa_indicadores_analistas.json"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Exporta RECEBIDO/PERDA de todos os analistas em todos os períodos.")
+    parser.add_argument("--formato", choices=FORMATOS, default="csv")
+    parser.add_argument("--saida", type=Path, default=Path("folha"), help="pasta de saída (padrão: ./folha)")
+    parser.add_argument("--planilha", type=Path, action="append", default=None,
+                        help="xlsx de origem; pode repetir (padrão: data/RESUMO PARA PAINEL - ANALISTAS*.xlsx)")
+    parser.add_argument("--pesos", type=Path, default=PESOS_PATH, help="pesos_analistas.json")
+    parser.add_argument("--mascara", type=Path, default=EMPRESA_INDICADORES_PATH,
+                        help="empresa_indicadores_analistas.json (opcional; ausente = todos os indicadores valem)")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por bloco de gravação")
+    parser.add_argument("--trabalhadores", type=int, default=None,
+                        help="processos para calcular os meses (padrão: BONUS_TRABALHADORES ou um por núcleo "
+                             "em planilhas grandes; 1 = serial)")
+    args = parser.parse_args(argv)
+    if args.trabalhadores is not None and args.trabalhadores < 1:
+        parser.error("--trabalhadores precisa ser >= 1")
+
+    inicio = time.perf_counter()
+    try:
+        config = carregar_config(args.pesos, args.mascara)
+        planilhas = args.planilha or exigir_planilhas(DATA_DIR)
+        calculados = calcular_meses(meses_das_planilhas(planilhas), config, args.trabalhadores)
+        bases = periodos_calculados(calculados)
+        arquivos = gravar_exportacao(args.saida, bases, config, args.formato, max(1, args.bloco))
+    except PlanilhaInvalida as e:
+        print(f"erro: {e}", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"erro ao exportar: {e}", file=sys.stderr)
+        return 1
+
+    for periodo, dados in bases.items():
+        print(f"{periodo:<10} {len(dados):>7} analistas")
+    for arquivo in arquivos:
+        print(f"-> {arquivo}")
+    print(f"exportação concluída ({time.perf_counter() - inicio:.2f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Histórico de resultados (sem Streamlit)
+# - gravar: calcula os meses das planilhas e grava no histórico como meses
+#   do --ano informado (as abas só têm o nome do mês); regravar substitui
+# - analista: todos os meses gravados de um e-mail
+# - perdas: perda por empresa, trimestre e indicador nos últimos trimestres
+# - meses: o que já está gravado
+#
+# Uso:  python app/historico.py [--banco ARQ] gravar --ano AAAA [--planilha ARQ ...]
+#                               [--pesos ARQ] [--mascara ARQ] [--trabalhadores N]
+#       python app/historico.py [--banco ARQ] analista EMAIL
+#       python app/historico.py [--banco ARQ] perdas [--trimestres N] [--empresa NOME]
+#       python app/historico.py [--banco ARQ] meses
+# ============================================================
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from bonus import (
+    PlanilhaInvalida,
+    HISTORICO_ARQUIVO,
+    TRIMESTRES_PADRAO,
+    carregar_config,
+    exigir_planilhas,
+    calcular_meses,
+    meses_das_planilhas,
+    gravar_meses,
+    meses_gravados,
+    historico_analista,
+    perdas_por_indicador,
+    brl,
+)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PESOS_PATH = DATA_DIR / "pesos_analistas.json"
+EMPRESA_INDICADORES_PATH = DATA_DIR / "empresa_indicadores_analistas.json"
+
+def _imprimir(df, moeda=()) -> None:
+    if df.empty:
+        print("(nada gravado)")
+        return
+    df = df.copy()
+    for c in moeda:
+        df[c] = df[c].map(brl)
+    if "%" in df.columns:
+        df["%"] = df["%"].map(lambda v: f"{v:.1f}%")
+    print(df.to_string(index=False))
+
+def gravar(args) -> None:
+    inicio = time.perf_counter()
+    config = carregar_config(args.pesos, args.mascara)
+    planilhas = args.planilha or exigir_planilhas(DATA_DIR)
+    calculados = calcular_meses(meses_das_planilhas(planilhas), config, args.trabalhadores)
+    arquivo = ", ".join(Path(p).name for p in planilhas)
+    gravados = gravar_meses(args.banco, args.ano, calculados, config, arquivo)
+    for mes, linhas in gravados.items():
+        print(f"{mes}/{args.ano:<5} {linhas:>7} analistas")
+    print(f"-> {args.banco} ({time.perf_counter() - inicio:.2f}s)")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Grava e consulta o histórico de resultados por mês.")
+    parser.add_argument("--banco", type=Path, default=DATA_DIR / HISTORICO_ARQUIVO,
+                        help=f"arquivo do histórico (padrão: data/{HISTORICO_ARQUIVO})")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p = comandos.add_parser("gravar", help="calcula os meses das planilhas e grava no histórico")
+    p.add_argument("--ano", type=int, required=True, help="ano dos meses da planilha")
+    p.add_argument("--planilha", type=Path, action="append", default=None,
+                   help="xlsx de origem; pode repetir (padrão: data/RESUMO PARA PAINEL - ANALISTAS*.xlsx)")
+    p.add_argument("--pesos", type=Path, default=PESOS_PATH, help="pesos_analistas.json")
+    p.add_argument("--mascara", type=Path, default=EMPRESA_INDICADORES_PATH,
+                   help="empresa_indicadores_analistas.json (opcional; ausente = todos os indicadores valem)")
+    p.add_argument("--trabalhadores", type=int, default=None,
+                   help="processos para calcular os meses (padrão: BONUS_TRABALHADORES ou um por núcleo "
+                        "em planilhas grandes; 1 = serial)")
+
+    p = comandos.add_parser("analista", help="todos os meses gravados de um analista")
+    p.add_argument("email")
+
+    p = comandos.add_parser("perdas", help="perda por empresa, trimestre e indicador")
+    p.add_argument("--trimestres", type=int, default=TRIMESTRES_PADRAO,
+                   help=f"quantos trimestres, a partir do mais recente gravado (padrão: {TRIMESTRES_PADRAO})")
+    p.add_argument("--empresa", default=None, help="só esta empresa")
+
+    comandos.add_parser("meses", help="meses já gravados")
+    args = parser.parse_args(argv)
+    if getattr(args, "trabalhadores", None) is not None and args.trabalhadores < 1:
+        parser.error("--trabalhadores precisa ser >= 1")
+    if getattr(args, "trimestres", 1) < 1:
+        parser.error("--trimestres precisa ser >= 1")
+
+    try:
+        if args.comando == "gravar":
+            gravar(args)
+        elif args.comando == "analista":
+            _imprimir(historico_analista(args.banco, args.email), ["META", "RECEBIDO", "PERDA"])
+        elif args.comando == "perdas":
+            _imprimir(perdas_por_indicador(args.banco, args.trimestres, args.empresa), ["PERDA"])
+        else:
+            _imprimir(meses_gravados(args.banco))
+    except PlanilhaInvalida as e:
+        print(f"erro: {e}", file=sys.stderr)
+        return 1
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"erro no histórico: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# ============================================================
+# Pré-cálculo offline do painel
+# - Lê as planilhas RESUMO PARA PAINEL - ANALISTAS*.xlsx, pesos_analistas.json
+#   e empresa_indicadores_analistas.json (indicadores ligados por mês)
+# - Valida as abas (COLS_OBRIG) e calcula todos os períodos (meses, T1-T4, acumulado);
+#   os meses podem ser calculados em processos paralelos (--trabalhadores)
+# - Grava um snapshot Feather por período + manifesto.json
+#
+# Uso:  python app/precalcular.py [--planilha ARQ ...] [--pesos ARQ] [--mascara ARQ] [--saida PASTA]
+#                                 [--trabalhadores N]
+# ============================================================
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bonus import (
+    PlanilhaInvalida,
+    carregar_config,
+    exigir_planilhas,
+    hash_arquivo,
+    hash_conjunto,
+    calcular_meses,
+    meses_das_planilhas,
+    periodos_calculados,
+    gravar_snapshot,
+)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PESOS_PATH = DATA_DIR / "pesos_analistas.json"
+EMPRESA_INDICADORES_PATH = DATA_DIR / "empresa_indicadores_analistas.json"
+SNAPSHOT_DIR = DATA_DIR / "snapshot"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Gera o snapshot pré-calculado do painel de bônus.")
+    parser.add_argument("--planilha", type=Path, action="append", default=None,
+                        help="xlsx de origem; pode repetir (padrão: data/RESUMO PARA PAINEL - ANALISTAS*.xlsx)")
+    parser.add_argument("--pesos", type=Path, default=PESOS_PATH, help="pesos_analistas.json")
+    parser.add_argument("--mascara", type=Path, default=EMPRESA_INDICADORES_PATH,
+                        help="empresa_indicadores_analistas.json (opcional; ausente = todos os indicadores valem)")
+    parser.add_argument("--saida", type=Path, default=SNAPSHOT_DIR, help="pasta do snapshot (padrão: data/snapshot)")
+    parser.add_argument("--trabalhadores", type=int, default=None,
+                        help="processos para calcular os meses (padrão: BONUS_TRABALHADORES ou um por núcleo "
+                             "em planilhas grandes; 1 = serial)")
+    args = parser.parse_args(argv)
+    if args.trabalhadores is not None and args.trabalhadores < 1:
+        parser.error("--trabalhadores precisa ser >= 1")
+
+    inicio = time.perf_counter()
+    try:
+        config = carregar_config(args.pesos, args.mascara)
+        planilhas = args.planilha or exigir_planilhas(DATA_DIR)
+        calculados = calcular_meses(meses_das_planilhas(planilhas), config, args.trabalhadores)
+        bases = periodos_calculados(calculados)
+    except PlanilhaInvalida as e:
+        print(f"erro: {e}", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"erro ao ler entradas: {e}", file=sys.stderr)
+        return 1
+
+    manifesto = gravar_snapshot(
+        args.saida,
+        bases,
+        planilha={
+            "arquivos": [Path(p).name for p in planilhas],
+            "sha256": hash_conjunto([hash_arquivo(p) for p in planilhas]),
+        },
+        pesos=config["versao"],
+    )
+
+    for periodo, info in manifesto["periodos"].items():
+        print(f"{periodo:<10} {info['linhas']:>7} linhas  -> {info['arquivo']}")
+    print(f"snapshot gravado em {args.saida} ({time.perf_counter() - inicio:.2f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
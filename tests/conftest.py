@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# o pacote bonus vive em app/ (sem instalação): os testes importam de lá
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ / "app"))
+
+from bonus import load_json, compilar_indicadores  # noqa: E402
+
+@pytest.fixture
+def pesos() -> dict:
+    return load_json(RAIZ / "data" / "pesos_analistas.json")
+
+@pytest.fixture
+def indicadores(pesos) -> list:
+    return compilar_indicadores(pesos)
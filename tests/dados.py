@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Abas sintéticas no formato da planilha, com os valores "sujos" que
+# aparecem nela: flags SIM/NÃO/1/0/vazio/bool, META como texto, licença,
+# EMPRESA vazia e funções que não são ANALISTA.
+import numpy as np
+import pandas as pd
+
+COLUNAS_BATEU = ["BATEU_PRODUCAO", "BATEU_TMG_GERAL", "BATEU_TMA_ANALISTA", "BATEU_TEMPO_FILA", "BATEU_CONFORMIDADE"]
+FLAGS = ["SIM", "NÃO", "Sim", "nao", 1, 0, 1.0, 0.0, None, float("nan"), "", True, False, "s", "n", "ok", "2", "x"]
+METAS = [400, "400", "350.5", 0, None, float("nan"), 500.0, "0", " 250 "]
+OBSERVACOES = ["", None, "Licença maternidade", "LICENCA", "férias", "nan", "  atestado  "]
+EMPRESAS = ["LOG", None, "TOKYO", "Velox", float("nan")]
+FUNCOES = ["ANALISTA", "Analista", " analista ", "COORDENADOR", "Análista"]
+
+def aba_mista(n: int = 200, semente: int = 0, emails: list = None) -> pd.DataFrame:
+    rng = np.random.default_rng(semente)
+    escolher = lambda valores: [valores[i] for i in rng.integers(0, len(valores), n)]
+    aba = pd.DataFrame({
+        "EMAIL": emails if emails is not None else [f"  Pessoa{i}@Empresa.com " for i in range(n)],
+        "NOME": [f"PESSOA {i}" for i in range(n)],
+        "FUNÇÃO": escolher(FUNCOES),
+        "EMPRESA": escolher(EMPRESAS),
+        "VALOR MENSAL META": escolher(METAS),
+        "OBSERVAÇÃO": escolher(OBSERVACOES),
+    }, dtype=object)
+    for coluna in COLUNAS_BATEU:
+        aba[coluna] = pd.Series(escolher(FLAGS), dtype=object)
+    return aba
+
+def gravar_pasta(caminho, abas: dict):
+    # {nome da aba: DataFrame} -> xlsx (vazios gravados como célula vazia)
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for nome, aba in abas.items():
+        aba = aba.astype(object)
+        ws = wb.create_sheet(nome)
+        ws.append(list(aba.columns))
+        for linha in aba.where(aba.notna(), None).itertuples(index=False, name=None):
+            ws.append(list(linha))
+    wb.save(caminho)
+    return caminho
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+
+from bonus import indexar_nomes, buscar_nomes
+
+NOMES = pd.Series(["MARA SILVA", "JOÃO RAMOS", "ANA PAULA", "MARA SILVA", "RAFAEL", None])
+
+def _contains(consulta: str) -> list:
+    # filtro original do painel: trecho em qualquer parte, sem caixa
+    return [i for i, n in enumerate(NOMES) if isinstance(n, str) and consulta.lower() in n.lower()]
+
+def test_busca_por_trecho_como_o_contains_original():
+    indice = indexar_nomes(NOMES)
+    for consulta in ["ra", "a", "ma", "ara", "silva", "amos", "x", "ul"]:
+        assert list(buscar_nomes(indice, consulta)) == _contains(consulta), consulta
+
+def test_busca_ignora_acento_e_espacos():
+    indice = indexar_nomes(NOMES)
+    assert list(buscar_nomes(indice, " joao ")) == [1]
+    assert list(buscar_nomes(indice, "jo")) == [1]
+    assert len(buscar_nomes(indice, "")) == len(NOMES)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# cache LRU por processo: despejo, contadores e um cálculo por chave
+import threading
+import time
+
+import pytest
+
+from bonus import criar_cache, no_cache, guardar, info_cache, tem_chave, bytes_da_chave
+
+def test_despeja_o_menos_usado():
+    cache = criar_cache(2)
+    no_cache(cache, "a", lambda: 1)
+    no_cache(cache, "b", lambda: 2)
+    assert no_cache(cache, "a", lambda: -1) == 1   # "a" volta a ser a mais recente
+    no_cache(cache, "c", lambda: 3)
+    assert tem_chave(cache, "a") and tem_chave(cache, "c")
+    assert not tem_chave(cache, "b")
+    assert info_cache(cache)["entradas"] == 2
+
+def test_contadores_e_bytes():
+    cache = criar_cache(1, tamanho=len)
+    no_cache(cache, "a", lambda: "xyz")
+    no_cache(cache, "a", lambda: "")
+    guardar(cache, "b", "12345")
+    info = info_cache(cache)
+    assert (info["hits"], info["misses"], info["entradas"]) == (1, 2, 1)
+    # "a" saiu junto com o tamanho dela
+    assert bytes_da_chave(cache, "a") is None and info["bytes"] == bytes_da_chave(cache, "b") == 5
+
+def test_um_calculo_por_chave_entre_threads():
+    cache = criar_cache(8)
+    chamadas = {"x": 0, "y": 0}
+    largada = threading.Barrier(8)
+
+    def calcular(chave):
+        chamadas[chave] += 1
+        time.sleep(0.05)
+        return chave.upper()
+
+    resultados = []
+    def pedir(chave):
+        largada.wait()
+        resultados.append(no_cache(cache, chave, lambda: calcular(chave)))
+
+    threads = [threading.Thread(target=pedir, args=("xy"[i % 2],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert chamadas == {"x": 1, "y": 1}
+    assert sorted(resultados) == ["X"] * 4 + ["Y"] * 4
+    assert info_cache(cache)["misses"] == 2 and info_cache(cache)["hits"] == 6
+
+def test_erro_no_calculo_nao_fica_no_cache():
+    cache = criar_cache(2)
+    def falhar():
+        raise RuntimeError("planilha")
+    with pytest.raises(RuntimeError):
+        no_cache(cache, "a", falhar)
+    assert not tem_chave(cache, "a")
+    assert no_cache(cache, "a", lambda: 1) == 1
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# calcula_mes vetorizado x o cálculo linha a linha original (df.apply), que
+# fica aqui como referência
+import numpy as np
+import pandas as pd
+import pytest
+
+from bonus import up, norm_email, texto_obs, bool_safe, elegivel, calcula_mes
+from tests.dados import aba_mista
+
+# item de "metas" -> (coluna BATEU_*, rótulo), como no app original
+_ITENS_ORIGINAIS = [
+    (["PRODUÇÃO", "PRODUCAO"], "BATEU_PRODUCAO", "Produção"),
+    (["TEMPO MÉDIO GERAL DE ANÁLISE", "TEMPO MEDIO GERAL DE ANALISE"], "BATEU_TMG_GERAL", "Tempo Médio Geral de Análise"),
+    (["TEMPO MÉDIO DE ANÁLISE DO ANALISTA", "TEMPO MEDIO DE ANALISE DO ANALISTA"], "BATEU_TMA_ANALISTA",
+     "Tempo Médio do Analista"),
+    (["TEMPO MÉDIO DA FILA", "TEMPO MEDIO DA FILA"], "BATEU_TEMPO_FILA", "Tempo Médio da Fila"),
+    (["CONFORMIDADE"], "BATEU_CONFORMIDADE", "Conformidade"),
+]
+
+def calcula_mes_linha(df_mes: pd.DataFrame, nome_mes: str, pesos: dict) -> pd.DataFrame:
+    df = df_mes.copy()
+    df["EMAIL"] = df["EMAIL"].apply(norm_email)
+    df = df[df["FUNÇÃO"].astype(str).apply(up) == up("ANALISTA")].copy()
+    itens = pesos.get(up("ANALISTA"), {}).get("metas", {})
+
+    def calcula_recebido(row):
+        obs = row.get("OBSERVAÇÃO", "")
+        valor_meta = row.get("VALOR MENSAL META", 0)
+        ok, motivo = elegivel(valor_meta, obs)
+        perdeu_itens = []
+        if not ok:
+            return pd.Series({
+                "MES": nome_mes, "META": 0.0, "RECEBIDO": 0.0, "PERDA": 0.0, "%": 0.0,
+                "_badge": motivo, "_obs": texto_obs(obs), "perdeu_itens": perdeu_itens
+            })
+        total_func = float(valor_meta if pd.notna(valor_meta) else 0.0)
+        recebido, perdas = 0.0, 0.0
+        for item, peso in itens.items():
+            parcela = total_func * float(peso)
+            for nomes, coluna, rotulo in _ITENS_ORIGINAIS:
+                if up(item) in [up(n) for n in nomes]:
+                    if bool_safe(row.get(coluna), True):
+                        recebido += parcela
+                    else:
+                        perdas += parcela
+                        perdeu_itens.append(rotulo)
+                    break
+            else:
+                recebido += parcela
+        perc = 0.0 if total_func == 0 else (recebido / total_func) * 100.0
+        return pd.Series({
+            "MES": nome_mes, "META": total_func, "RECEBIDO": recebido, "PERDA": perdas, "%": perc,
+            "_badge": "", "_obs": texto_obs(obs), "perdeu_itens": perdeu_itens
+        })
+
+    calc = df.apply(calcula_recebido, axis=1)
+    return pd.concat([df.reset_index(drop=True), calc.reset_index(drop=True)], axis=1)
+
+def _texto(s: pd.Series) -> list:
+    return [None if pd.isna(v) else str(v) for v in s.astype(object)]
+
+@pytest.mark.parametrize("semente", [0, 1, 2])
+def test_calcula_mes_igual_ao_linha_a_linha(pesos, indicadores, semente):
+    aba = aba_mista(300, semente)
+    esperado = calcula_mes_linha(aba, "JANEIRO", pesos)
+    obtido = calcula_mes(aba, "JANEIRO", indicadores)
+
+    assert len(obtido) == len(esperado) > 0
+    for coluna in ["META", "RECEBIDO", "PERDA", "%"]:
+        np.testing.assert_allclose(obtido[coluna].to_numpy(float), esperado[coluna].to_numpy(float), rtol=1e-12)
+    for coluna in ["EMAIL", "NOME", "EMPRESA", "MES", "_badge", "_obs"]:
+        assert _texto(obtido[coluna]) == _texto(esperado[coluna]), coluna
+    assert list(obtido["perdeu_itens"]) == list(esperado["perdeu_itens"])
+
+def test_calcula_mes_casos_de_borda(indicadores):
+    aba = aba_mista(9)
+    aba["FUNÇÃO"] = "ANALISTA"
+    aba["OBSERVAÇÃO"] = ["", "Licença", "", "", "", "", "", "", ""]
+    aba["EMPRESA"] = [None, "LOG", "LOG", "LOG", "LOG", "LOG", "LOG", "LOG", "LOG"]
+    aba["VALOR MENSAL META"] = ["400", 400, "0", None, 400, 400, 400, 400, 400]
+    flags = [True, True, True, True, "NÃO", 0, "", float("nan"), "n"]
+    for coluna in ["BATEU_PRODUCAO", "BATEU_TMG_GERAL", "BATEU_TMA_ANALISTA", "BATEU_TEMPO_FILA", "BATEU_CONFORMIDADE"]:
+        aba[coluna] = pd.Series(flags, dtype=object)
+    out = calcula_mes(aba, "MARÇO", indicadores)
+
+    # META em texto vale como número; EMPRESA vazia continua vazia
+    assert out.loc[0, "META"] == out.loc[0, "RECEBIDO"] == 400.0
+    assert pd.isna(out.loc[0, "EMPRESA"])
+    assert list(out["_badge"][1:4]) == ["Licença no mês", "Sem elegibilidade no mês", "Sem elegibilidade no mês"]
+    assert (out["META"][1:4] == 0).all()
+    # NÃO / 0 / "n" perdem tudo; vazio e NaN contam como batida
+    assert list(out["PERDA"][4:]) == [400.0, 400.0, 0.0, 0.0, 400.0]
+    assert out.loc[4, "perdeu_itens"] == [ind["rotulo"] for ind in indicadores]
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# cubo de perdas (empresa x mês x indicador) x PERDA da base de cada mês, e
+# os recortes por período e empresa
+import pandas as pd
+import pytest
+
+from bonus import MESES_ANO, calcula_mes, cubo_do_mes, juntar_cubos, fatiar_cubo
+from bonus.calculo import SEM_EMPRESA
+from tests.dados import aba_mista
+
+MESES = ["JANEIRO", "FEVEREIRO", "MARÇO", "ABRIL"]
+
+@pytest.fixture
+def meses(indicadores) -> dict:
+    return {mes: calcula_mes(aba_mista(150, k), mes, indicadores) for k, mes in enumerate(MESES)}
+
+@pytest.fixture
+def cubo(meses, indicadores) -> pd.DataFrame:
+    return juntar_cubos([cubo_do_mes(meses[m], m, indicadores) for m in MESES], indicadores)
+
+def _perda_da_base(meses: dict) -> pd.Series:
+    base = pd.concat([d.assign(MES=m) for m, d in meses.items()], ignore_index=True)
+    base["EMPRESA"] = base["EMPRESA"].astype(object).fillna(SEM_EMPRESA)
+    perda = base.groupby(["MES", "EMPRESA"])["PERDA"].sum()
+    return perda[perda > 0]
+
+def test_totais_por_mes_e_empresa(meses, cubo):
+    assert SEM_EMPRESA in set(cubo["EMPRESA"])
+    obtido = cubo.groupby(["MES", "EMPRESA"], observed=True)["PERDA"].sum()
+    obtido.index = obtido.index.set_levels([lvl.astype(object) for lvl in obtido.index.levels])
+    esperado = _perda_da_base(meses)
+    pd.testing.assert_series_equal(obtido.sort_index(), esperado.sort_index(), check_names=False,
+                                   check_index_type=False, rtol=1e-9)
+    # o pivot do painel não perde as linhas sem empresa
+    grafico = cubo.pivot_table(index="INDICADOR", columns="EMPRESA", values="PERDA", aggfunc="sum",
+                               fill_value=0.0, observed=True)
+    assert grafico.to_numpy().sum() == pytest.approx(esperado.sum())
+
+def test_analistas_por_indicador(meses, cubo):
+    janeiro = meses["JANEIRO"]
+    for rotulo in cubo["INDICADOR"].cat.categories:
+        perderam = janeiro["perdeu_itens"].map(lambda L: rotulo in L).sum()
+        linhas = cubo[(cubo["MES"] == "JANEIRO") & (cubo["INDICADOR"] == rotulo)]
+        assert linhas["ANALISTAS"].sum() == perderam, rotulo
+
+def test_recortes(meses, cubo):
+    t1 = fatiar_cubo(cubo, "T1")
+    assert set(t1["MES"].astype(str)) == {"JANEIRO", "FEVEREIRO", "MARÇO"}
+    assert t1["PERDA"].sum() == pytest.approx(sum(meses[m]["PERDA"].sum() for m in MESES[:3]))
+    assert set(fatiar_cubo(cubo, "ACUMULADO")["MES"].astype(str)) == set(MESES)
+    assert fatiar_cubo(cubo, "MAIO").empty
+
+    log = fatiar_cubo(cubo, "FEVEREIRO", "LOG")
+    assert set(log["MES"].astype(str)) == {"FEVEREIRO"} and set(log["EMPRESA"].astype(str)) == {"LOG"}
+    fevereiro = meses["FEVEREIRO"]
+    assert log["PERDA"].sum() == pytest.approx(fevereiro.loc[fevereiro["EMPRESA"].astype(object) == "LOG", "PERDA"].sum())
+    sem = fatiar_cubo(cubo, "T2", SEM_EMPRESA)
+    assert sem["PERDA"].sum() == pytest.approx(meses["ABRIL"].loc[meses["ABRIL"]["EMPRESA"].isna(), "PERDA"].sum())
+    assert list(cubo["MES"].cat.categories) == MESES_ANO
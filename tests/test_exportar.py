@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+from bonus import calcula_mes, compilar_mascaras, periodos_calculados, blocos_folha, blocos_indicadores
+from tests.dados import aba_mista
+
+def test_indicadores_nao_entregues_somam_a_perda_da_folha(indicadores):
+    config = {"indicadores": indicadores,
+              "mascaras": compilar_mascaras({"FEVEREIRO": {"conformidade": False}}, indicadores, "zerar")}
+    calculados = {mes: calcula_mes(aba_mista(120, k), mes, indicadores, config["mascaras"])
+                  for k, mes in enumerate(["JANEIRO", "FEVEREIRO"])}
+    bases = periodos_calculados(calculados)
+
+    folha = pd.concat(blocos_folha(bases, 50))
+    longo = pd.concat(blocos_indicadores(bases, config, 50))
+    assert list(longo.columns[-2:]) == ["INDICADOR", "PERDA"]
+    # desligado no mês: não aparece como perdido
+    assert not ((longo["MES"] == "FEVEREIRO") & (longo["INDICADOR"] == "Conformidade")).any()
+
+    meses = folha[folha["PERIODO"].isin(list(calculados))]
+    esperado = meses.groupby(["PERIODO", "EMAIL"])["PERDA"].sum()
+    obtido = longo.groupby(["MES", "EMAIL"])["PERDA"].sum().reindex(esperado.index, fill_value=0.0)
+    np.testing.assert_allclose(obtido.to_numpy(), esperado.to_numpy())
+    # cada linha traz o nome do próprio analista
+    nomes = meses.set_index(["PERIODO", "EMAIL"])["NOME"]
+    assert (longo.set_index(["MES", "EMAIL"])["NOME"] == nomes.reindex(list(zip(longo["MES"], longo["EMAIL"])))).all()
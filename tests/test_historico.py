@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# histórico SQLite: janela dos últimos trimestres (inclusive na virada do
+# ano), regravação de um mês e filtro por empresa, contra perda_por_item
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+import pytest
+
+from bonus import (
+    MESES_ANO, PlanilhaInvalida, calcula_mes, carregar_config, perda_por_item,
+    gravar_meses, meses_gravados, historico_analista, empresas_gravadas, perdas_por_indicador,
+)
+from tests.conftest import RAIZ
+from tests.dados import aba_mista
+
+@pytest.fixture
+def config() -> dict:
+    return carregar_config(RAIZ / "data" / "pesos_analistas.json", RAIZ / "data" / "empresa_indicadores_analistas.json")
+
+def _mes(config, mes, semente, n=60):
+    return calcula_mes(aba_mista(n, semente), mes, config["indicadores"], config["mascaras"])
+
+def _esperado(config, gravados: dict, empresa=None) -> pd.DataFrame:
+    # {(ano, mês): calcula_mes} -> perda por empresa, ano, trimestre e indicador
+    partes = []
+    for (ano, mes), dados in gravados.items():
+        longo = perda_por_item(dados, mes, config["indicadores"], config["mascaras"])
+        partes.append(longo.assign(ANO=ano, TRIMESTRE=f"T{MESES_ANO.index(mes) // 3 + 1}"))
+    longo = pd.concat(partes, ignore_index=True)
+    longo = longo[longo["EMPRESA"].notna() & (longo["EMPRESA"] != "")] if empresa is None else longo[longo["EMPRESA"] == empresa]
+    return (longo.groupby(["EMPRESA", "ANO", "TRIMESTRE", "INDICADOR"])
+            .agg(PERDA=("PERDA", "sum"), ANALISTAS_COM_PERDA=("EMAIL", "nunique")).reset_index())
+
+def _com_empresa(perdas: pd.DataFrame) -> pd.DataFrame:
+    # linhas sem empresa ficam num grupo NULL à parte
+    return perdas[perdas["EMPRESA"].notna()].reset_index(drop=True)
+
+def _comparar(obtido: pd.DataFrame, esperado: pd.DataFrame):
+    obtido = obtido.sort_values(["EMPRESA", "ANO", "TRIMESTRE", "INDICADOR"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False, check_exact=False, rtol=1e-9)
+
+def test_janela_de_trimestres_na_virada_do_ano(tmp_path, config):
+    banco = tmp_path / "historico.sqlite"
+    gravados = {
+        (2024, "JULHO"): _mes(config, "JULHO", 1),
+        (2024, "NOVEMBRO"): _mes(config, "NOVEMBRO", 2),
+        (2024, "DEZEMBRO"): _mes(config, "DEZEMBRO", 3),
+        (2025, "FEVEREIRO"): _mes(config, "FEVEREIRO", 4),
+    }
+    for (ano, mes), dados in gravados.items():
+        gravar_meses(banco, ano, {mes: dados}, config, "x.xlsx")
+
+    # últimos 2 trimestres: T1/2025 e T4/2024 (T3/2024 fica de fora)
+    dois = _com_empresa(perdas_por_indicador(banco, 2))
+    assert set(zip(dois["ANO"], dois["TRIMESTRE"])) == {(2024, "T4"), (2025, "T1")}
+    _comparar(dois, _esperado(config, {k: v for k, v in gravados.items() if k[1] != "JULHO"}))
+
+    _comparar(_com_empresa(perdas_por_indicador(banco, 3)), _esperado(config, gravados))
+    assert set(perdas_por_indicador(banco, 1)["TRIMESTRE"]) == {"T1"}
+
+def test_regravar_um_mes_substitui(tmp_path, config):
+    banco = tmp_path / "historico.sqlite"
+    fevereiro = _mes(config, "FEVEREIRO", 2)
+    gravar_meses(banco, 2025, {"JANEIRO": _mes(config, "JANEIRO", 1, 80), "FEVEREIRO": fevereiro}, config, "a.xlsx")
+    novo = _mes(config, "JANEIRO", 9, 40)
+    assert gravar_meses(banco, 2025, {"JANEIRO": novo}, config, "b.xlsx") == {"JANEIRO": len(novo)}
+
+    meses = meses_gravados(banco)
+    assert list(zip(meses["MES"], meses["ARQUIVO"], meses["ANALISTAS"])) == [("JANEIRO", "b.xlsx", len(novo)),
+                                                                          ("FEVEREIRO", "a.xlsx", len(fevereiro))]
+    with closing(sqlite3.connect(banco)) as con:
+        for tabela, linhas in [("resultados", len(novo)), ("perdas", int(novo["perdeu_itens"].map(len).sum()))]:
+            assert con.execute(f"SELECT COUNT(*) FROM {tabela} WHERE ano = 2025 AND mes = 1").fetchone()[0] == linhas
+    # só as linhas novas de janeiro: o mesmo e-mail aparece uma vez por mês
+    email = novo["EMAIL"].astype(str).iloc[0]
+    historico = historico_analista(banco, email)
+    assert list(historico["MES"]) == ["FEVEREIRO", "JANEIRO"]
+    assert historico["META"].iloc[1] == pytest.approx(float(novo["META"].iloc[0]))
+    _comparar(_com_empresa(perdas_por_indicador(banco, 1)),
+              _esperado(config, {(2025, "JANEIRO"): novo, (2025, "FEVEREIRO"): fevereiro}))
+
+def test_filtro_por_empresa(tmp_path, config):
+    banco = tmp_path / "historico.sqlite"
+    gravados = {(2025, "ABRIL"): _mes(config, "ABRIL", 5), (2025, "MAIO"): _mes(config, "MAIO", 6)}
+    for (ano, mes), dados in gravados.items():
+        gravar_meses(banco, ano, {mes: dados}, config)
+    assert empresas_gravadas(banco) == ["LOG", "TOKYO", "Velox"]
+    tokyo = perdas_por_indicador(banco, 4, "TOKYO")
+    assert set(tokyo["EMPRESA"]) == {"TOKYO"}
+    _comparar(tokyo, _esperado(config, gravados, "TOKYO"))
+
+def test_sem_banco_e_ano_invalido(tmp_path, config):
+    banco = tmp_path / "nao_existe.sqlite"
+    assert perdas_por_indicador(banco).empty and meses_gravados(banco).empty
+    assert historico_analista(banco, "a@b").empty
+    assert not banco.exists()
+    with pytest.raises(PlanilhaInvalida):
+        gravar_meses(banco, 1999, {"JANEIRO": _mes(config, "JANEIRO", 1)}, config)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# indicadores desligados no mês (empresa_indicadores_analistas.json) com as
+# políticas "renormalizar" e "zerar" do pesos_analistas.json
+import numpy as np
+import pandas as pd
+import pytest
+
+from bonus import calcula_mes, compilar_mascaras, politica_desligado
+from tests.dados import COLUNAS_BATEU
+
+def _aba(flags: list) -> pd.DataFrame:
+    # uma linha por analista; flags = colunas BATEU_* (na ordem dos pesos)
+    aba = pd.DataFrame({
+        "EMAIL": [f"a{i}@x.com" for i in range(len(flags))],
+        "NOME": [f"A{i}" for i in range(len(flags))],
+        "FUNÇÃO": "ANALISTA",
+        "EMPRESA": "LOG",
+        "VALOR MENSAL META": 400.0,
+    })
+    for j, coluna in enumerate(COLUNAS_BATEU):
+        aba[coluna] = [linha[j] for linha in flags]
+    return aba
+
+TUDO = ["SIM"] * 5
+SEM_PRODUCAO = ["NÃO"] + ["SIM"] * 4
+SEM_CONFORMIDADE = ["SIM"] * 4 + ["NÃO"]
+
+def test_politica_padrao_e_invalida(pesos):
+    assert politica_desligado(pesos) == "renormalizar"
+    with pytest.raises(ValueError):
+        politica_desligado({"ANALISTA": {"indicador_desligado": "dobrar"}})
+
+def test_renormalizar_redistribui_o_peso_desligado(indicadores):
+    mascaras = compilar_mascaras({"FEVEREIRO": {"conformidade": False}}, indicadores, "renormalizar")
+    out = calcula_mes(_aba([TUDO, SEM_PRODUCAO, SEM_CONFORMIDADE]), "FEVEREIRO", indicadores, mascaras)
+
+    # conformidade (0,30) desligada: os outros pesos somam 1 de novo
+    np.testing.assert_allclose(mascaras["FEVEREIRO"]["pesos"].sum(), 1.0)
+    np.testing.assert_allclose(out["META"], [400.0] * 3)
+    np.testing.assert_allclose(out["RECEBIDO"], [400.0, 400.0 - 400 * 0.25 / 0.70, 400.0])
+    np.testing.assert_allclose(out["RECEBIDO"] + out["PERDA"], out["META"])
+    # desligado não conta como perdido, mesmo com NÃO na planilha
+    assert list(out["perdeu_itens"]) == [[], ["Produção"], []]
+
+def test_zerar_tira_o_peso_da_meta(indicadores):
+    mascaras = compilar_mascaras({"FEVEREIRO": {"conformidade": False}}, indicadores, "zerar")
+    out = calcula_mes(_aba([TUDO, SEM_PRODUCAO, SEM_CONFORMIDADE]), "FEVEREIRO", indicadores, mascaras)
+
+    np.testing.assert_allclose(out["META"], [280.0] * 3)
+    np.testing.assert_allclose(out["RECEBIDO"], [280.0, 180.0, 280.0])
+    np.testing.assert_allclose(out["PERDA"], [0.0, 100.0, 0.0])
+    np.testing.assert_allclose(out["%"], [100.0, 180.0 / 280.0 * 100.0, 100.0])
+    assert list(out["perdeu_itens"]) == [[], ["Produção"], []]
+
+@pytest.mark.parametrize("politica", ["renormalizar", "zerar"])
+def test_mes_fora_da_mascara_e_todos_desligados(indicadores, politica):
+    todos = {ind["chave"]: False for ind in indicadores}
+    mascaras = compilar_mascaras({"MARÇO": todos, "Fevereiro": {"producao": "sim"}}, indicadores, politica)
+    aba = _aba([TUDO, SEM_PRODUCAO])
+
+    # mês sem entrada e mês com tudo ligado: pesos originais
+    sem_mascara = calcula_mes(aba, "JANEIRO", indicadores, mascaras)
+    ligado = calcula_mes(aba, "FEVEREIRO", indicadores, mascaras)
+    for out in (sem_mascara, ligado):
+        np.testing.assert_allclose(out["RECEBIDO"], [400.0, 300.0])
+
+    # tudo desligado: nada a pagar nem a perder
+    out = calcula_mes(aba, "MARÇO", indicadores, mascaras)
+    np.testing.assert_allclose(out[["META", "RECEBIDO", "PERDA", "%"]].to_numpy(float), 0.0)
+
+def test_mes_invalido_na_mascara(indicadores):
+    with pytest.raises(ValueError):
+        compilar_mascaras({"TREZEMBRO": {"producao": False}}, indicadores, "zerar")
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from bonus import iniciar_medicao, encerrar_medicao, etapa
+
+def test_registros_simultaneos_com_perfil(monkeypatch, tmp_path):
+    # carga do vigia e rerun ao mesmo tempo: só um cProfile por processo
+    monkeypatch.setenv("BONUS_PERFIL_DIR", str(tmp_path))
+    carga = iniciar_medicao("carga")
+    registros = {}
+
+    def rerun():
+        registro = iniciar_medicao("rerun")
+        with etapa("filtro"):
+            pass
+        registros["rerun"] = encerrar_medicao(registro)
+
+    t = threading.Thread(target=rerun)
+    t.start()
+    t.join()
+    encerrar_medicao(carga)
+
+    assert registros["rerun"]["etapas"][0]["etapa"] == "filtro"
+    assert "perfil" not in registros["rerun"]
+    assert (tmp_path / carga["perfil"]).exists()
+    # perfil liberado: o próximo registro volta a ter o seu
+    assert "perfil" in encerrar_medicao(iniciar_medicao("depois"))
+
+def test_outro_profiler_ativo(monkeypatch, tmp_path):
+    # Python 3.12+: enable() com outra ferramenta ativa levanta ValueError
+    import cProfile
+
+    class Ocupado(cProfile.Profile):
+        def enable(self, *args, **kwargs):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setenv("BONUS_PERFIL_DIR", str(tmp_path))
+    monkeypatch.setattr(cProfile, "Profile", Ocupado)
+    registro = encerrar_medicao(iniciar_medicao("rerun"))
+    assert "perfil" not in registro and registro["total_ms"] is not None
+    monkeypatch.undo()
+    monkeypatch.setenv("BONUS_PERFIL_DIR", str(tmp_path))
+    assert "perfil" in encerrar_medicao(iniciar_medicao("depois"))
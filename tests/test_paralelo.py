@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# meses calculados num pool de processos x o cálculo serial
+import logging
+
+import pandas as pd
+
+from bonus import carregar_config, calcular_meses, meses_das_planilhas
+from bonus.paralelo import _calcular_serial
+from tests.conftest import RAIZ
+from tests.dados import aba_mista, gravar_pasta
+
+def test_pool_igual_ao_serial(tmp_path, caplog):
+    caminho = gravar_pasta(tmp_path / "meses.xlsx",
+                           {mes: aba_mista(120, k) for k, mes in enumerate(["JANEIRO", "FEVEREIRO", "MARÇO"])})
+    config = carregar_config(RAIZ / "data" / "pesos_analistas.json",
+                             RAIZ / "data" / "empresa_indicadores_analistas.json")
+    origens = meses_das_planilhas([caminho])
+
+    with caplog.at_level(logging.WARNING, logger="bonus.paralelo"):
+        paralelo = calcular_meses(origens, config, trabalhadores=2)
+    # sem cair no serial por pool quebrado
+    assert not caplog.records
+    serial = _calcular_serial(origens, config)
+    assert list(paralelo) == list(serial) == ["JANEIRO", "FEVEREIRO", "MARÇO"]
+    for mes in serial:
+        pd.testing.assert_frame_equal(paralelo[mes], serial[mes])
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# trimestres e acumulado montados combinando parciais (prefixos reaproveitados)
+# x recálculo completo: concatena os meses do período e agrupa de uma vez,
+# como o montar_base original fazia para o trimestre
+import numpy as np
+import pandas as pd
+import pytest
+
+from bonus import MESES_ANO, TRIMESTRES, ACUMULADO, calcula_mes, periodos_calculados, meses_do_periodo
+from bonus.calculo import GRUPO_COLS
+from tests.dados import aba_mista
+
+def _meses(indicadores, meses=MESES_ANO) -> dict:
+    rng = np.random.default_rng(7)
+    pessoas = [f"pessoa{i}@empresa.com" for i in range(80)]
+    calculados = {}
+    for k, mes in enumerate(meses):
+        # cada mês tem só parte das pessoas (admissões/desligamentos)
+        emails = sorted(rng.choice(pessoas, 60, replace=False))
+        aba = aba_mista(60, k, emails=emails)
+        aba["NOME"] = [e.split("@")[0].upper() for e in emails]
+        aba["EMPRESA"] = [("LOG", "TOKYO", None)[int(e[6:].split("@")[0]) % 3] for e in emails]
+        calculados[mes] = calcula_mes(aba, mes, indicadores)
+    return calculados
+
+def recalcular(calculados: dict, meses: list) -> pd.DataFrame:
+    full = pd.concat([calculados[m] for m in meses], ignore_index=True)
+    full = full.apply(lambda s: s.astype(object) if isinstance(s.dtype, pd.CategoricalDtype) else s)
+    grupo = [c for c in GRUPO_COLS if c in full.columns]
+    juntar = lambda sep: (lambda x: sep.join(sorted({s for s in x if s})))
+    agg = full.groupby(grupo, dropna=False).agg(
+        META=("META", "sum"), RECEBIDO=("RECEBIDO", "sum"), PERDA=("PERDA", "sum"),
+        _obs=("_obs", juntar(", ")), _badge=("_badge", juntar(" / ")),
+    ).reset_index()
+    perdidos = (
+        full.assign(_lost=[[f"{it} ({m})" for it in L] for L, m in zip(full["perdeu_itens"], full["MES"])])
+        .groupby(grupo, dropna=False)["_lost"].sum()
+        .apply(lambda L: ", ".join(sorted(set(L))))
+        .rename("INDICADORES_NAO_ENTREGUES").reset_index()
+    )
+    out = agg.merge(perdidos, on=grupo, how="left")
+    out["%"] = np.where(out["META"] == 0, 0.0, out["RECEBIDO"] / out["META"].where(out["META"] != 0, 1.0) * 100.0)
+    return out
+
+def _por_email(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.apply(lambda s: s.astype(object) if isinstance(s.dtype, pd.CategoricalDtype) else s)
+    return df.set_index(df["EMAIL"].astype(str) + "|" + df["EMPRESA"].astype(str)).sort_index()
+
+@pytest.mark.parametrize("meses", [MESES_ANO, MESES_ANO[:5], ["JANEIRO", "MARÇO", "AGOSTO"]])
+def test_periodos_combinados_igual_ao_recalculo(indicadores, meses):
+    calculados = _meses(indicadores, meses)
+    bases = periodos_calculados(calculados)
+    agregados = [p for p in bases if p in TRIMESTRES or p == ACUMULADO]
+    assert agregados
+
+    for periodo in agregados:
+        obtido = _por_email(bases[periodo])
+        esperado = _por_email(recalcular(calculados, meses_do_periodo(periodo, list(calculados))))
+        assert list(obtido.index) == list(esperado.index), periodo
+        for coluna in ["META", "RECEBIDO", "PERDA", "%"]:
+            np.testing.assert_allclose(obtido[coluna].to_numpy(float), esperado[coluna].to_numpy(float),
+                                       rtol=1e-12, err_msg=f"{periodo} {coluna}")
+        for coluna in ["NOME", "_obs", "_badge", "INDICADORES_NAO_ENTREGUES"]:
+            assert list(obtido[coluna]) == list(esperado[coluna]), f"{periodo} {coluna}"
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# leitura do xlsx em streaming (_ler_aba_xlsx) x pd.read_excel e x openpyxl
+# read_only, ambos seguidos do mesmo recorte e de compactar_aba
+import datetime as dt
+
+import openpyxl
+import pandas as pd
+import pytest
+from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.cell.cell import ERROR_CODES
+from openpyxl.cell.text import InlineFont
+
+from bonus.planilha import TEXTOS_VAZIOS
+from bonus import up, ler_abas, compactar_aba, mes_da_aba, colunas_lidas, impressoes_abas, FUNCAO_PAINEL
+from tests.dados import aba_mista, gravar_pasta
+
+def _pandas(caminho, colunas=None, funcao=None) -> dict:
+    # leitura completa do read_excel, com o mesmo recorte de colunas/função
+    abas = {}
+    with pd.ExcelFile(caminho) as xls:
+        for nome in xls.sheet_names:
+            mes = mes_da_aba(nome)
+            if mes is None:
+                continue
+            df = xls.parse(nome).dropna(how="all")
+            if colunas is not None:
+                df = df[[c for c in df.columns if c in colunas]]
+            if funcao:
+                df = df[df["FUNÇÃO"].map(up) == up(funcao)]
+            abas[mes] = compactar_aba(df.reset_index(drop=True))
+    return abas
+
+def _openpyxl(caminho, colunas=None, funcao=None) -> dict:
+    # iter_rows(values_only=True) do modo read_only, com as conversões do
+    # read_excel: erro e textos vazios viram NaN, float inteiro vira int
+    def valor(v):
+        if isinstance(v, str) and (v in TEXTOS_VAZIOS or v in ERROR_CODES):
+            return None
+        return int(v) if isinstance(v, float) and v.is_integer() else v
+
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    abas = {}
+    try:
+        for nome in wb.sheetnames:
+            mes = mes_da_aba(nome)
+            if mes is None:
+                continue
+            linhas = [[valor(v) for v in linha] for linha in wb[nome].iter_rows(values_only=True)]
+            df = pd.DataFrame(linhas[1:], columns=linhas[0]).dropna(how="all")
+            df = df.apply(lambda s: s.astype(float) if s.isna().all() else s.where(s.notna(), float("nan")))
+            if colunas is not None:
+                df = df[[c for c in df.columns if c in colunas]]
+            if funcao:
+                df = df[df["FUNÇÃO"].map(up) == up(funcao)]
+            abas[mes] = compactar_aba(df.reset_index(drop=True))
+    finally:
+        wb.close()
+    return abas
+
+ORACULOS = pytest.mark.parametrize("oraculo", [_pandas, _openpyxl], ids=["read_excel", "openpyxl"])
+
+def _comparar(esperado: dict, obtido: dict):
+    assert list(esperado) == list(obtido)
+    for mes in esperado:
+        pd.testing.assert_frame_equal(esperado[mes], obtido[mes], check_categorical=False)
+
+@ORACULOS
+@pytest.mark.parametrize("epoca_1904", [False, True])
+def test_celulas_de_borda(tmp_path, epoca_1904, oraculo):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Janeiro "
+    if epoca_1904:
+        wb.epoch = openpyxl.utils.datetime.CALENDAR_MAC_1904
+    ws.append(["EMPRESA", "NOME", "FUNÇÃO", "DATA DE ADMISSÃO", "EXTRA", "EMAIL", "VALOR MENSAL META",
+               "BATEU_PRODUCAO", "HORA", "OBSERVAÇÃO"])
+    ws.append(["LOG", CellRichText([TextBlock(InlineFont(b=True), "JOÃO "), "SILVA"]), "ANALISTA",
+               dt.datetime(2023, 8, 7), "x", "a@b", 400.0, True, dt.time(8, 30), "#N/A"])
+    ws.append([None] * 10)
+    ws.append(["LOG", "MARIA", "ANALISTA", dt.date(2020, 1, 1), "NA", "c@d", "500", "NÃO", None, "N/A"])
+    ws.append([None, "ZÉ", "GESTOR", None, 2, "e@f", 300, 1, None, None])
+    ws.append(["LOG", "ANA", "ANALISTA", None, 3, "g@h", 12345678901234, 0, None, "x"])
+    ws["J6"].value = "#DIV/0!"
+    ws["J6"].data_type = "e"
+    wb.create_sheet("Resumo").append(["x"])
+    caminho = tmp_path / "borda.xlsx"
+    wb.save(caminho)
+
+    _comparar(oraculo(caminho), ler_abas(caminho))
+    colunas = ["NOME", "FUNÇÃO", "EMAIL", "VALOR MENSAL META", "BATEU_PRODUCAO"]
+    _comparar(oraculo(caminho, colunas, "ANALISTA"), ler_abas(caminho, colunas, "ANALISTA"))
+
+@ORACULOS
+def test_abas_mistas_com_recorte(tmp_path, indicadores, oraculo):
+    abas = {}
+    for k, nome in enumerate(["JANEIRO", "Fevereiro", "MARCO"]):
+        abas[nome] = aba_mista(150, k)
+        abas[nome].insert(3, "SEM USO", range(150))
+    caminho = gravar_pasta(tmp_path / "mistas.xlsx", abas)
+
+    _comparar(oraculo(caminho), ler_abas(caminho))
+    colunas = colunas_lidas(indicadores)
+    obtido = ler_abas(caminho, colunas, FUNCAO_PAINEL)
+    assert "SEM USO" not in obtido["JANEIRO"].columns
+    _comparar(oraculo(caminho, colunas, FUNCAO_PAINEL), obtido)
+    assert list(ler_abas(caminho, meses=["MARÇO"])) == ["MARÇO"]
+
+# ===================== IMPRESSÕES DIGITAIS =====================
+def _pasta_tres_meses(caminho, fevereiro_meta=400, marco_obs="ok"):
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for mes, meta, obs in [("JANEIRO", 400, "ok"), ("FEVEREIRO", fevereiro_meta, "ok"), ("MARÇO", 400, marco_obs)]:
+        ws = wb.create_sheet(mes)
+        ws.append(["NOME", "FUNÇÃO", "VALOR MENSAL META", "OBSERVAÇÃO"])
+        ws.append(["ANA", "ANALISTA", meta, obs])
+        ws.append(["BIA", "ANALISTA", 300, "férias"])
+    wb.save(caminho)
+    return impressoes_abas(caminho)
+
+def _mudaram(antes: dict, depois: dict) -> set:
+    assert list(antes) == list(depois)
+    return {mes for mes in antes if antes[mes] != depois[mes]}
+
+def test_editar_uma_aba_muda_so_a_impressao_dela(tmp_path):
+    caminho = tmp_path / "meses.xlsx"
+    original = _pasta_tres_meses(caminho)
+    assert list(original) == ["JANEIRO", "FEVEREIRO", "MARÇO"]
+    assert _pasta_tres_meses(caminho) == original
+
+    assert _mudaram(original, _pasta_tres_meses(caminho, fevereiro_meta=450)) == {"FEVEREIRO"}
+    # texto novo só na última aba vai para o fim da tabela de textos compartilhados
+    assert _mudaram(original, _pasta_tres_meses(caminho, marco_obs="licença")) == {"MARÇO"}
+    assert impressoes_abas(caminho, conteudo=False) == dict.fromkeys(original)
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# simulador de pesos: o cenário com os pesos atuais reproduz o calcula_mes
+# por empresa
+import numpy as np
+import pandas as pd
+
+from bonus import calcula_mes, matriz_do_mes, simular, CENARIO_ATUAL
+from bonus.simulador import SEM_EMPRESA
+from tests.dados import aba_mista
+
+def test_cenario_atual_igual_ao_calculo(indicadores):
+    dados = calcula_mes(aba_mista(300, 5), "JANEIRO", indicadores)
+    matriz = matriz_do_mes(dados, indicadores)
+    assert matriz["batido"].shape == matriz["perdido"].shape == (len(matriz["empresas"]), len(indicadores))
+    np.testing.assert_allclose(matriz["batido"] + matriz["perdido"], matriz["meta"][:, None] * np.ones(len(indicadores)))
+
+    pesos = np.array([[ind["peso"]] for ind in indicadores])
+    resultado = simular([matriz], pesos, [CENARIO_ATUAL], "renormalizar").set_index("EMPRESA")
+    esperado = (dados.assign(EMPRESA=dados["EMPRESA"].astype(object).fillna(SEM_EMPRESA))
+                .groupby("EMPRESA")[["META", "RECEBIDO", "PERDA"]].sum())
+    pd.testing.assert_frame_equal(resultado[["META", "RECEBIDO", "PERDA"]], esperado, check_names=False, rtol=1e-9)
+
+def test_sem_indicadores_e_sem_linhas(indicadores):
+    dados = calcula_mes(aba_mista(20, 1), "JANEIRO", indicadores)
+    sem_indicadores = matriz_do_mes(dados, [])
+    assert sem_indicadores["batido"].shape == (len(sem_indicadores["empresas"]), 0)
+    vazio = matriz_do_mes(dados.iloc[:0], indicadores)
+    assert vazio["empresas"] == [] and vazio["batido"].shape == (0, len(indicadores))
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# snapshot Feather: gravar/ler cada período devolve a mesma base; o manifesto
+# só vale para a mesma planilha e a mesma versão dos pesos
+import pandas as pd
+
+from bonus import montar_periodos, versao_pesos, gravar_snapshot, ler_manifesto, snapshot_vale, ler_periodo
+from tests.dados import aba_mista
+
+def _bases(indicadores) -> dict:
+    return montar_periodos({"JANEIRO": aba_mista(120, 1), "FEVEREIRO": aba_mista(120, 2)}, indicadores)
+
+def _textos(serie: pd.Series) -> list:
+    # colunas que misturam número e texto são gravadas como texto
+    return [v if isinstance(v, list) else None if pd.isna(v) else str(v) for v in serie.astype(object)]
+
+def test_ida_e_volta(tmp_path, indicadores):
+    bases = _bases(indicadores)
+    gravar_snapshot(tmp_path, bases, {"arquivos": ["x.xlsx"], "sha256": "abc"}, "v1")
+    manifesto = ler_manifesto(tmp_path)
+    assert list(manifesto["periodos"]) == list(bases)
+    for periodo, esperado in bases.items():
+        lido = ler_periodo(tmp_path, manifesto, periodo)
+        assert list(lido.columns) == list(esperado.columns)
+        for coluna in esperado.columns:
+            if pd.api.types.is_numeric_dtype(esperado[coluna]):
+                pd.testing.assert_series_equal(lido[coluna], esperado[coluna], check_dtype=False)
+            else:
+                # textos voltam como str do pandas e os vazios como NaN
+                assert _textos(lido[coluna]) == _textos(esperado[coluna]), (periodo, coluna)
+    assert ler_periodo(tmp_path, manifesto, "MARÇO") is None
+
+    # período que sumiu da planilha sai da pasta
+    gravar_snapshot(tmp_path, {"JANEIRO": bases["JANEIRO"]}, {"arquivos": ["x.xlsx"], "sha256": "def"}, "v1")
+    assert sorted(p.name for p in tmp_path.glob("*.feather")) == ["JANEIRO.feather"]
+
+def test_validade(tmp_path, pesos, indicadores):
+    versao = versao_pesos(pesos)
+    gravar_snapshot(tmp_path, _bases(indicadores), {"arquivos": ["x.xlsx"], "sha256": "abc"}, versao)
+    manifesto = ler_manifesto(tmp_path)
+    assert snapshot_vale(manifesto, "abc", versao)
+    # sem planilha em data/ só os pesos contam
+    assert snapshot_vale(manifesto, None, versao)
+    assert not snapshot_vale(manifesto, "outra", versao)
+
+    outros = {**pesos, "ANALISTA": {**pesos["ANALISTA"], "indicador_desligado": "zerar"}}
+    assert not snapshot_vale(manifesto, "abc", versao_pesos(outros))
+    assert not snapshot_vale(manifesto, "abc", versao_pesos(pesos, {"JANEIRO": {"producao": False}}))
+
+    (tmp_path / "manifesto.json").write_text("{corrompido", encoding="utf-8")
+    assert ler_manifesto(tmp_path) is None
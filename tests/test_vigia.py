@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# vigia de data/ com listar/carregar falsos: espera os arquivos estabilizarem,
+# mantém a versão anterior quando a carga falha e troca a versão inteira
+import threading
+
+import pytest
+
+from bonus import assinaturas, criar_vigia, verificar_vigia, versao_vigia
+
+def _vigia(carregar):
+    # listar() devolve o que estiver em arquivos["assinaturas"]
+    arquivos = {"assinaturas": (("a.xlsx", 1, 10),)}
+    return criar_vigia(lambda: arquivos["assinaturas"], carregar, intervalo=0), arquivos
+
+def test_espera_os_arquivos_estabilizarem():
+    cargas = []
+    vigia, arquivos = _vigia(lambda a: cargas.append(a) or {"assinaturas": a})
+    # primeira carga não espera
+    assert verificar_vigia(vigia)
+    assert not verificar_vigia(vigia)
+
+    arquivos["assinaturas"] = (("a.xlsx", 2, 20),)
+    assert not verificar_vigia(vigia)          # acabou de mudar: ainda copiando?
+    arquivos["assinaturas"] = (("a.xlsx", 3, 30),)
+    assert not verificar_vigia(vigia)          # mudou de novo
+    assert verificar_vigia(vigia)              # igual por um intervalo: carrega
+    assert cargas == [(("a.xlsx", 1, 10),), (("a.xlsx", 3, 30),)]
+    assert versao_vigia(vigia) == ({"assinaturas": (("a.xlsx", 3, 30),)}, None)
+    assert vigia["recargas"] == 2
+
+def test_falha_mantem_a_versao_anterior():
+    def carregar(a):
+        if a[0][1] == 2:
+            raise ValueError("json inválido")
+        return {"mtime": a[0][1]}
+
+    vigia, arquivos = _vigia(carregar)
+    verificar_vigia(vigia)
+    arquivos["assinaturas"] = (("a.xlsx", 2, 20),)
+    verificar_vigia(vigia)
+    assert not verificar_vigia(vigia)
+    versao, erro = versao_vigia(vigia)
+    assert versao == {"mtime": 1} and isinstance(erro, ValueError)
+    # a mesma assinatura com erro não é recarregada a cada intervalo
+    assert not verificar_vigia(vigia)
+
+    arquivos["assinaturas"] = (("a.xlsx", 3, 30),)
+    verificar_vigia(vigia)
+    assert verificar_vigia(vigia)
+    assert versao_vigia(vigia) == ({"mtime": 3}, None)
+
+def test_primeira_carga_com_erro_libera_quem_espera():
+    vigia, _ = _vigia(lambda a: 1 / 0)
+    verificar_vigia(vigia)
+    versao, erro = versao_vigia(vigia, timeout=1)
+    assert versao is None and isinstance(erro, ZeroDivisionError)
+
+def test_troca_a_versao_inteira_de_uma_vez():
+    liberar, comecou = threading.Event(), threading.Event()
+    def carregar(a):
+        versao = {"mtime": a[0][1], "periodos": {}}
+        if a[0][1] == 2:
+            versao["periodos"]["JANEIRO"] = "parcial"
+            comecou.set()
+            liberar.wait(5)
+            versao["periodos"]["FEVEREIRO"] = "pronto"
+        return versao
+
+    vigia, arquivos = _vigia(carregar)
+    verificar_vigia(vigia)
+    antiga, _ = versao_vigia(vigia)
+    arquivos["assinaturas"] = (("a.xlsx", 2, 20),)
+    verificar_vigia(vigia)
+    thread = threading.Thread(target=verificar_vigia, args=(vigia,))
+    thread.start()
+    assert comecou.wait(5)
+    # durante a carga quem lê continua com a versão anterior, intacta
+    assert versao_vigia(vigia)[0] is antiga and antiga == {"mtime": 1, "periodos": {}}
+    liberar.set()
+    thread.join(5)
+    nova, erro = versao_vigia(vigia)
+    assert erro is None and nova["periodos"] == {"JANEIRO": "parcial", "FEVEREIRO": "pronto"}
+    assert antiga == {"mtime": 1, "periodos": {}}
+
+def test_sem_estabilizar_carrega_na_hora():
+    vigia, arquivos = _vigia(lambda a: a)
+    verificar_vigia(vigia)
+    arquivos["assinaturas"] = (("a.xlsx", 2, 20),)
+    assert verificar_vigia(vigia, esperar_estabilizar=False)
+
+@pytest.mark.parametrize("faltando", [True, False])
+def test_assinaturas(tmp_path, faltando):
+    caminho = tmp_path / "a.json"
+    if not faltando:
+        caminho.write_text("{}", encoding="utf-8")
+    (assinatura,) = assinaturas([caminho])
+    assert assinatura[0] == str(caminho)
+    assert (assinatura[1] is None) == faltando and assinatura[2] == (None if faltando else 2)